@@ -11,6 +11,8 @@ from pathlib import Path
 from enum import IntEnum
 from typing import Optional
 
+import numpy as np
+
 # 平台特定的库加载
 def _get_library_path() -> str:
     """获取平台特定的库路径。"""
@@ -252,6 +254,15 @@ _lib.WebRTC_APM_ProcessStream.restype = ctypes.c_int
 _lib.WebRTC_APM_SetStreamDelayMs.argtypes = [ctypes.c_void_p, ctypes.c_int]
 _lib.WebRTC_APM_SetStreamDelayMs.restype = None
 
+# 同一导出函数的第二个句柄，缓冲区参数声明为裸指针，可直接传入 NumPy 数组地址
+_process_reverse_stream_ptr = _lib['WebRTC_APM_ProcessReverseStream']
+_process_reverse_stream_ptr.argtypes = [ctypes.c_void_p] * 5
+_process_reverse_stream_ptr.restype = ctypes.c_int
+
+_process_stream_ptr = _lib['WebRTC_APM_ProcessStream']
+_process_stream_ptr.argtypes = [ctypes.c_void_p] * 5
+_process_stream_ptr.restype = ctypes.c_int
+
 class WebRTCAudioProcessing:
     """WebRTC 音频处理的高级 Python 封装器。"""
     
@@ -260,6 +271,9 @@ class WebRTCAudioProcessing:
         self._handle = _lib.WebRTC_APM_Create()
         if not self._handle:
             raise RuntimeError("Failed to create WebRTC APM instance")
+        # 流配置句柄 -> 每个10ms块的采样数（含声道），供数组接口分块
+        self._chunk_samples = {}
+        self._scratch = {}
     
     def __del__(self):
         """清理资源。"""
@@ -279,10 +293,12 @@ class WebRTCAudioProcessing:
         config_handle = _lib.WebRTC_APM_CreateStreamConfig(sample_rate, num_channels)
         if not config_handle:
             raise RuntimeError("Failed to create stream config")
+        self._chunk_samples[config_handle] = sample_rate // 100 * num_channels
         return config_handle
     
     def destroy_stream_config(self, config_handle: int) -> None:
         """销毁流配置。"""
+        self._chunk_samples.pop(config_handle, None)
         _lib.WebRTC_APM_DestroyStreamConfig(config_handle)
     
     def apply_config(self, config: Config) -> int:
@@ -330,6 +346,80 @@ class WebRTCAudioProcessing:
             self._handle, src, src_config, dest_config, dest
         )
     
+    def process_reverse_stream_array(self, src: np.ndarray, src_config: int,
+                                     dest_config: int,
+                                     dest: Optional[np.ndarray] = None) -> int:
+        """处理一整帧反向流（10ms 的整数倍，例如 20/40/60ms）。
+        
+        直接把 NumPy 数组的内存地址交给本地库，按10ms分块循环调用，
+        不构造 ctypes 数组、不逐样本拷贝。
+        
+        Args:
+            src: int16 C 连续数组
+            src_config: 源流配置句柄
+            dest_config: 目标流配置句柄
+            dest: 预分配的 int16 输出数组；None 时写入内部暂存区（渲染输出通常不需要）
+            
+        Returns:
+            状态码（0表示成功，否则为第一个失败块的错误码）
+        """
+        if dest is None:
+            dest = self._scratch_buffer(len(src))
+        return self._process_array(
+            _process_reverse_stream_ptr, src, src_config, dest_config, dest
+        )
+    
+    def process_stream_array(self, src: np.ndarray, src_config: int,
+                             dest_config: int, dest: np.ndarray) -> int:
+        """处理一整帧采集流（10ms 的整数倍），结果写入预分配的 dest。
+        
+        Args:
+            src: int16 C 连续数组
+            src_config: 源流配置句柄
+            dest_config: 目标流配置句柄
+            dest: 与 src 等长的 int16 C 连续数组
+            
+        Returns:
+            状态码（0表示成功，否则为第一个失败块的错误码）
+        """
+        return self._process_array(
+            _process_stream_ptr, src, src_config, dest_config, dest
+        )
+    
+    def _process_array(self, func, src: np.ndarray, src_config: int,
+                       dest_config: int, dest: np.ndarray) -> int:
+        """按10ms分块，以指针偏移调用本地处理函数。"""
+        if src.dtype != np.int16 or not src.flags.c_contiguous:
+            raise ValueError("src 必须是 int16 C 连续数组")
+        if (dest.dtype != np.int16 or not dest.flags.c_contiguous
+                or not dest.flags.writeable or len(dest) < len(src)):
+            raise ValueError("dest 必须是可写、足够长的 int16 C 连续数组")
+        
+        chunk = self._chunk_samples.get(src_config)
+        if chunk is None:
+            raise ValueError("未知的流配置句柄")
+        if len(src) % chunk != 0:
+            raise ValueError(f"帧长 {len(src)} 不是10ms块 {chunk} 的整数倍")
+        
+        handle = self._handle
+        src_addr = src.ctypes.data
+        dest_addr = dest.ctypes.data
+        step = chunk * 2  # int16 每样本2字节
+        status = 0
+        for offset in range(0, len(src) * 2, step):
+            result = func(handle, src_addr + offset, src_config, dest_config,
+                          dest_addr + offset)
+            if result != 0 and status == 0:
+                status = result
+        return status
+    
+    def _scratch_buffer(self, size: int) -> np.ndarray:
+        buffer = self._scratch.get(size)
+        if buffer is None:
+            buffer = np.zeros(size, dtype=np.int16)
+            self._scratch[size] = buffer
+        return buffer
+    
     def set_stream_delay_ms(self, delay_ms: int) -> None:
         """设置流延迟（毫秒）。
         
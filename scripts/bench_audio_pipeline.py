@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+离线音频管线基准测试（无需声卡，可在无头 Linux 上运行）.
+
+用假的 sounddevice 后端导入 AudioCodec，直接以合成的 indata/outdata 缓冲驱动录音/播放回调：
+1. 采集：设备采样率 -> 重采样16kHz -> (AEC) -> Opus编码 -> 发送回调
+2. 播放：Opus包 -> 解码 -> 播放通道 -> 重采样到设备采样率 -> outdata
+
+对 16/44.1/48kHz 设备采样率与 20/60ms 帧长的每种组合，报告回调耗时分位数、
+单次回调临时内存分配（tracemalloc 峰值）以及丢帧/欠载计数。
+
+用法:
+    python scripts/bench_audio_pipeline.py [--wav speech.wav] [--seconds 10]
+        [--rates 16000,44100,48000] [--frame-ms 20,60] [--worker]
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+import types
+import wave
+from pathlib import Path
+
+import numpy as np
+import soxr
+
+# 添加项目根目录到路径
+project_root = Path(__file__).resolve().parents[1]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+
+def install_fake_sounddevice(sample_rate: int):
+    """
+    注册一个不访问硬件的 sounddevice 替身（只需满足 AudioCodec 的导入和设备查询）.
+    """
+    fake = sys.modules.get("sounddevice")
+    if fake is None or not getattr(fake, "_is_fake_backend", False):
+        fake = types.ModuleType("sounddevice")
+        fake._is_fake_backend = True
+        fake.default = types.SimpleNamespace(
+            samplerate=None, channels=None, dtype=None, device=(0, 0)
+        )
+
+        class _FakeStream:
+            def __init__(self, *args, **kwargs):
+                self.active = False
+
+            def start(self):
+                self.active = True
+
+            def stop(self):
+                self.active = False
+
+            def close(self):
+                self.active = False
+
+        fake.InputStream = _FakeStream
+        fake.OutputStream = _FakeStream
+        fake.query_hostapis = lambda *a, **k: [
+            {"name": "Fake", "default_input_device": 0, "default_output_device": 0}
+        ]
+        sys.modules["sounddevice"] = fake
+
+    device = {
+        "name": "Fake Device",
+        "hostapi": 0,
+        "max_input_channels": 1,
+        "max_output_channels": 1,
+        "default_samplerate": float(sample_rate),
+    }
+
+    def query_devices(device_id=None, kind=None):
+        if device_id is None and kind is None:
+            return [device]
+        return device
+
+    fake.query_devices = query_devices
+    return fake
+
+
+def load_signal(path, seconds: float) -> tuple:
+    """
+    读取 WAV（16位）或生成带噪声的调幅语音样信号，返回 (int16 数组, 采样率).
+    """
+    if path:
+        with wave.open(str(path), "rb") as wf:
+            rate = wf.getframerate()
+            channels = wf.getnchannels()
+            data = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+        if channels > 1:
+            data = data.reshape(-1, channels).mean(axis=1).astype(np.int16)
+        return data, rate
+
+    rate = 48000
+    t = np.arange(int(rate * seconds)) / rate
+    envelope = 0.5 + 0.5 * np.sin(2 * np.pi * 3 * t)
+    voiced = np.sin(2 * np.pi * 180 * t) + 0.5 * np.sin(2 * np.pi * 720 * t)
+    noise = np.random.default_rng(0).standard_normal(len(t)) * 0.05
+    return ((voiced * envelope * 0.3 + noise) * 32767).astype(np.int16), rate
+
+
+def percentiles(samples_us) -> dict:
+    arr = np.asarray(samples_us)
+    return {
+        "p50": float(np.percentile(arr, 50)),
+        "p99": float(np.percentile(arr, 99)),
+        "max": float(arr.max()),
+    }
+
+
+def measure(callback, buffers: list) -> dict:
+    """
+    逐块调用回调，统计耗时分位数.
+    """
+    durations = []
+    for args in buffers:
+        start = time.perf_counter()
+        callback(*args)
+        durations.append((time.perf_counter() - start) * 1e6)
+    return percentiles(durations)
+
+
+def measure_alloc(callback, buffers: list) -> float:
+    """
+    再跑一遍回调统计单次临时分配峰值的中位数.
+
+    这一遍同样会推进丢帧/欠载等计数，调用方需在此之前读取计数.
+    """
+    peaks = []
+    tracemalloc.start()
+    for args in buffers[: min(len(buffers), 200)]:
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        callback(*args)
+        _, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak - current)
+    tracemalloc.stop()
+    return float(np.median(peaks))
+
+
+async def build_codec(device_rate: int, use_worker: bool):
+    """
+    按 AudioCodec.initialize() 的步骤构建编解码器，但跳过设备选择（不写配置）和流创建.
+    """
+    import opuslib
+
+    from src.audio_codecs.audio_codec import AudioCodec
+    from src.audio_codecs.codec_worker import CodecWorker
+    from src.constants.constants import AudioConfig
+
+    codec = AudioCodec()
+    codec.device_input_sample_rate = device_rate
+    codec.device_output_sample_rate = device_rate
+    codec._device_input_frame_size = int(
+        device_rate * AudioConfig.FRAME_DURATION / 1000
+    )
+    await codec._create_resamplers()
+    codec.opus_encoder = opuslib.Encoder(
+        AudioConfig.INPUT_SAMPLE_RATE, AudioConfig.CHANNELS, opuslib.APPLICATION_AUDIO
+    )
+    codec.opus_decoder = opuslib.Decoder(
+        AudioConfig.OUTPUT_SAMPLE_RATE, AudioConfig.CHANNELS
+    )
+    if use_worker:
+        codec._codec_worker = CodecWorker(
+            AudioConfig.INPUT_FRAME_SIZE,
+            encode_fn=codec._encode_pcm,
+            decode_fn=codec._decode_to_output,
+        )
+        codec._codec_worker.set_encoded_callback(codec._emit_encoded)
+        codec._codec_worker.start()
+    return codec
+
+
+async def run_case(signal, signal_rate, device_rate, frame_ms, args) -> dict:
+    import opuslib
+
+    from src.constants.constants import AudioConfig
+
+    # 帧长在 AudioConfig 中是导入时确定的类属性，这里按用例覆盖
+    AudioConfig.FRAME_DURATION = frame_ms
+    AudioConfig.INPUT_FRAME_SIZE = AudioConfig.INPUT_SAMPLE_RATE * frame_ms // 1000
+    AudioConfig.OUTPUT_FRAME_SIZE = AudioConfig.OUTPUT_SAMPLE_RATE * frame_ms // 1000
+    install_fake_sounddevice(device_rate)
+
+    codec = await build_codec(device_rate, args.worker)
+    sent = []
+    codec.set_encoded_audio_callback(sent.append)
+
+    # 采集：按设备块大小切分 indata
+    block = int(device_rate * frame_ms / 1000)
+    device_signal = soxr.resample(signal, signal_rate, device_rate).astype(np.int16)
+    blocks = len(device_signal) // block
+    indata = [
+        (device_signal[i * block : (i + 1) * block].reshape(-1, 1), block, None, None)
+        for i in range(blocks)
+    ]
+    capture = measure(codec._input_callback, indata)
+    if codec._codec_worker is not None:
+        time.sleep(0.2)  # 等待工作线程编码完剩余帧
+    sent_frames = len(sent)
+
+    # 播放：先把信号编码成服务端下发格式的 Opus 包
+    out_rate = AudioConfig.OUTPUT_SAMPLE_RATE
+    out_frame = AudioConfig.OUTPUT_FRAME_SIZE
+    encoder = opuslib.Encoder(out_rate, 1, opuslib.APPLICATION_AUDIO)
+    tts = soxr.resample(signal, signal_rate, out_rate).astype(np.int16)
+    packets = [
+        encoder.encode(tts[i * out_frame : (i + 1) * out_frame].tobytes(), out_frame)
+        for i in range(len(tts) // out_frame)
+    ]
+    decode = measure(codec._decode_to_output, [(p,) for p in packets[: len(indata)]])
+
+    outdata = np.zeros((block, 1), dtype=np.int16)
+    outbuffers = [(outdata, block, None, None)] * len(indata)
+    playback = measure(codec._output_callback, outbuffers)
+
+    transport = codec.get_transport_stats()
+    result = {
+        "capture": capture,
+        "decode": decode,
+        "playback": playback,
+        "sent": sent_frames,
+        "frames": len(indata),
+        "playback_underruns": transport["playback"]["underruns"],
+        "playback_dropped": transport["playback"]["dropped"],
+    }
+    if codec._resample_input_buffer is not None:
+        result["resample_overflow"] = codec._resample_input_buffer.get_stats()[
+            "overflow_samples"
+        ]
+    if codec._codec_worker is not None:
+        result["worker_dropped"] = codec._codec_worker.get_stats()[
+            "dropped_pcm_frames"
+        ]
+
+    # 计数已读取，内存分配统计的额外一遍不再影响结果
+    if args.alloc:
+        capture["alloc_bytes"] = measure_alloc(codec._input_callback, indata)
+        playback["alloc_bytes"] = measure_alloc(codec._output_callback, outbuffers)
+    await codec.close()
+    return result
+
+
+def print_result(device_rate, frame_ms, result):
+    print(f"\n设备 {device_rate}Hz / 帧长 {frame_ms}ms: {result['frames']} 帧")
+    for name in ("capture", "decode", "playback"):
+        stats = result[name]
+        line = (
+            f"  {name:<9} p50 {stats['p50']:>8.1f}us  p99 {stats['p99']:>8.1f}us"
+            f"  max {stats['max']:>8.1f}us"
+        )
+        if "alloc_bytes" in stats:
+            line += f"  分配 {stats['alloc_bytes'] / 1024:>6.1f}KiB/次"
+        print(line)
+    extras = {
+        k: v
+        for k, v in result.items()
+        if k not in ("capture", "decode", "playback", "frames")
+    }
+    print(f"  计数: {extras}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="离线音频管线基准测试")
+    parser.add_argument("--wav", help="16位 WAV 输入（默认生成合成信号）")
+    parser.add_argument("--seconds", type=float, default=10.0, help="合成信号时长")
+    parser.add_argument("--rates", default="16000,44100,48000")
+    parser.add_argument("--frame-ms", default="20,60")
+    parser.add_argument("--worker", action="store_true", help="启用编解码工作线程")
+    parser.add_argument(
+        "--no-alloc", dest="alloc", action="store_false", help="不统计内存分配"
+    )
+    args = parser.parse_args()
+
+    # 必须在导入 AudioCodec 之前注册假后端
+    install_fake_sounddevice(48000)
+    # 加载项目自带的 libopus，需在导入 opuslib 之前完成
+    from src.utils.opus_loader import setup_opus
+
+    setup_opus()
+
+    import asyncio
+
+    signal, signal_rate = load_signal(args.wav, args.seconds)
+    for device_rate in [int(r) for r in args.rates.split(",")]:
+        for frame_ms in [int(f) for f in args.frame_ms.split(",")]:
+            result = asyncio.run(
+                run_case(signal, signal_rate, device_rate, frame_ms, args)
+            )
+            print_result(device_rate, frame_ms, result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+编解码工作线程基准测试.
+
+模拟录音回调按帧节拍投递 16kHz PCM，对比两种模式下回调本身的执行耗时分位数：
+1. inline：回调内直接 Opus 编码（当前默认行为）
+2. worker：回调只把帧拷贝进 CodecWorker，编码在工作线程中进行
+
+用法:
+    python scripts/bench_codec_worker.py [--frames 500] [--frame-ms 20] [--speed 1.0]
+"""
+
+import argparse
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+# 添加项目根目录到路径
+project_root = Path(__file__).resolve().parents[1]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.audio_codecs.codec_worker import CodecWorker  # noqa: E402
+from src.utils.opus_loader import setup_opus  # noqa: E402
+
+# 加载项目自带的 libopus，需在导入 opuslib 之前完成
+setup_opus()
+
+import opuslib  # noqa: E402
+
+SAMPLE_RATE = 16000
+
+
+def make_frames(count: int, frame_size: int) -> list:
+    """
+    生成带噪声的正弦波测试帧（纯静音会让编码器走捷径，耗时偏低）.
+    """
+    rng = np.random.default_rng(0)
+    t = np.arange(count * frame_size) / SAMPLE_RATE
+    signal = 0.3 * np.sin(2 * np.pi * 440 * t) + 0.05 * rng.standard_normal(len(t))
+    pcm = (signal * 32767).astype(np.int16)
+    return [pcm[i * frame_size : (i + 1) * frame_size] for i in range(count)]
+
+
+def percentiles(samples_us: list) -> dict:
+    arr = np.asarray(samples_us)
+    return {
+        "p50": np.percentile(arr, 50),
+        "p90": np.percentile(arr, 90),
+        "p99": np.percentile(arr, 99),
+        "max": arr.max(),
+    }
+
+
+def run(mode: str, frames: list, frame_size: int, interval: float) -> dict:
+    encoder = opuslib.Encoder(SAMPLE_RATE, 1, opuslib.APPLICATION_AUDIO)
+    sent = []
+    done = threading.Event()
+
+    def on_encoded(data: bytes):
+        sent.append(data)
+        if len(sent) >= len(frames):
+            done.set()
+
+    def encode_fn(frame: np.ndarray) -> bytes:
+        return encoder.encode(frame.astype(np.int16).tobytes(), frame_size)
+
+    worker = None
+    if mode == "worker":
+        worker = CodecWorker(
+            frame_size, encode_fn=encode_fn, decode_fn=lambda data, lost: False
+        )
+        worker.set_encoded_callback(on_encoded)
+        worker.start()
+
+    durations = []
+    next_tick = time.perf_counter()
+    for frame in frames:
+        # 模拟 PortAudio 回调：indata.copy().flatten() + 编码或投递
+        start = time.perf_counter()
+        audio_data = frame.copy().flatten()
+        if worker is not None:
+            worker.submit_pcm(audio_data)
+        else:
+            on_encoded(encode_fn(audio_data))
+        durations.append((time.perf_counter() - start) * 1e6)
+
+        next_tick += interval
+        delay = next_tick - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+    done.wait(2.0)
+    stats = {"encoded": len(sent), **percentiles(durations)}
+    if worker is not None:
+        stats["worker"] = worker.get_stats()
+        worker.stop()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="编解码工作线程回调耗时对比")
+    parser.add_argument("--frames", type=int, default=500, help="测试帧数")
+    parser.add_argument("--frame-ms", type=int, default=20, help="帧长(ms)")
+    parser.add_argument(
+        "--speed", type=float, default=1.0, help="投递速度倍数（1.0 为实时）"
+    )
+    args = parser.parse_args()
+
+    frame_size = SAMPLE_RATE * args.frame_ms // 1000
+    interval = args.frame_ms / 1000 / args.speed
+    frames = make_frames(args.frames, frame_size)
+
+    print(
+        f"帧数: {args.frames}, 帧长: {args.frame_ms}ms, "
+        f"投递间隔: {interval * 1000:.1f}ms"
+    )
+    print(f"{'模式':<8}{'p50(us)':>10}{'p90(us)':>10}{'p99(us)':>10}{'max(us)':>10}")
+    for mode in ("inline", "worker"):
+        stats = run(mode, frames, frame_size, interval)
+        print(
+            f"{mode:<8}{stats['p50']:>10.1f}{stats['p90']:>10.1f}"
+            f"{stats['p99']:>10.1f}{stats['max']:>10.1f}"
+            f"   已编码 {stats['encoded']} 帧"
+        )
+        if "worker" in stats:
+            w = stats["worker"]
+            print(
+                f"        工作线程: 平均编码 {w['avg_encode_ms']}ms, "
+                f"最大批 {w['max_batch']}, 丢帧 {w['dropped_pcm_frames']}"
+            )
+
+
+if __name__ == "__main__":
+    main()
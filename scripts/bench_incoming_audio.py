@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+收到音频分发基准测试.
+
+对比两种把协议层收到的 TTS 音频交给插件的方式：
+- task：原实现，每帧创建一个任务并登记到任务集合，依次 await 全部插件的
+  on_incoming_audio（未覆写的插件也会让出一次事件循环）
+- queue：当前实现，有界队列 + 单个常驻消费协程，只调用覆写了
+  on_incoming_audio 的插件
+
+插件组合与应用一致（7 个插件，其中 1 个处理音频），处理音频的插件在写入前
+随机 await 0~--max-yields 次，模拟 write_audio 内部的让出。报告每帧 CPU 耗时、
+创建的任务数、交付顺序错乱的帧数，以及中止后仍交给插件的帧数。
+
+用法:
+    python scripts/bench_incoming_audio.py [--frames 20000] [--burst 8]
+        [--max-yields 3] [--abort-after 200]
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).resolve().parents[1]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.audio_codecs.frame_transport import FrameTransport  # noqa: E402
+from src.plugins.base import Plugin  # noqa: E402
+from src.plugins.manager import PluginManager  # noqa: E402
+
+
+class SinkPlugin(Plugin):
+    """
+    模拟音频插件：随机让出几次后记录序列号.
+    """
+
+    name = "audio"
+
+    def __init__(self, max_yields: int, seed: int):
+        super().__init__()
+        self.max_yields = max_yields
+        self.rng = random.Random(seed)
+        self.received = []
+
+    async def on_incoming_audio(self, data, sequence=None):
+        for _ in range(self.rng.randint(0, self.max_yields)):
+            await asyncio.sleep(0)
+        self.received.append(sequence)
+
+
+def make_plugins(args):
+    sink = SinkPlugin(args.max_yields, args.seed)
+    others = []
+    for name in ("mcp", "iot", "wake_word", "calendar", "ui", "shortcuts"):
+        plugin = Plugin()
+        plugin.name = name
+        others.append(plugin)
+    return sink, [others[0], others[1], sink, *others[2:]]
+
+
+class TaskDispatch:
+    """
+    原实现：每帧一个任务，依次通知全部插件.
+    """
+
+    def __init__(self, plugins):
+        self.plugins = plugins
+        self.tasks = set()
+        self.created = 0
+        self.aborted = False
+
+    async def _notify(self, data, sequence):
+        for p in list(self.plugins):
+            try:
+                await p.on_incoming_audio(data, sequence)
+            except Exception:
+                pass
+
+    def on_audio(self, data, sequence):
+        task = asyncio.create_task(self._notify(data, sequence))
+        self.created += 1
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    def abort(self):
+        # 原实现中止时不处理已创建的任务
+        self.aborted = True
+
+    async def drain(self):
+        while self.tasks:
+            await asyncio.gather(*list(self.tasks))
+
+
+class QueueDispatch:
+    """
+    当前实现：有界队列 + 单个消费协程，中止时丢弃未交付的帧.
+    """
+
+    def __init__(self, plugins, capacity: int, batch: int):
+        self.manager = PluginManager({})
+        self.manager.register(*plugins)
+        self.queue = FrameTransport(capacity, "incoming")
+        self.batch = batch
+        self.generation = 0
+        self.created = 1
+        self.pending = 0
+        self.idle = asyncio.Event()
+        self.task = asyncio.create_task(self._consume())
+
+    async def _consume(self):
+        while True:
+            batch = await self.queue.get_batch(self.batch)
+            for generation, data, sequence in batch:
+                if generation == self.generation:
+                    await self.manager.notify_incoming_audio(data, sequence)
+            self.pending -= len(batch)
+            if self.pending <= 0:
+                self.idle.set()
+
+    def on_audio(self, data, sequence):
+        self.pending += 1
+        self.idle.clear()
+        self.queue.put((self.generation, data, sequence))
+
+    def abort(self):
+        self.generation += 1
+        self.pending -= self.queue.clear()
+        if self.pending <= 0:
+            self.idle.set()
+
+    async def drain(self):
+        if self.pending > 0:
+            await self.idle.wait()
+        self.task.cancel()
+
+
+async def run_case(name: str, args) -> dict:
+    sink, plugins = make_plugins(args)
+    if name == "task":
+        dispatch = TaskDispatch(plugins)
+    else:
+        # 容量足够大，本测试不触发溢出丢帧
+        dispatch = QueueDispatch(plugins, args.frames + 1, args.batch)
+    payload = bytes(180)
+
+    started_cpu = time.process_time()
+    for start in range(0, args.frames, args.burst):
+        # 一次网络读取交出一批帧（UDP 批量接收 / WebSocket 连续消息）
+        for sequence in range(start, min(start + args.burst, args.frames)):
+            dispatch.on_audio(payload, sequence)
+        await asyncio.sleep(0)
+    await dispatch.drain()
+    cpu = time.process_time() - started_cpu
+
+    reordered = sum(1 for a, b in zip(sink.received, sink.received[1:]) if b < a)
+
+    # 中止：入队 abort_after 帧后立即中止，统计之后仍交付的帧
+    sink2, plugins2 = make_plugins(args)
+    if name == "task":
+        dispatch = TaskDispatch(plugins2)
+    else:
+        dispatch = QueueDispatch(plugins2, args.frames + 1, args.batch)
+    for sequence in range(args.abort_after):
+        dispatch.on_audio(payload, sequence)
+    await asyncio.sleep(0)
+    delivered_before = len(sink2.received)
+    dispatch.abort()
+    await dispatch.drain()
+    after_abort = len(sink2.received) - delivered_before
+
+    return {
+        "cpu_us": cpu / args.frames * 1e6,
+        "tasks": dispatch.created if name == "queue" else args.frames,
+        "reordered": reordered,
+        "after_abort": after_abort,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="收到音频分发基准测试")
+    parser.add_argument("--frames", type=int, default=20000)
+    parser.add_argument("--burst", type=int, default=8, help="每次网络读取交出的帧数")
+    parser.add_argument("--batch", type=int, default=8, help="消费协程单次取出帧数")
+    parser.add_argument("--max-yields", type=int, default=3)
+    parser.add_argument("--abort-after", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    print(
+        f"帧数: {args.frames}，每批: {args.burst}，"
+        f"音频插件最多让出: {args.max_yields} 次"
+    )
+    print(f"{'方式':<8}{'CPU/帧(us)':>12}{'任务数':>10}{'乱序帧':>8}{'中止后交付':>12}")
+    for name in ("task", "queue"):
+        result = asyncio.run(run_case(name, args))
+        print(
+            f"{name:<8}{result['cpu_us']:>12.2f}{result['tasks']:>10}"
+            f"{result['reordered']:>8}{result['after_abort']:>12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+JSON 编解码基准测试.
+
+按消息轨迹回放协议层的 JSON 处理，对比两种实现：
+- stdlib：原实现，json.loads 解析收到的消息、json.dumps 序列化发出的消息，
+  MCP 消息额外以 indent=2 重新序列化一次用于 INFO 日志
+- codec：src.utils.json_codec（当前后端见输出），MCP 消息体仅在 DEBUG 级别格式化
+
+轨迹文件为 JSON Lines，每行一条消息：
+    {"dir": "in", "text": "<服务端下发的原始JSON文本>"}
+    {"dir": "out", "text": "<客户端发出的JSON文本>"}
+也可以每行直接是消息本身（视为收到的消息）。不指定 --trace 时使用内置的一次典型
+会话（hello、listen、stt、llm、tts、MCP tools/list 与 tools/call、IoT 状态）。
+
+用法:
+    python scripts/bench_json_codec.py [--trace session.jsonl] [--rounds 2000]
+        [--dump-trace sample.jsonl]
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).resolve().parents[1]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.utils import json_codec  # noqa: E402
+
+logger = logging.getLogger("bench_json_codec")
+logger.setLevel(logging.INFO)
+
+
+def _sample_tools(count: int) -> list:
+    return [
+        {
+            "name": f"self.demo.tool_{i}",
+            "description": "示例工具：根据用户的自然语言指令执行对应的本地操作，"
+            "返回执行结果文本。",
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "query": {"type": "string"},
+                    "limit": {"type": "integer", "minimum": 1, "maximum": 50},
+                },
+                "required": ["query"],
+            },
+        }
+        for i in range(count)
+    ]
+
+
+def builtin_trace() -> list:
+    """
+    一次典型会话的消息轨迹.
+    """
+    session = "7f3c2a9e-1b4d-4c6a-9e2f-5d8b0a1c3e7f"
+    incoming = [
+        {
+            "type": "hello",
+            "transport": "websocket",
+            "session_id": session,
+            "audio_params": {
+                "format": "opus",
+                "sample_rate": 24000,
+                "channels": 1,
+                "frame_duration": 60,
+            },
+        },
+        {"type": "stt", "text": "今天天气怎么样", "session_id": session},
+        {"type": "llm", "text": "😊", "emotion": "happy", "session_id": session},
+        {"type": "tts", "state": "start", "session_id": session},
+        {
+            "type": "tts",
+            "state": "sentence_start",
+            "text": "今天晴转多云，气温十八到二十六度，适合出门。",
+            "session_id": session,
+        },
+        {"type": "tts", "state": "stop", "session_id": session},
+        {
+            "type": "mcp",
+            "session_id": session,
+            "payload": {
+                "jsonrpc": "2.0",
+                "id": 1,
+                "method": "initialize",
+                "params": {
+                    "capabilities": {
+                        "vision": {"url": "http://127.0.0.1/vision", "token": "x"}
+                    }
+                },
+            },
+        },
+        {
+            "type": "mcp",
+            "session_id": session,
+            "payload": {"jsonrpc": "2.0", "id": 2, "method": "tools/list"},
+        },
+        {
+            "type": "mcp",
+            "session_id": session,
+            "payload": {
+                "jsonrpc": "2.0",
+                "id": 3,
+                "method": "tools/call",
+                "params": {
+                    "name": "self.audio_speaker.set_volume",
+                    "arguments": {"volume": 60},
+                },
+            },
+        },
+    ]
+    outgoing = [
+        {
+            "type": "hello",
+            "version": 1,
+            "features": {"mcp": True},
+            "transport": "websocket",
+            "audio_params": {
+                "format": "opus",
+                "sample_rate": 16000,
+                "channels": 1,
+                "frame_duration": 20,
+            },
+        },
+        {"session_id": session, "type": "listen", "state": "start", "mode": "auto"},
+        {"session_id": session, "type": "listen", "state": "stop"},
+        {
+            "session_id": session,
+            "type": "mcp",
+            "payload": {
+                "jsonrpc": "2.0",
+                "id": 2,
+                "result": {"tools": _sample_tools(12)},
+            },
+        },
+        {
+            "session_id": session,
+            "type": "mcp",
+            "payload": {
+                "jsonrpc": "2.0",
+                "id": 3,
+                "result": {
+                    "content": [{"type": "text", "text": "true"}],
+                    "isError": False,
+                },
+            },
+        },
+        {
+            "session_id": session,
+            "type": "iot",
+            "update": True,
+            "states": [
+                {"name": "Speaker", "state": {"volume": 60}},
+                {"name": "Lamp", "state": {"power": True, "brightness": 80}},
+            ],
+        },
+    ]
+    trace = [("in", json.dumps(message)) for message in incoming]
+    trace += [("out", json.dumps(message)) for message in outgoing]
+    return trace
+
+
+def load_trace(path: Path) -> list:
+    trace = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        record = json.loads(line)
+        if isinstance(record, dict) and "text" in record:
+            trace.append((record.get("dir", "in"), record["text"]))
+        else:
+            trace.append(("in", line))
+    return trace
+
+
+def message_kind(data) -> str:
+    if not isinstance(data, dict):
+        return "other"
+    kind = data.get("type", "other")
+    if kind == "mcp":
+        payload = data.get("payload") or {}
+        kind += "/" + str(payload.get("method") or "result")
+    return kind
+
+
+def stdlib_path(direction: str, item):
+    """
+    收到的消息 item 为原始文本，发出的消息 item 为待序列化的字典.
+    """
+    if direction == "in":
+        data = json.loads(item)
+        if data.get("type") == "mcp":
+            logger.info(f"{json.dumps(data['payload'], ensure_ascii=False, indent=2)}")
+        return data
+    return json.dumps(item)
+
+
+def codec_path(direction: str, item):
+    if direction == "in":
+        data = json_codec.loads(item)
+        if data.get("type") == "mcp":
+            payload = data["payload"]
+            logger.info(f"method={payload.get('method')}, id={payload.get('id')}")
+            json_codec.log_pretty(logger, "", payload)
+        return data
+    return json_codec.dumps(item)
+
+
+def bench(fn, trace: list, rounds: int) -> dict:
+    """
+    返回每类消息的平均耗时（微秒）.
+    """
+    totals = defaultdict(float)
+    counts = defaultdict(int)
+    items = []
+    for direction, text in trace:
+        data = json.loads(text)
+        item = text if direction == "in" else data
+        items.append((direction, message_kind(data), item))
+    for _ in range(rounds):
+        for direction, kind, item in items:
+            started = time.perf_counter()
+            fn(direction, item)
+            totals[(direction, kind)] += time.perf_counter() - started
+            counts[(direction, kind)] += 1
+    return {key: totals[key] / counts[key] * 1e6 for key in totals}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON 编解码基准测试")
+    parser.add_argument("--trace", type=Path, help="JSON Lines 消息轨迹文件")
+    parser.add_argument("--rounds", type=int, default=2000, help="轨迹回放次数")
+    parser.add_argument("--dump-trace", type=Path, help="把内置轨迹写入文件后退出")
+    args = parser.parse_args()
+
+    if args.dump_trace:
+        lines = [
+            json.dumps({"dir": direction, "text": text}, ensure_ascii=False)
+            for direction, text in builtin_trace()
+        ]
+        args.dump_trace.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        print(f"已写入 {len(lines)} 条消息: {args.dump_trace}")
+        return
+
+    trace = load_trace(args.trace) if args.trace else builtin_trace()
+
+    # 两种实现的解析结果必须一致
+    for direction, text in trace:
+        if json_codec.loads(text) != json.loads(text):
+            raise SystemExit(f"解析结果不一致: {text[:80]}")
+        if direction == "out":
+            encoded = json_codec.dumps(json.loads(text))
+            if json.loads(encoded) != json.loads(text):
+                raise SystemExit(f"序列化结果不一致: {text[:80]}")
+
+    # 与应用默认配置一致：INFO 日志，输出到空处理器以只计格式化开销
+    logger.addHandler(logging.NullHandler())
+    logger.propagate = False
+
+    stdlib = bench(stdlib_path, trace, args.rounds)
+    codec = bench(codec_path, trace, args.rounds)
+
+    print(f"codec 后端: {json_codec.BACKEND}，消息数: {len(trace)}，回放: {args.rounds}")
+    print(f"{'方向':<5}{'消息类型':<22}{'stdlib(us)':>12}{'codec(us)':>12}{'加速':>8}")
+    for key in sorted(stdlib):
+        direction, kind = key
+        old, new = stdlib[key], codec[key]
+        print(f"{direction:<6}{kind:<24}{old:>12.2f}{new:>12.2f}{old / new:>7.2f}x")
+    total_old, total_new = sum(stdlib.values()), sum(codec.values())
+    speedup = total_old / total_new
+    print(f"{'合计':<28}{total_old:>12.2f}{total_new:>12.2f}{speedup:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+唤醒词前置门限基准测试.
+
+用录制好的 WAV 样本离线运行 Sherpa-ONNX KeywordSpotter，对比门限开/关时：
+- CPU 时间（进程 CPU 时间 / 音频时长）
+- 召回率（--positive 目录下检出唤醒词的文件比例）
+- 误唤醒次数（--negative 目录下的检出次数，例如长时间空房间/电视背景录音）
+
+用法:
+    python scripts/bench_kws_gate.py --positive fixtures/kws/pos \\
+        --negative fixtures/kws/neg [--model-dir models] [--threshold-db -45]
+"""
+
+import argparse
+import sys
+import time
+import wave
+from pathlib import Path
+
+import numpy as np
+import sherpa_onnx
+import soxr
+
+# 添加项目根目录到路径
+project_root = Path(__file__).resolve().parents[1]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.audio_codecs.capture_frame import CaptureFramePool  # noqa: E402
+from src.audio_processing.speech_gate import SpeechGate  # noqa: E402
+
+SAMPLE_RATE = 16000
+
+
+def load_wav(path: Path) -> np.ndarray:
+    """
+    读取 WAV 为 16kHz 单声道 int16.
+    """
+    with wave.open(str(path), "rb") as wf:
+        if wf.getsampwidth() != 2:
+            raise ValueError(f"仅支持16位PCM: {path}")
+        channels = wf.getnchannels()
+        rate = wf.getframerate()
+        data = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+    if channels > 1:
+        data = data.reshape(-1, channels).mean(axis=1).astype(np.int16)
+    if rate != SAMPLE_RATE:
+        data = soxr.resample(data, rate, SAMPLE_RATE)
+    return data
+
+
+def create_spotter(model_dir: Path, num_threads: int):
+    return sherpa_onnx.KeywordSpotter(
+        tokens=str(model_dir / "tokens.txt"),
+        encoder=str(model_dir / "encoder.onnx"),
+        decoder=str(model_dir / "decoder.onnx"),
+        joiner=str(model_dir / "joiner.onnx"),
+        keywords_file=str(model_dir / "keywords.txt"),
+        num_threads=num_threads,
+        sample_rate=SAMPLE_RATE,
+        feature_dim=80,
+        max_active_paths=2,
+        keywords_score=1.8,
+        keywords_threshold=0.2,
+        num_trailing_blanks=1,
+        provider="cpu",
+    )
+
+
+def decode(spotter, stream, samples: np.ndarray, reset_after: bool = False) -> int:
+    """
+    送入一段音频并解码，返回检出次数（与 WakeWordDetector._decode_chunk 一致）.
+    """
+    hits = 0
+    stream.accept_waveform(sample_rate=SAMPLE_RATE, waveform=samples)
+    while spotter.is_ready(stream):
+        spotter.decode_stream(stream)
+        if spotter.get_result(stream):
+            hits += 1
+            spotter.reset_stream(stream)
+    if reset_after:
+        spotter.reset_stream(stream)
+    return hits
+
+
+def run_file(spotter, pcm: np.ndarray, args, use_gate: bool) -> int:
+    """
+    按采集帧节奏处理一个文件，逻辑与 WakeWordDetector._process_audio 相同.
+    """
+    frame_size = SAMPLE_RATE * args.frame_ms // 1000
+    chunk_frames = max(1, -(-args.chunk_ms // args.frame_ms))
+    pool = CaptureFramePool(frame_size, 4)
+    gate = None
+    if use_gate:
+        gate = SpeechGate(
+            frame_size,
+            args.frame_ms,
+            mode=args.mode,
+            threshold_db=args.threshold_db,
+            hangover_ms=args.hangover_ms,
+            preroll_ms=args.preroll_ms,
+        )
+
+    stream = spotter.create_stream()
+    chunk = np.zeros(chunk_frames * frame_size, dtype=np.float32)
+    fill = 0
+    hits = 0
+    for start in range(0, len(pcm) - frame_size + 1, frame_size):
+        frame = pool.load(pcm[start : start + frame_size])
+        state = gate.process(frame) if gate else SpeechGate.OPEN
+        if state == SpeechGate.CLOSED:
+            continue
+        if state == SpeechGate.OPENED:
+            hits += decode(spotter, stream, gate.take_preroll())
+            continue
+
+        chunk[fill : fill + frame_size] = frame.as_float32()
+        fill += frame_size
+        if state == SpeechGate.CLOSING or fill == len(chunk):
+            hits += decode(spotter, stream, chunk[:fill], state == SpeechGate.CLOSING)
+            fill = 0
+    if fill:
+        hits += decode(spotter, stream, chunk[:fill])
+    return hits
+
+
+def run(spotter, files: list, args, use_gate: bool) -> dict:
+    audio_sec = 0.0
+    detections = []
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    for pcm in files:
+        audio_sec += len(pcm) / SAMPLE_RATE
+        detections.append(run_file(spotter, pcm, args, use_gate))
+    return {
+        "cpu_sec": time.process_time() - cpu_start,
+        "wall_sec": time.perf_counter() - wall_start,
+        "audio_sec": audio_sec,
+        "detections": detections,
+    }
+
+
+def wav_files(directory) -> list:
+    if not directory:
+        return []
+    return sorted(Path(directory).glob("*.wav"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="KWS 前置门限 CPU/召回率对比")
+    parser.add_argument("--positive", help="包含唤醒词的 WAV 目录")
+    parser.add_argument("--negative", help="不含唤醒词的 WAV 目录（静音/背景声）")
+    parser.add_argument("--model-dir", default=str(project_root / "models"))
+    parser.add_argument("--num-threads", type=int, default=4)
+    parser.add_argument("--frame-ms", type=int, default=20)
+    parser.add_argument("--chunk-ms", type=int, default=60)
+    parser.add_argument("--mode", default="energy", choices=["energy", "webrtcvad"])
+    parser.add_argument("--threshold-db", type=float, default=-45.0)
+    parser.add_argument("--hangover-ms", type=int, default=600)
+    parser.add_argument("--preroll-ms", type=int, default=400)
+    args = parser.parse_args()
+
+    positives = [load_wav(p) for p in wav_files(args.positive)]
+    negatives = [load_wav(p) for p in wav_files(args.negative)]
+    if not positives and not negatives:
+        parser.error("请通过 --positive/--negative 指定 WAV 样本目录")
+
+    spotter = create_spotter(Path(args.model_dir), args.num_threads)
+    print(f"正样本 {len(positives)} 个, 负样本 {len(negatives)} 个")
+    print(
+        f"{'门限':<6}{'CPU(s)':>9}{'音频(s)':>10}{'CPU占比':>9}"
+        f"{'召回率':>9}{'误唤醒':>8}"
+    )
+    for use_gate in (False, True):
+        pos = run(spotter, positives, args, use_gate)
+        neg = run(spotter, negatives, args, use_gate)
+        cpu = pos["cpu_sec"] + neg["cpu_sec"]
+        audio = pos["audio_sec"] + neg["audio_sec"]
+        recall = (
+            sum(1 for d in pos["detections"] if d > 0) / len(positives)
+            if positives
+            else float("nan")
+        )
+        false_alarms = sum(neg["detections"])
+        print(
+            f"{'开' if use_gate else '关':<6}{cpu:>9.2f}{audio:>10.1f}"
+            f"{cpu / audio:>9.3f}{recall:>9.2%}{false_alarms:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+MQTT 控制消息发布的事件循环阻塞测试.
+
+在本机起一个最小 MQTT broker 替身（只实现 CONNECT/SUBSCRIBE/PUBLISH/PINGREQ，
+可限制读取速率模拟慢上行），并发发送一批控制消息，同时用 5ms 定时器测量事件循环
+被阻塞的程度：
+- blocking：原实现，publish 后在协程里同步 wait_for_publish()
+- async：MqttProtocol.send_text，由 on_publish 回调完成 future，在途数量受限
+
+用法:
+    python scripts/bench_mqtt_publish.py [--messages 200] [--payload-bytes 8192]
+        [--read-kbps 512] [--mode both]
+"""
+
+import argparse
+import asyncio
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import paho.mqtt.client as mqtt
+
+# 添加项目根目录到路径
+project_root = Path(__file__).resolve().parents[1]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.protocols.mqtt_protocol import MqttProtocol  # noqa: E402
+
+TOPIC = "bench/commands"
+TICK_MS = 5
+
+
+class MiniBroker:
+    """最小 MQTT 3.1.1 broker 替身，运行在独立线程的事件循环中.
+
+    不做路由，只回应协议要求的确认包；read_kbps > 0 时按该速率读取客户端数据，
+    同时缩小接收缓冲区，让客户端的发送缓冲区尽快被填满。
+    """
+
+    SOCKET_BUFFER = 16 * 1024
+
+    def __init__(self, read_kbps: float = 0):
+        self.read_kbps = read_kbps
+        self.port = None
+        self.published = 0
+        self._loop = None
+        self._server = None
+        self._clients = set()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        self._ready.wait(5)
+        return self
+
+    def stop(self):
+        if self._loop:
+            asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result(2)
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(2)
+
+    async def _shutdown(self):
+        self._server.close()
+        for task in list(self._clients):
+            task.cancel()
+        await asyncio.gather(*self._clients, return_exceptions=True)
+
+    def _run(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+
+        # 接收缓冲区需在 listen 之前设置，才能影响 TCP 窗口
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if self.read_kbps > 0:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.SOCKET_BUFFER)
+        sock.bind(("127.0.0.1", 0))
+        self._server = self._loop.run_until_complete(
+            asyncio.start_server(self._handle_client, sock=sock)
+        )
+        self.port = sock.getsockname()[1]
+        self._ready.set()
+        self._loop.run_forever()
+        self._loop.close()
+
+    async def _handle_client(self, reader, writer):
+        self._clients.add(asyncio.current_task())
+        try:
+            while True:
+                header = await reader.readexactly(1)
+                length, multiplier = 0, 1
+                while True:
+                    byte = (await reader.readexactly(1))[0]
+                    length += (byte & 0x7F) * multiplier
+                    multiplier *= 128
+                    if not byte & 0x80:
+                        break
+                body = await reader.readexactly(length) if length else b""
+                if self.read_kbps > 0:
+                    await asyncio.sleep(length / (self.read_kbps * 1024))
+
+                packet_type = header[0] & 0xF0
+                if packet_type == 0x10:  # CONNECT
+                    writer.write(b"\x20\x02\x00\x00")
+                elif packet_type == 0x80:  # SUBSCRIBE
+                    writer.write(b"\x90\x03" + body[:2] + b"\x00")
+                elif packet_type == 0x30:  # PUBLISH
+                    self.published += 1
+                    qos = (header[0] >> 1) & 0x03
+                    if qos:
+                        topic_len = int.from_bytes(body[:2], "big")
+                        mid = body[2 + topic_len : 4 + topic_len]
+                        writer.write(b"\x40\x02" + mid)
+                elif packet_type == 0xC0:  # PINGREQ
+                    writer.write(b"\xd0\x00")
+                elif packet_type == 0xE0:  # DISCONNECT
+                    break
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self._clients.discard(asyncio.current_task())
+            writer.close()
+
+
+async def monitor_loop(stop: asyncio.Event, lateness: list):
+    """
+    每 TICK_MS 醒来一次，记录实际唤醒比预期晚了多少（即事件循环被阻塞的时间）.
+    """
+    interval = TICK_MS / 1000
+    while not stop.is_set():
+        expected = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        lateness.append(max(0.0, time.perf_counter() - expected) * 1000)
+
+
+def connect_client(port: int, client_id: str, limit_buffer: bool) -> mqtt.Client:
+    client = mqtt.Client(client_id=client_id)
+    connected = threading.Event()
+    client.on_connect = lambda *args: connected.set()
+    client.connect("127.0.0.1", port, keepalive=60)
+    if limit_buffer:
+        # 同样缩小客户端发送缓冲区，模拟慢上行时 socket 写阻塞
+        client.socket().setsockopt(
+            socket.SOL_SOCKET, socket.SO_SNDBUF, MiniBroker.SOCKET_BUFFER
+        )
+    client.loop_start()
+    if not connected.wait(5):
+        raise RuntimeError("连接 broker 替身超时")
+    return client
+
+
+async def run_mode(mode: str, broker: MiniBroker, messages: int, payload: str):
+    loop = asyncio.get_running_loop()
+    client = connect_client(broker.port, f"bench-{mode}", broker.read_kbps > 0)
+
+    if mode == "blocking":
+
+        async def send(message):
+            client.publish(TOPIC, message).wait_for_publish()
+            return True
+
+    else:
+        protocol = MqttProtocol(loop)
+        protocol.mqtt_client = client
+        protocol.publish_topic = TOPIC
+        client.on_publish = lambda c, u, mid: loop.call_soon_threadsafe(
+            protocol._resolve_publish, mid
+        )
+        send = protocol.send_text
+
+    stop = asyncio.Event()
+    lateness = []
+    monitor = asyncio.create_task(monitor_loop(stop, lateness))
+    await asyncio.sleep(0.05)
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(send(payload) for _ in range(messages)))
+    elapsed = time.perf_counter() - started
+
+    await asyncio.sleep(0.05)
+    stop.set()
+    await monitor
+    client.loop_stop()
+    client.disconnect()
+
+    values = np.asarray(lateness or [0.0])
+    return {
+        "ok": sum(1 for r in results if r),
+        "elapsed_s": elapsed,
+        "stall_p99_ms": float(np.percentile(values, 99)),
+        "stall_max_ms": float(values.max()),
+        "stall_total_ms": float(values[values > TICK_MS].sum()),
+    }
+
+
+async def main_async(args):
+    broker = MiniBroker(args.read_kbps).start()
+    payload = "x" * args.payload_bytes
+    modes = ["blocking", "async"] if args.mode == "both" else [args.mode]
+    try:
+        print(
+            f"{'方式':<10}{'成功':>6}{'总耗时(s)':>11}{'p99阻塞(ms)':>13}"
+            f"{'最长阻塞(ms)':>14}{'累计阻塞(ms)':>14}"
+        )
+        for mode in modes:
+            stats = await run_mode(mode, broker, args.messages, payload)
+            print(
+                f"{mode:<10}{stats['ok']:>6}{stats['elapsed_s']:>11.2f}"
+                f"{stats['stall_p99_ms']:>13.1f}{stats['stall_max_ms']:>14.1f}"
+                f"{stats['stall_total_ms']:>14.1f}"
+            )
+    finally:
+        broker.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MQTT 发布事件循环阻塞测试")
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--payload-bytes", type=int, default=8192)
+    parser.add_argument(
+        "--read-kbps", type=float, default=512, help="broker 读取速率，0为不限速"
+    )
+    parser.add_argument(
+        "--mode", choices=["blocking", "async", "both"], default="both"
+    )
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+UDP 音频数据包加解密基准测试.
+
+对比两种实现处理单个音频包的吞吐：
+- legacy：原 MqttProtocol 的做法，每包 bytes.fromhex 解析密钥、字符串拼接 hex nonce、
+  新建 Cipher 与 encryptor/decryptor
+- cached：PacketCipher，会话内只解析一次密钥和 nonce 模板，struct.pack_into 写 nonce，
+  复用同一个 AES 加密器生成 CTR 密钥流
+
+用法:
+    python scripts/bench_packet_cipher.py [--packets 50000] [--payload-bytes 120]
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+
+# 添加项目根目录到路径
+project_root = Path(__file__).resolve().parents[1]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.protocols.packet_cipher import PacketCipher  # noqa: E402
+
+
+def legacy_encrypt(key_hex: str, nonce_hex: str, payload: bytes, sequence: int):
+    new_nonce = (
+        nonce_hex[:4]
+        + format(len(payload), "04x")
+        + nonce_hex[8:24]
+        + format(sequence, "08x")
+    )
+    cipher = Cipher(
+        algorithms.AES(bytes.fromhex(key_hex)),
+        modes.CTR(bytes.fromhex(new_nonce)),
+        backend=default_backend(),
+    )
+    encryptor = cipher.encryptor()
+    encrypted = encryptor.update(bytes(payload)) + encryptor.finalize()
+    return bytes.fromhex(new_nonce) + encrypted
+
+
+def legacy_decrypt(key_hex: str, packet: bytes):
+    nonce = packet[:16]
+    sequence = int.from_bytes(nonce[12:16], "big")
+    cipher = Cipher(
+        algorithms.AES(bytes.fromhex(key_hex)),
+        modes.CTR(nonce),
+        backend=default_backend(),
+    )
+    decryptor = cipher.decryptor()
+    return sequence, decryptor.update(packet[16:]) + decryptor.finalize()
+
+
+def bench(fn, packets: int) -> float:
+    started = time.perf_counter()
+    for sequence in range(packets):
+        fn(sequence)
+    return packets / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="UDP 音频包加解密基准测试")
+    parser.add_argument("--packets", type=int, default=50000)
+    parser.add_argument("--payload-bytes", type=int, default=120)
+    args = parser.parse_args()
+
+    key_hex = os.urandom(16).hex()
+    nonce_hex = os.urandom(16).hex()
+    payload = os.urandom(args.payload_bytes)
+    cipher = PacketCipher(key_hex, nonce_hex)
+
+    # 两种实现的输出必须一致
+    for sequence in (1, 2, 0xFFFFFFFF):
+        packet = legacy_encrypt(key_hex, nonce_hex, payload, sequence)
+        if cipher.encrypt(payload, sequence) != packet:
+            raise SystemExit("PacketCipher 加密结果与原实现不一致")
+        if cipher.decrypt(packet) != (sequence, payload):
+            raise SystemExit("PacketCipher 解密结果与原实现不一致")
+
+    packet = cipher.encrypt(payload, 1)
+    results = {
+        "encrypt": (
+            bench(
+                lambda seq: legacy_encrypt(key_hex, nonce_hex, payload, seq),
+                args.packets,
+            ),
+            bench(lambda seq: cipher.encrypt(payload, seq), args.packets),
+        ),
+        "decrypt": (
+            bench(lambda seq: legacy_decrypt(key_hex, packet), args.packets),
+            bench(lambda seq: cipher.decrypt(packet), args.packets),
+        ),
+    }
+
+    print(f"{'操作':<10}{'legacy(包/秒)':>16}{'cached(包/秒)':>16}{'加速':>8}")
+    for name, (legacy, cached) in results.items():
+        print(f"{name:<10}{legacy:>16.0f}{cached:>16.0f}{cached / legacy:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+插件广播分发基准测试.
+
+模拟应用运行时的插件组合和消息节奏，对比两种分发方式：
+- sequential：原实现，按注册顺序逐个 await，不限时
+- concurrent：当前实现，各插件并发执行（同一插件内按顺序），超出时限后不再等待，
+  时间窗内多次超时被隔离（mcp 除外）
+
+插件：mcp（tools/call 耗时 --tool-ms）、ui（每条 JSON 耗时 --ui-ms，设备状态
+--ui-state-ms）、iot（立即返回）、probe（注册在最后，记录消息到达时间）。
+--hang-ms 大于 0 时 ui 每处理 --hang-every 条消息卡住一次，用于观察超时和隔离。
+
+最后单独检查插件彻底卡死（钩子永不返回）的情况：连续分发 --messages 条消息，
+卡死插件应在 QUARANTINE_STRIKES 次超时内被隔离，此后分发不再等待它，
+后台未完成的调用不随消息数增长。
+
+与应用一致：每条 JSON 消息单独起任务分发，设备状态变更在 set_device_state 中
+直接 await。报告 probe 收到 JSON 的延迟、设备状态广播阻塞调用方的时长，以及
+超时、隔离次数。
+
+用法:
+    python scripts/bench_plugin_dispatch.py [--messages 300] [--interval-ms 20]
+        [--tool-every 10] [--tool-ms 300] [--ui-ms 40] [--ui-state-ms 20]
+        [--hang-ms 0] [--hang-every 50] [--timeout-ms 200]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).resolve().parents[1]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.plugins.base import Plugin  # noqa: E402
+from src.plugins.manager import PluginManager  # noqa: E402
+
+
+class McpLike(Plugin):
+    name = "mcp"
+
+    def __init__(self, tool_ms: float):
+        super().__init__()
+        self.tool_ms = tool_ms
+
+    async def on_incoming_json(self, message):
+        if message.get("method") == "tools/call":
+            await asyncio.sleep(self.tool_ms / 1000)
+
+
+class UiLike(Plugin):
+    name = "ui"
+
+    def __init__(self, args):
+        super().__init__()
+        self.args = args
+        self.count = 0
+
+    async def on_incoming_json(self, message):
+        self.count += 1
+        args = self.args
+        if args.hang_ms and self.count % args.hang_every == 0:
+            await asyncio.sleep(args.hang_ms / 1000)
+        else:
+            await asyncio.sleep(args.ui_ms / 1000)
+
+    async def on_device_state_changed(self, state):
+        await asyncio.sleep(self.args.ui_state_ms / 1000)
+
+
+class IotLike(Plugin):
+    name = "iot"
+
+    async def on_incoming_json(self, message):
+        return None
+
+
+class Stuck(Plugin):
+    name = "stuck"
+
+    async def on_incoming_json(self, message):
+        await asyncio.Event().wait()
+
+
+class Probe(Plugin):
+    name = "probe"
+
+    def __init__(self):
+        super().__init__()
+        self.delays = []
+
+    async def on_incoming_json(self, message):
+        self.delays.append((time.monotonic() - message["sent"]) * 1000)
+
+
+def percentile(values: list, pct: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+async def run_case(name: str, args) -> dict:
+    if name == "sequential":
+        options = {"CONCURRENT_DISPATCH": False, "HOOK_TIMEOUT": 1e9}
+    else:
+        options = {
+            "CONCURRENT_DISPATCH": True,
+            "HOOK_TIMEOUT": args.timeout_ms / 1000,
+            "TIMEOUTS": {"mcp": max(args.timeout_ms, args.tool_ms * 2) / 1000},
+            "QUARANTINE_STRIKES": 3,
+            "QUARANTINE_WINDOW": 60.0,
+            "QUARANTINE_SECONDS": args.quarantine_s,
+        }
+    manager = PluginManager(options)
+    probe = Probe()
+    manager.register(McpLike(args.tool_ms), UiLike(args), IotLike(), probe)
+
+    tasks = []
+    state_blocked = []
+    for index in range(args.messages):
+        method = "tools/call" if index % args.tool_every == 0 else "notify"
+        message = {"type": "mcp", "method": method, "sent": time.monotonic()}
+        tasks.append(asyncio.create_task(manager.notify_incoming_json(message)))
+        if index % 10 == 0:
+            started = time.monotonic()
+            await manager.notify_device_state_changed("speaking")
+            state_blocked.append((time.monotonic() - started) * 1000)
+        await asyncio.sleep(args.interval_ms / 1000)
+    await asyncio.gather(*tasks)
+    await manager.shutdown_all()
+
+    stats = manager.get_stats()
+    return {
+        "probe_p50": percentile(probe.delays, 50),
+        "probe_p95": percentile(probe.delays, 95),
+        "probe_max": max(probe.delays),
+        "state_p50": percentile(state_blocked, 50),
+        "state_max": max(state_blocked),
+        "timeouts": sum(
+            hook["timeouts"] for s in stats.values() for hook in s["hooks"].values()
+        ),
+        "quarantines": sum(s["quarantines"] for s in stats.values()),
+        "skipped": sum(s["skipped"] for s in stats.values()),
+        "stats": stats,
+    }
+
+
+async def run_hung_case(args) -> dict:
+    strikes = 3
+    manager = PluginManager(
+        {
+            "HOOK_TIMEOUT": args.timeout_ms / 1000,
+            "QUARANTINE_STRIKES": strikes,
+            "QUARANTINE_WINDOW": 60.0,
+            "QUARANTINE_SECONDS": 60.0,
+        }
+    )
+    probe = Probe()
+    manager.register(Stuck(), probe)
+    started = time.monotonic()
+    for _ in range(args.messages):
+        await manager.notify_incoming_json({"sent": time.monotonic()})
+    elapsed = time.monotonic() - started
+    stats = manager.get_stats()["stuck"]
+    overrunning = len(manager._overrunning)
+    await manager.shutdown_all()
+    return {
+        "elapsed": elapsed,
+        "limit": strikes * args.timeout_ms / 1000,
+        "timeouts": stats["hooks"]["on_incoming_json"]["timeouts"],
+        "quarantined": stats["quarantined"],
+        "overrunning": overrunning,
+        "delivered": len(probe.delays),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="插件广播分发基准测试")
+    parser.add_argument("--messages", type=int, default=300)
+    parser.add_argument("--interval-ms", type=float, default=20)
+    parser.add_argument("--tool-every", type=int, default=10)
+    parser.add_argument("--tool-ms", type=float, default=300)
+    parser.add_argument("--ui-ms", type=float, default=40)
+    parser.add_argument("--ui-state-ms", type=float, default=20)
+    parser.add_argument("--hang-ms", type=float, default=0)
+    parser.add_argument("--hang-every", type=int, default=50)
+    parser.add_argument("--timeout-ms", type=float, default=200)
+    parser.add_argument("--quarantine-s", type=float, default=2.0)
+    parser.add_argument("--verbose", action="store_true", help="输出各插件统计")
+    args = parser.parse_args()
+
+    print(
+        f"消息: {args.messages}（间隔 {args.interval_ms}ms），tools/call 每 "
+        f"{args.tool_every} 条耗时 {args.tool_ms}ms，ui {args.ui_ms}ms/条，"
+        f"卡顿 {args.hang_ms}ms/每{args.hang_every}条"
+    )
+    print(
+        f"{'方式':<12}{'probe P50':>10}{'P95':>8}{'最大':>8}"
+        f"{'状态阻塞P50':>12}{'最大':>8}{'超时':>6}{'隔离':>6}{'跳过':>6}"
+    )
+    for name in ("sequential", "concurrent"):
+        r = asyncio.run(run_case(name, args))
+        print(
+            f"{name:<12}{r['probe_p50']:>10.1f}{r['probe_p95']:>8.1f}"
+            f"{r['probe_max']:>8.1f}{r['state_p50']:>12.1f}{r['state_max']:>8.1f}"
+            f"{r['timeouts']:>6}{r['quarantines']:>6}{r['skipped']:>6}"
+        )
+        if args.verbose:
+            for plugin, stats in r["stats"].items():
+                print(f"  {plugin}: {stats}")
+
+    r = asyncio.run(run_hung_case(args))
+    ok = r["quarantined"] and r["elapsed"] <= r["limit"] + 0.5 and r["overrunning"] <= 1
+    print(
+        f"卡死插件: 分发 {args.messages} 条耗时 {r['elapsed']:.2f}s"
+        f"（上限约 {r['limit']:.2f}s），超时 {r['timeouts']}，"
+        f"隔离 {r['quarantined']}，后台未完成调用 {r['overrunning']}，"
+        f"probe 收到 {r['delivered']} 条 -> {'通过' if ok else '失败'}"
+    )
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
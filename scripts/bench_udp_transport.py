@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+UDP 音频传输基准测试.
+
+在子进程中启动本地 UDP 回显服务（替代小智服务端的 UDP 端口），客户端按批发送
+音频大小的数据报并等待回显，对比两种接收/发送方式：
+- thread：原实现，阻塞套接字 + 0.5s 超时的接收线程，每个包用新闭包
+  call_soon_threadsafe 投递到事件循环，发送在事件循环线程阻塞 sendto
+- asyncio：UdpAudioChannel（DatagramProtocol），收发都在事件循环，一次可读事件
+  批量取出已到达的数据报
+
+报告每秒往返包数、每包 CPU 开销（整个进程 process_time / 包数）和丢包数。
+
+用法:
+    python scripts/bench_udp_transport.py [--packets 50000] [--burst 16]
+        [--payload-bytes 120] [--mode both]
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).resolve().parents[1]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.protocols.udp_channel import UdpAudioChannel  # noqa: E402
+
+NONCE_SIZE = 16
+BURST_TIMEOUT = 0.5
+
+
+def echo_server(port_queue, stop_event):
+    """
+    UDP 回显服务（子进程），原样返回收到的数据报.
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    sock.settimeout(0.2)
+    port_queue.put(sock.getsockname()[1])
+    while not stop_event.is_set():
+        try:
+            data, addr = sock.recvfrom(4096)
+        except socket.timeout:
+            continue
+        sock.sendto(data, addr)
+    sock.close()
+
+
+class Counter:
+    def __init__(self):
+        self.received = 0
+        self.target = 0
+        self.event = asyncio.Event()
+
+    def add(self, count: int):
+        self.received += count
+        if self.received >= self.target:
+            self.event.set()
+
+    async def wait_for(self, target: int) -> int:
+        """
+        等待累计收到 target 个包，超时返回实际缺少的数量.
+        """
+        self.target = target
+        if self.received < target:
+            self.event.clear()
+            try:
+                await asyncio.wait_for(self.event.wait(), BURST_TIMEOUT)
+            except asyncio.TimeoutError:
+                pass
+        missing = max(0, target - self.received)
+        self.received = max(self.received, target)
+        return missing
+
+
+async def run_bursts(send, counter: Counter, packets: int, burst: int, payload):
+    lost = 0
+    sent = 0
+    started = time.perf_counter()
+    cpu_started = time.process_time()
+    while sent < packets:
+        count = min(burst, packets - sent)
+        for _ in range(count):
+            send(payload)
+        sent += count
+        lost += await counter.wait_for(sent)
+    return {
+        "elapsed": time.perf_counter() - started,
+        "cpu": time.process_time() - cpu_started,
+        "lost": lost,
+    }
+
+
+async def bench_thread(port: int, packets: int, burst: int, payload: bytes):
+    loop = asyncio.get_running_loop()
+    counter = Counter()
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.settimeout(0.5)
+    running = True
+
+    def receive_thread():
+        while running:
+            try:
+                data, _ = sock.recvfrom(4096)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+
+            def process(packet=data):
+                counter.add(1)
+
+            loop.call_soon_threadsafe(process)
+
+    # 先发一个包让套接字绑定本地端口，再启动接收线程
+    sock.sendto(payload, ("127.0.0.1", port))
+    thread = threading.Thread(target=receive_thread, daemon=True)
+    thread.start()
+    await counter.wait_for(1)
+    counter.received = 0
+
+    try:
+        return await run_bursts(
+            lambda data: sock.sendto(data, ("127.0.0.1", port)),
+            counter,
+            packets,
+            burst,
+            payload,
+        )
+    finally:
+        running = False
+        thread.join(1.0)
+        sock.close()
+
+
+async def bench_asyncio(port: int, packets: int, burst: int, payload: bytes):
+    counter = Counter()
+    channel = await UdpAudioChannel.open(
+        "127.0.0.1", port, lambda batch: counter.add(len(batch))
+    )
+    try:
+        result = await run_bursts(channel.send, counter, packets, burst, payload)
+        stats = channel.get_stats()
+        result["avg_batch"] = stats["received"] / max(1, stats["batches"])
+        return result
+    finally:
+        channel.close()
+
+
+async def main_async(args, port: int):
+    payload = bytes(NONCE_SIZE + args.payload_bytes)
+    modes = ["thread", "asyncio"] if args.mode == "both" else [args.mode]
+    runners = {"thread": bench_thread, "asyncio": bench_asyncio}
+
+    print(f"{'方式':<10}{'包/秒':>10}{'CPU(us/包)':>12}{'丢包':>6}{'平均批量':>10}")
+    for mode in modes:
+        result = await runners[mode](port, args.packets, args.burst, payload)
+        received = args.packets - result["lost"]
+        pps = received / result["elapsed"]
+        cpu_us = result["cpu"] / max(1, received) * 1e6
+        avg_batch = result.get("avg_batch")
+        batch_text = f"{avg_batch:>10.2f}" if avg_batch else f"{'-':>10}"
+        print(f"{mode:<10}{pps:>10.0f}{cpu_us:>12.1f}{result['lost']:>6}{batch_text}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="UDP 音频传输基准测试")
+    parser.add_argument("--packets", type=int, default=50000)
+    parser.add_argument("--burst", type=int, default=16, help="每批连续发送的包数")
+    parser.add_argument(
+        "--payload-bytes", type=int, default=120, help="Opus 帧大小（不含nonce）"
+    )
+    parser.add_argument(
+        "--mode", choices=["thread", "asyncio", "both"], default="both"
+    )
+    args = parser.parse_args()
+
+    port_queue = multiprocessing.Queue()
+    stop_event = multiprocessing.Event()
+    server = multiprocessing.Process(
+        target=echo_server, args=(port_queue, stop_event), daemon=True
+    )
+    server.start()
+    try:
+        asyncio.run(main_async(args, port_queue.get(timeout=5)))
+    finally:
+        stop_event.set()
+        server.join(2)
+
+
+if __name__ == "__main__":
+    main()
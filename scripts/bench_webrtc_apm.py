@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+WebRTC APM 绑定微基准.
+
+对比两种调用方式处理同一帧（20/40/60ms）的耗时：
+- legacy：每个10ms块用 (ctypes.c_short * 160)(*array) 逐样本构造 ctypes 数组，
+  结果再 np.array(...) 转回（原 AECProcessor._process_single_aec_frame 的做法）
+- array：process_reverse_stream_array / process_stream_array 直接传 NumPy 地址，
+  输出写入预分配数组
+
+用法:
+    python scripts/bench_webrtc_apm.py [--frame-ms 20,40,60] [--iterations 2000]
+"""
+
+import argparse
+import ctypes
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# 添加项目根目录到路径
+project_root = Path(__file__).resolve().parents[1]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from libs.webrtc_apm import (  # noqa: E402
+    WebRTCAudioProcessing,
+    create_default_config,
+)
+
+SAMPLE_RATE = 16000
+CHUNK = SAMPLE_RATE // 100
+
+
+def create_apm():
+    apm = WebRTCAudioProcessing()
+    config = create_default_config()
+    config.echo.enabled = True
+    config.noise_suppress.enabled = True
+    config.high_pass.enabled = True
+    if apm.apply_config(config) != 0:
+        raise RuntimeError("WebRTC APM配置失败")
+    capture_config = apm.create_stream_config(SAMPLE_RATE, 1)
+    render_config = apm.create_stream_config(SAMPLE_RATE, 1)
+    apm.set_stream_delay_ms(40)
+    return apm, capture_config, render_config
+
+
+def legacy_process(apm, capture_config, render_config, capture, reference):
+    chunks = []
+    for start in range(0, len(capture), CHUNK):
+        capture_buffer = (ctypes.c_short * CHUNK)(*capture[start : start + CHUNK])
+        reference_buffer = (ctypes.c_short * CHUNK)(*reference[start : start + CHUNK])
+        processed_capture = (ctypes.c_short * CHUNK)()
+        processed_reference = (ctypes.c_short * CHUNK)()
+        apm.process_reverse_stream(
+            reference_buffer, render_config, render_config, processed_reference
+        )
+        apm.process_stream(
+            capture_buffer, capture_config, capture_config, processed_capture
+        )
+        chunks.append(np.array(processed_capture, dtype=np.int16))
+    return np.concatenate(chunks)
+
+
+def array_process(apm, capture_config, render_config, capture, reference, out):
+    apm.process_reverse_stream_array(reference, render_config, render_config)
+    apm.process_stream_array(capture, capture_config, capture_config, out)
+    return out
+
+
+def bench(fn, iterations: int) -> dict:
+    durations = np.empty(iterations)
+    for i in range(iterations):
+        start = time.perf_counter()
+        fn()
+        durations[i] = (time.perf_counter() - start) * 1e6
+    return {
+        "p50": float(np.percentile(durations, 50)),
+        "p99": float(np.percentile(durations, 99)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="WebRTC APM 绑定微基准")
+    parser.add_argument("--frame-ms", default="20,40,60")
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    apm, capture_config, render_config = create_apm()
+    print(f"{'帧长':<6}{'方式':<8}{'p50(us)':>10}{'p99(us)':>10}")
+    for frame_ms in [int(f) for f in args.frame_ms.split(",")]:
+        size = SAMPLE_RATE * frame_ms // 1000
+        capture = rng.integers(-3000, 3000, size, dtype=np.int16)
+        reference = rng.integers(-3000, 3000, size, dtype=np.int16)
+        out = np.zeros(size, dtype=np.int16)
+
+        results = {
+            "legacy": bench(
+                lambda: legacy_process(
+                    apm, capture_config, render_config, capture, reference
+                ),
+                args.iterations,
+            ),
+            "array": bench(
+                lambda: array_process(
+                    apm, capture_config, render_config, capture, reference, out
+                ),
+                args.iterations,
+            ),
+        }
+        for name, stats in results.items():
+            print(
+                f"{frame_ms:<6}{name:<8}{stats['p50']:>10.1f}{stats['p99']:>10.1f}"
+            )
+        speedup = results["legacy"]["p50"] / results["array"]["p50"]
+        print(f"{'':<6}{'加速':<8}{speedup:>9.2f}x")
+
+    apm.destroy_stream_config(capture_config)
+    apm.destroy_stream_config(render_config)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,502 @@
+#!/usr/bin/env python3
+"""
+多客户端压测.
+
+启动本地模拟服务端（scripts/sim_xiaozhi_server.py），再以 --clients 个子进程各运行
+一个无头 Application（只注册 MCP 插件和压测探针，不打开音频设备和界面），经真实的
+WebsocketProtocol / MqttProtocol 连接模拟服务端，按手动对话（按住说话）跑
+--turns 轮：listen start → 实时上传 --speech-ms 的语音帧 → listen stop → 等待
+tts stop。
+
+每轮从 listen stop 起计时，统计收到 stt、首个 TTS 音频帧和 tts stop 的耗时
+（包含模拟服务端的 --think-ms 和 --tts-ms），输出各项 P50/P95/P99；同时用
+psutil 采样每个客户端进程的 CPU 占用和内存（RSS）。TTS 中途断线的轮次记为失败，
+下一轮开始前由 Application.connect_protocol() 重新连接。
+
+模拟服务端参数（--think-ms、--tts-ms、--latency-ms、--jitter-ms、--loss、
+--disconnect-rate、--tts-source）原样转发，含义见 sim_xiaozhi_server.py。
+
+用法:
+    python scripts/load_test_clients.py [--transport websocket|mqtt]
+        [--clients 20] [--turns 5] [--speech-ms 1000] [--gap-ms 200]
+        [--ramp-ms 50] [--think-ms 300] [--tts-ms 2000] [--latency-ms 0]
+        [--jitter-ms 0] [--loss 0] [--disconnect-rate 0] [--verbose]
+    python scripts/load_test_clients.py --server <地址> ...  # 连接已启动的服务端
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import struct
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).resolve().parents[1]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+SERVER_SCRIPT = project_root / "scripts" / "sim_xiaozhi_server.py"
+MIC_SAMPLE_RATE = 16000
+MIC_FRAME_MS = 60
+SERVER_OPTIONS = (
+    "think_ms",
+    "tts_ms",
+    "latency_ms",
+    "jitter_ms",
+    "loss",
+    "disconnect_rate",
+    "tts_source",
+)
+
+
+# -----------------------
+# 子进程：无头客户端
+# -----------------------
+
+
+def mic_frames(seconds: float) -> list:
+    """
+    上行语音帧：可用时用 opuslib 编码正弦波，否则为随机字节.
+    """
+    count = max(1, int(seconds * 1000 / MIC_FRAME_MS))
+    samples = MIC_SAMPLE_RATE * MIC_FRAME_MS // 1000
+    try:
+        import opuslib
+
+        encoder = opuslib.Encoder(MIC_SAMPLE_RATE, 1, opuslib.APPLICATION_VOIP)
+    except Exception:
+        return [os.urandom(120) for _ in range(count)]
+    frames = []
+    for index in range(count):
+        start = index * samples
+        pcm = struct.pack(
+            f"<{samples}h",
+            *(
+                int(6000 * math.sin(2 * math.pi * 300 * (start + i) / MIC_SAMPLE_RATE))
+                for i in range(samples)
+            ),
+        )
+        frames.append(encoder.encode(pcm, samples))
+    return frames
+
+
+def percentile(values: list, pct: float):
+    if not values:
+        return None
+    values = sorted(values)
+    index = min(len(values) - 1, max(0, math.ceil(pct / 100 * len(values)) - 1))
+    return values[index]
+
+
+def run_worker(args):
+    from src.application import Application
+    from src.plugins.base import Plugin
+    from src.plugins.mcp import McpPlugin
+    from src.utils.config_manager import ConfigManager
+
+    if not args.verbose:
+        logging.getLogger().setLevel(logging.CRITICAL)
+
+    class LoadProbePlugin(Plugin):
+        """
+        按轮次驱动手动对话并记录各阶段耗时.
+        """
+
+        name = "load_probe"
+
+        def __init__(self):
+            super().__init__()
+            self.app = None
+            self.frames = mic_frames(args.speech_ms / 1000)
+            self.turns = []
+            self.connect_ms = None
+            self.reconnects = 0
+            self._turn = None
+            self._tts_stop = asyncio.Event()
+
+        async def setup(self, app):
+            self.app = app
+
+        async def start(self):
+            await super().start()
+            self.app.spawn(self._run(), "load:probe")
+
+        async def on_incoming_json(self, message):
+            turn = self._turn
+            if turn is None or not isinstance(message, dict):
+                return
+            now = time.monotonic()
+            msg_type = message.get("type")
+            if msg_type == "stt":
+                turn.setdefault("stt", now)
+            elif msg_type == "tts" and message.get("state") == "stop":
+                turn.setdefault("tts_stop", now)
+                self._tts_stop.set()
+
+        async def on_incoming_audio(self, data, sequence=None):
+            turn = self._turn
+            if turn is not None:
+                turn.setdefault("first_audio", time.monotonic())
+                turn["audio_frames"] = turn.get("audio_frames", 0) + 1
+
+        async def _run(self):
+            try:
+                for index in range(args.turns):
+                    await self._one_turn()
+                    if index + 1 < args.turns:
+                        await asyncio.sleep(args.gap_ms / 1000)
+            finally:
+                self._report()
+                self.app._shutdown_event.set()
+
+        async def _one_turn(self):
+            app = self.app
+            if not app.is_audio_channel_opened():
+                if not await app.connect_protocol():
+                    self.turns.append({"ok": False, "error": "connect"})
+                    return
+                self.reconnects += 1
+
+            await app.start_listening_manual()
+            started = time.monotonic()
+            for index, frame in enumerate(self.frames):
+                # 按帧时长实时上传，模拟麦克风
+                wait = started + index * MIC_FRAME_MS / 1000 - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                await app.protocol.send_audio(frame)
+
+            self._tts_stop.clear()
+            self._turn = turn = {"end": time.monotonic()}
+            await app.stop_listening_manual()
+            try:
+                await asyncio.wait_for(
+                    self._tts_stop.wait(), timeout=args.turn_timeout
+                )
+                turn["ok"] = True
+            except asyncio.TimeoutError:
+                turn["ok"] = False
+                turn["error"] = "timeout"
+            self._turn = None
+
+            end = turn.pop("end")
+            for key in ("stt", "first_audio", "tts_stop"):
+                if key in turn:
+                    turn[key] = (turn[key] - end) * 1000
+            self.turns.append(turn)
+
+        def _report(self):
+            result = {
+                "client": args.index,
+                "turns": self.turns,
+                "connect_ms": self.connect_ms,
+                "reconnects": self.reconnects,
+                "cpu_s": time.process_time(),
+            }
+            try:
+                import resource
+
+                # Linux 为 KB，macOS 为字节
+                rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+                unit = 1024**2 if sys.platform == "darwin" else 1024
+                result["max_rss_mb"] = rss / unit
+            except ImportError:
+                pass
+            print(f"RESULT {json.dumps(result)}", flush=True)
+
+    class HeadlessApplication(Application):
+        """
+        无音频设备和界面的 Application，协议连接参数指向模拟服务端.
+        """
+
+        def _create_plugins(self, mode):
+            self.probe = LoadProbePlugin()
+            return [McpPlugin(), self.probe]
+
+        def _set_protocol(self, protocol_type):
+            super()._set_protocol(protocol_type)
+            if protocol_type != "mqtt":
+                self.protocol.WEBSOCKET_URL = args.server
+
+        async def connect_protocol(self):
+            started = time.monotonic()
+            opened = await super().connect_protocol()
+            if opened and self.probe.connect_ms is None:
+                self.probe.connect_ms = (time.monotonic() - started) * 1000
+            return opened
+
+    # 只改内存中的配置，不写回 config.json
+    config = ConfigManager.get_instance()
+    options = config._config["SYSTEM_OPTIONS"]
+    options["CLIENT_ID"] = f"load-client-{args.index}"
+    options["DEVICE_ID"] = "02:00:00:%02x:%02x:%02x" % (
+        (args.index >> 16) & 0xFF,
+        (args.index >> 8) & 0xFF,
+        args.index & 0xFF,
+    )
+    options["NETWORK"] = {
+        **options["NETWORK"],
+        "WEBSOCKET_ACCESS_TOKEN": "load-test",
+        "WEBSOCKET_KEEP_WARM": False,
+        "MQTT_INFO": {
+            "endpoint": args.server,
+            "client_id": f"load-client-{args.index}",
+            "username": "load",
+            "password": "load",
+            "publish_topic": "device-server",
+            "subscribe_topic": f"devices/p2p/load-{args.index}",
+        },
+        "RECONNECT": {**options["NETWORK"]["RECONNECT"], "ENABLED": False},
+    }
+
+    app = HeadlessApplication()
+    app.auto_start_conversation = False
+    sys.exit(asyncio.run(app.run(protocol=args.transport, mode="cli")))
+
+
+# -----------------------
+# 主进程：启动服务端和客户端，汇总结果
+# -----------------------
+
+
+def start_server(args):
+    command = [
+        sys.executable,
+        str(SERVER_SCRIPT),
+        "--transport",
+        args.transport,
+        "--seed",
+        str(args.seed),
+        "--control-stdin",
+    ]
+    for name in SERVER_OPTIONS:
+        command += [f"--{name.replace('_', '-')}", str(getattr(args, name))]
+    process = subprocess.Popen(
+        command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True
+    )
+    line = process.stdout.readline().split()
+    if len(line) != 3 or line[0] != "READY":
+        process.kill()
+        raise SystemExit("模拟服务端启动失败")
+    return process, line[2]
+
+
+def stop_server(process) -> dict:
+    try:
+        process.stdin.close()
+        for line in process.stdout:
+            if line.startswith("STATS "):
+                return json.loads(line[6:])
+    finally:
+        process.wait(timeout=10)
+    return {}
+
+
+def sample_resources(processes: list, samples: dict, stop: threading.Event):
+    """
+    每 0.5 秒采样一次各客户端进程的 CPU 占用和 RSS.
+    """
+    import psutil
+
+    handles = {}
+    for index, process in enumerate(processes):
+        try:
+            handles[index] = psutil.Process(process.pid)
+            handles[index].cpu_percent(None)
+        except psutil.Error:
+            pass
+    while not stop.wait(0.5):
+        for index, handle in handles.items():
+            try:
+                cpu = handle.cpu_percent(None)
+                rss = handle.memory_info().rss / 1024**2
+            except psutil.Error:
+                continue
+            if handle.status() == psutil.STATUS_ZOMBIE:
+                continue
+            entry = samples.setdefault(index, {"cpu": [], "rss": []})
+            entry["cpu"].append(cpu)
+            entry["rss"].append(rss)
+
+
+def spawn_clients(args, server: str) -> list:
+    processes = []
+    base = [
+        sys.executable,
+        str(Path(__file__).resolve()),
+        "--worker",
+        "--transport",
+        args.transport,
+        "--server",
+        server,
+        "--turns",
+        str(args.turns),
+        "--speech-ms",
+        str(args.speech_ms),
+        "--gap-ms",
+        str(args.gap_ms),
+        "--turn-timeout",
+        str(args.turn_timeout),
+    ]
+    if args.verbose:
+        base.append("--verbose")
+    for index in range(args.clients):
+        processes.append(
+            subprocess.Popen(
+                base + ["--index", str(index)],
+                stdout=subprocess.PIPE,
+                stderr=None if args.verbose else subprocess.DEVNULL,
+                text=True,
+            )
+        )
+        if args.ramp_ms:
+            time.sleep(args.ramp_ms / 1000)
+    return processes
+
+
+def collect(processes: list) -> list:
+    results = []
+    for process in processes:
+        stdout, _ = process.communicate()
+        for line in stdout.splitlines():
+            if line.startswith("RESULT "):
+                results.append(json.loads(line[7:]))
+                break
+    return results
+
+
+def format_ms(value) -> str:
+    return "-" if value is None else f"{value:.0f}"
+
+
+def report(args, results: list, samples: dict, server_stats: dict, elapsed: float):
+    turns = [turn for result in results for turn in result["turns"]]
+    ok = [turn for turn in turns if turn.get("ok")]
+    print(
+        f"传输: {args.transport}，客户端: {args.clients}（上报 {len(results)}），"
+        f"每客户端 {args.turns} 轮，总耗时 {elapsed:.1f}s"
+    )
+    print(
+        f"服务端: think {args.think_ms}ms，TTS {args.tts_ms}ms，"
+        f"延迟 {args.latency_ms}±{args.jitter_ms}ms，丢包 {args.loss}，"
+        f"断线率 {args.disconnect_rate}，TTS 来源 {server_stats.get('tts_source', '-')}"
+    )
+    print(
+        f"成功轮次: {len(ok)}/{len(turns)}，"
+        f"重连: {sum(r['reconnects'] for r in results)}，"
+        f"服务端注入断线: {server_stats.get('injected_disconnects', 0)}"
+    )
+
+    print(f"{'指标(ms)':<16}{'P50':>8}{'P95':>8}{'P99':>8}{'最大':>8}")
+    rows = [("connect", [r["connect_ms"] for r in results if r["connect_ms"]])]
+    for key in ("stt", "first_audio", "tts_stop"):
+        rows.append((key, [turn[key] for turn in ok if key in turn]))
+    for name, values in rows:
+        print(
+            f"{name:<18}{format_ms(percentile(values, 50)):>8}"
+            f"{format_ms(percentile(values, 95)):>8}"
+            f"{format_ms(percentile(values, 99)):>8}"
+            f"{format_ms(max(values) if values else None):>8}"
+        )
+    frames = [turn.get("audio_frames", 0) for turn in ok]
+    if frames:
+        expected = max(1, int(args.tts_ms / 60))
+        print(f"每轮收到 TTS 帧: 平均 {sum(frames) / len(frames):.1f}/{expected}")
+
+    cpu_avg = [sum(s["cpu"]) / len(s["cpu"]) for s in samples.values() if s["cpu"]]
+    cpu_peak = [max(s["cpu"]) for s in samples.values() if s["cpu"]]
+    rss_peak = [max(s["rss"]) for s in samples.values() if s["rss"]]
+    cpu_s = [r["cpu_s"] for r in results]
+    if cpu_avg:
+        print(
+            f"每客户端 CPU: 平均 {sum(cpu_avg) / len(cpu_avg):.1f}%，"
+            f"峰值 {max(cpu_peak):.1f}%，进程 CPU 时间 P50 "
+            f"{percentile(cpu_s, 50):.2f}s"
+        )
+    if rss_peak:
+        print(
+            f"每客户端内存(RSS): P50 {percentile(rss_peak, 50):.1f}MB，"
+            f"最大 {max(rss_peak):.1f}MB"
+        )
+    if args.json:
+        summary = {
+            "results": results,
+            "server": server_stats,
+            "samples": {str(k): v for k, v in samples.items()},
+        }
+        args.json.write_text(json.dumps(summary, ensure_ascii=False), "utf-8")
+        print(f"明细已写入: {args.json}")
+
+
+def run_driver(args):
+    # 先在主进程创建配置文件，避免多个子进程同时生成
+    from src.utils.config_manager import ConfigManager
+
+    ConfigManager.get_instance()
+
+    server_process = None
+    server = args.server
+    if not server:
+        server_process, server = start_server(args)
+    print(f"模拟服务端: {server}")
+
+    started = time.monotonic()
+    processes = spawn_clients(args, server)
+    samples = {}
+    stop = threading.Event()
+    sampler = threading.Thread(
+        target=sample_resources, args=(processes, samples, stop), daemon=True
+    )
+    sampler.start()
+    try:
+        results = collect(processes)
+    finally:
+        stop.set()
+        sampler.join()
+        server_stats = stop_server(server_process) if server_process else {}
+    report(args, results, samples, server_stats, time.monotonic() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="多客户端压测")
+    parser.add_argument(
+        "--transport", choices=["websocket", "mqtt"], default="websocket"
+    )
+    parser.add_argument("--server", help="已启动的模拟服务端地址，不指定则自动启动")
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--turns", type=int, default=5)
+    parser.add_argument("--speech-ms", type=float, default=1000, help="每轮上传的语音时长")
+    parser.add_argument("--gap-ms", type=float, default=200, help="两轮之间的间隔")
+    parser.add_argument("--ramp-ms", type=float, default=50, help="客户端启动间隔")
+    parser.add_argument("--turn-timeout", type=float, default=15.0)
+    parser.add_argument("--think-ms", type=float, default=300)
+    parser.add_argument("--tts-ms", type=float, default=2000)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--loss", type=float, default=0)
+    parser.add_argument("--disconnect-rate", type=float, default=0)
+    parser.add_argument(
+        "--tts-source", choices=["auto", "synth", "echo", "random"], default="auto"
+    )
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", type=Path, help="把明细写入 JSON 文件")
+    parser.add_argument("--verbose", action="store_true", help="输出客户端日志")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--index", type=int, default=0, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args)
+    else:
+        run_driver(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+断线重连模拟.
+
+模拟服务端重启导致整批设备同时断线后的重连过程，两种模式：
+
+- fleet：虚拟时钟下的离散事件模拟（秒级完成）。服务端停机 --down 秒，恢复后每秒最多
+  完成 --capacity 次握手，超出的请求失败。对比原实现的线性退避
+  （min(次数*2, 30)秒，最多 --legacy-attempts 次）与 ReconnectPolicy（指数退避 +
+  全抖动 + 熔断），报告每100毫秒请求峰值（全程/服务恢复后）、总请求数、恢复耗时和
+  放弃的设备数
+- live：启动本地 WebSocket 替身服务（应答 hello），用 --clients 个真实的
+  WebsocketProtocol 连上后，服务端以 1012 关闭全部连接并在 --down 秒内对握手返回
+  503，随后恢复；报告服务端每100毫秒收到的握手请求峰值和全部客户端重连耗时
+
+用法:
+    python scripts/sim_reconnect.py fleet [--clients 5000] [--down 20]
+        [--capacity 200] [--legacy-attempts 5] [--seed 1]
+    python scripts/sim_reconnect.py live [--clients 50] [--down 3]
+        [--base-delay 0.2] [--max-delay 2] [--timeout 30]
+"""
+
+import argparse
+import asyncio
+import heapq
+import logging
+import random
+import sys
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).resolve().parents[1]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.protocols.reconnect_policy import ReconnectPolicy  # noqa: E402
+
+# -----------------------
+# fleet：虚拟时钟模拟
+# -----------------------
+
+
+class LegacyPolicy:
+    """
+    原实现：第 n 次等待 min(n*2, 30) 秒，超过最大次数放弃.
+    """
+
+    def __init__(self, max_attempts: int):
+        self.max_attempts = max_attempts
+        self.attempts = 0
+
+    def start_outage(self):
+        self.attempts = 0
+
+    def next_delay(self):
+        if self.attempts >= self.max_attempts:
+            return None
+        self.attempts += 1
+        return min(self.attempts * 2, 30)
+
+    def record_success(self):
+        self.attempts = 0
+
+    def record_failure(self):
+        pass
+
+
+def simulate_fleet(make_policy, args) -> dict:
+    now = [0.0]
+    server_load = Counter()  # 每秒已完成的握手数
+    attempts = Counter()  # 每100毫秒的请求数
+    policies = [make_policy(i, lambda: now[0]) for i in range(args.clients)]
+
+    events = []
+    for client_id, policy in enumerate(policies):
+        policy.start_outage()
+        delay = policy.next_delay()
+        heapq.heappush(events, (delay, client_id))
+
+    recovered_at = []
+    gave_up = 0
+    while events:
+        now[0], client_id = heapq.heappop(events)
+        second = int(now[0])
+        attempts[int(now[0] * 10)] += 1
+        policy = policies[client_id]
+
+        if now[0] >= args.down and server_load[second] < args.capacity:
+            server_load[second] += 1
+            policy.record_success()
+            recovered_at.append(now[0])
+            continue
+
+        policy.record_failure()
+        delay = policy.next_delay()
+        if delay is None:
+            gave_up += 1
+        else:
+            heapq.heappush(events, (now[0] + delay, client_id))
+
+    recovered_at.sort()
+    after_up = [count for bucket, count in attempts.items() if bucket >= args.down * 10]
+    return {
+        "peak": max(attempts.values()),
+        "peak_up": max(after_up, default=0),
+        "attempts": sum(attempts.values()),
+        "recovered": len(recovered_at),
+        "p50_s": recovered_at[len(recovered_at) // 2] if recovered_at else None,
+        "all_s": recovered_at[-1] if len(recovered_at) == args.clients else None,
+        "gave_up": gave_up,
+        "breaker_opens": sum(
+            getattr(p, "get_stats", lambda: {})().get("breaker_opens", 0)
+            for p in policies
+        ),
+    }
+
+
+def run_fleet(args):
+    def legacy(client_id, clock):
+        return LegacyPolicy(args.legacy_attempts)
+
+    def jittered(client_id, clock):
+        return ReconnectPolicy(
+            base_delay=args.base_delay,
+            max_delay=args.max_delay,
+            max_elapsed=args.max_elapsed,
+            failure_threshold=args.failure_threshold,
+            open_seconds=args.open_seconds,
+            clock=clock,
+            rng=random.Random(args.seed * 100003 + client_id).random,
+        )
+
+    print(
+        f"设备数: {args.clients}，停机: {args.down}s，"
+        f"恢复后握手容量: {args.capacity}/s"
+    )
+    header = (
+        f"{'策略':<8}{'峰值/100ms':>11}{'恢复后峰值':>11}{'总请求':>8}{'已恢复':>7}"
+        f"{'P50(s)':>8}{'全部(s)':>8}{'放弃':>6}{'熔断':>6}"
+    )
+    print(header)
+    for name, factory in (("legacy", legacy), ("policy", jittered)):
+        result = simulate_fleet(factory, args)
+        p50 = f"{result['p50_s']:.1f}" if result["p50_s"] is not None else "-"
+        done = f"{result['all_s']:.1f}" if result["all_s"] is not None else "-"
+        print(
+            f"{name:<8}{result['peak']:>11}{result['peak_up']:>11}"
+            f"{result['attempts']:>8}{result['recovered']:>7}{p50:>8}{done:>8}"
+            f"{result['gave_up']:>6}{result['breaker_opens']:>6}"
+        )
+
+
+# -----------------------
+# live：本地替身服务 + 真实 WebsocketProtocol
+# -----------------------
+
+
+class StandInServer:
+    """
+    最小的小智 WebSocket 替身：应答 hello，可整体断开并在停机期间拒绝握手.
+    """
+
+    def __init__(self):
+        self.down = False
+        self.connections = set()
+        self.handshakes = []  # 握手请求到达时间
+        self.server = None
+        self.port = 0
+
+    async def start(self):
+        import websockets
+
+        self.server = await websockets.serve(
+            self._handler, "127.0.0.1", 0, process_request=self._process_request
+        )
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def _process_request(self, path, request_headers):
+        self.handshakes.append(time.monotonic())
+        if self.down:
+            return 503, [], b"restarting\n"
+        return None
+
+    async def _handler(self, websocket, path=None):
+        from src.utils import json_codec
+
+        self.connections.add(websocket)
+        try:
+            async for message in websocket:
+                if isinstance(message, str):
+                    data = json_codec.loads(message)
+                    if data.get("type") == "hello":
+                        reply = {
+                            "type": "hello",
+                            "transport": "websocket",
+                            "session_id": uuid.uuid4().hex,
+                            "audio_params": data.get("audio_params"),
+                        }
+                        await websocket.send(json_codec.dumps(reply))
+        except Exception:
+            pass
+        finally:
+            self.connections.discard(websocket)
+
+    async def restart(self, down_seconds: float):
+        """
+        以 1012（服务重启）关闭全部连接，停机期间握手返回 503.
+        """
+        self.down = True
+        await asyncio.gather(
+            *(ws.close(1012, "service restart") for ws in list(self.connections)),
+            return_exceptions=True,
+        )
+        await asyncio.sleep(down_seconds)
+        self.down = False
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+
+async def run_live_async(args):
+    from src.protocols.websocket_protocol import WebsocketProtocol
+
+    server = StandInServer()
+    await server.start()
+    url = f"ws://127.0.0.1:{server.port}/xiaozhi/v1/"
+
+    clients = []
+    for index in range(args.clients):
+        protocol = WebsocketProtocol()
+        protocol.WEBSOCKET_URL = url
+        protocol._keep_warm = False
+        protocol.enable_auto_reconnect(True)
+        protocol._reconnect_policy = ReconnectPolicy(
+            base_delay=args.base_delay,
+            max_delay=args.max_delay,
+            max_elapsed=args.timeout,
+            failure_threshold=args.failure_threshold,
+            open_seconds=args.open_seconds,
+            rng=random.Random(args.seed * 100003 + index).random,
+        )
+        clients.append(protocol)
+
+    connected = await asyncio.gather(*(p.connect() for p in clients))
+    print(f"初始连接: {sum(connected)}/{args.clients}")
+
+    server.handshakes.clear()
+    restarted = time.monotonic()
+    await server.restart(args.down)
+    print(f"服务端已恢复（停机 {args.down}s），等待客户端重连...")
+
+    deadline = restarted + args.timeout
+    while time.monotonic() < deadline:
+        if all(p.is_audio_channel_opened() for p in clients):
+            break
+        await asyncio.sleep(0.05)
+    elapsed = time.monotonic() - restarted
+    reconnected = sum(p.is_audio_channel_opened() for p in clients)
+
+    buckets = Counter(int((t - restarted) * 10) for t in server.handshakes)
+    stats = [p.get_connection_info()["reconnect"] for p in clients]
+    print(f"已重连: {reconnected}/{args.clients}，耗时: {elapsed:.2f}s")
+    print(
+        f"握手请求总数: {len(server.handshakes)}，"
+        f"每100ms峰值: {max(buckets.values()) if buckets else 0}"
+    )
+    print(
+        f"熔断次数: {sum(s['breaker_opens'] for s in stats)}，"
+        f"放弃: {sum(s['give_ups'] for s in stats)}"
+    )
+
+    for protocol in clients:
+        await protocol.close_audio_channel()
+    await server.stop()
+    return reconnected == args.clients
+
+
+def run_live(args):
+    if not args.verbose:
+        logging.getLogger("src").setLevel(logging.CRITICAL)
+    ok = asyncio.run(run_live_async(args))
+    if not ok:
+        raise SystemExit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="断线重连模拟")
+    sub = parser.add_subparsers(dest="mode", required=True)
+
+    fleet = sub.add_parser("fleet", help="虚拟时钟下的整批设备重连模拟")
+    fleet.add_argument("--clients", type=int, default=5000)
+    fleet.add_argument("--down", type=float, default=20.0, help="服务端停机秒数")
+    fleet.add_argument(
+        "--capacity", type=int, default=200, help="恢复后每秒可完成的握手数"
+    )
+    fleet.add_argument("--legacy-attempts", type=int, default=5)
+    fleet.add_argument("--base-delay", type=float, default=1.0)
+    fleet.add_argument("--max-delay", type=float, default=30.0)
+    fleet.add_argument("--max-elapsed", type=float, default=300.0)
+    fleet.add_argument("--failure-threshold", type=int, default=5)
+    fleet.add_argument("--open-seconds", type=float, default=60.0)
+    fleet.add_argument("--seed", type=int, default=1)
+
+    live = sub.add_parser("live", help="本地替身服务 + 真实 WebsocketProtocol")
+    live.add_argument("--clients", type=int, default=50)
+    live.add_argument("--down", type=float, default=3.0, help="服务端停机秒数")
+    live.add_argument("--base-delay", type=float, default=0.2)
+    live.add_argument("--max-delay", type=float, default=2.0)
+    live.add_argument("--failure-threshold", type=int, default=5)
+    live.add_argument("--open-seconds", type=float, default=4.0)
+    live.add_argument("--timeout", type=float, default=30.0)
+    live.add_argument("--seed", type=int, default=1)
+    live.add_argument("--verbose", action="store_true", help="输出协议日志")
+
+    args = parser.parse_args()
+    if args.mode == "fleet":
+        run_fleet(args)
+    else:
+        run_live(args)
+
+
+if __name__ == "__main__":
+    main()
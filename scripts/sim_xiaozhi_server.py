@@ -0,0 +1,726 @@
+#!/usr/bin/env python3
+"""
+本地模拟小智服务端.
+
+用于协议层的压测和延迟测试，不依赖真实服务器。支持两种传输：
+
+- websocket：WebSocket 服务，JSON 为文本帧、Opus 为二进制帧
+- mqtt：内置最小的 MQTT 3.1.1 代理（CONNECT/SUBSCRIBE/PUBLISH/PING），
+  hello 应答下发 UDP 地址和 AES 密钥，音频走 AES-CTR 加密的 UDP
+
+会话流程与小智服务端一致：hello 应答（启用 MCP 时随后下发 initialize 和
+tools/list）；listen start 后接收上行音频，listen stop（manual）或静音
+--vad-silence-ms（auto/realtime）视为一句话结束，等待 --think-ms 后依次下发
+stt、llm、tts start、sentence_start、按帧时长实时发送 --tts-ms 的 TTS 音频、
+sentence_end、tts stop；abort 会中断正在下发的 TTS。
+
+TTS 音频来源（--tts-source auto 时按顺序选择）：synth 用 opuslib 合成正弦波；
+echo 回放客户端本轮上传的帧；random 为随机字节（无法解码，只用于测协议开销）。
+
+故障注入对服务端下发的数据生效：--latency-ms/--jitter-ms 为每条消息的附加延迟，
+WebSocket 和 MQTT 消息保持顺序，UDP 包各自延迟因而可能乱序；--loss 为 UDP
+丢包率（两个方向）；--disconnect-rate 为每轮对话在 TTS 中途断开连接的概率。
+
+启动后输出一行 "READY <transport> <地址>"；加 --control-stdin 时标准输入关闭即
+退出。退出前输出一行 "STATS <json>"。
+
+用法:
+    python scripts/sim_xiaozhi_server.py [--transport websocket|mqtt]
+        [--host 127.0.0.1] [--port 0] [--think-ms 300] [--tts-ms 2000]
+        [--tts-source auto|synth|echo|random] [--latency-ms 0] [--jitter-ms 0]
+        [--loss 0] [--disconnect-rate 0] [--seed 1] [--control-stdin]
+"""
+
+import argparse
+import asyncio
+import math
+import os
+import random
+import signal
+import struct
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).resolve().parents[1]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.protocols.packet_cipher import PacketCipher  # noqa: E402
+from src.utils import json_codec  # noqa: E402
+
+SAMPLE_RATE = 24000
+FRAME_DURATION = 60  # 毫秒
+REPLY_TEXT = "这是本地模拟服务端的回复。"
+
+
+# -----------------------
+# 故障注入与 TTS 音频
+# -----------------------
+
+
+class FaultInjector:
+    """
+    下发方向的附加延迟、抖动、丢包和断线.
+    """
+
+    def __init__(self, args):
+        self.latency = max(0.0, args.latency_ms) / 1000
+        self.jitter = max(0.0, args.jitter_ms) / 1000
+        self.loss = min(max(0.0, args.loss), 1.0)
+        self.disconnect_rate = min(max(0.0, args.disconnect_rate), 1.0)
+        self.rng = random.Random(args.seed)
+
+    def delay(self) -> float:
+        if not self.jitter:
+            return self.latency
+        return self.latency + self.rng.random() * self.jitter
+
+    def drop(self) -> bool:
+        return self.loss > 0 and self.rng.random() < self.loss
+
+    def disconnect_after(self, frame_count: int):
+        """
+        本轮要断线时返回在第几帧之后断开，否则返回 None.
+        """
+        if self.disconnect_rate and self.rng.random() < self.disconnect_rate:
+            return self.rng.randrange(max(1, frame_count))
+        return None
+
+
+class TtsSource:
+    """
+    为每轮对话提供 TTS 的 Opus 帧.
+    """
+
+    def __init__(self, mode: str, seed: int):
+        self.frame_samples = SAMPLE_RATE * FRAME_DURATION // 1000
+        self.rng = random.Random(seed)
+        self.synth_frames = None
+        self.mode = mode
+        if mode in ("auto", "synth"):
+            self.synth_frames = self._synthesize(seconds=2.0)
+            if self.synth_frames is None and mode == "synth":
+                raise SystemExit("opuslib 不可用，无法合成 TTS 音频")
+        if mode == "auto":
+            self.mode = "synth" if self.synth_frames else "echo"
+
+    def _synthesize(self, seconds: float):
+        try:
+            from src.utils.opus_loader import setup_opus
+
+            setup_opus()
+            import opuslib
+
+            encoder = opuslib.Encoder(SAMPLE_RATE, 1, opuslib.APPLICATION_AUDIO)
+        except Exception:
+            return None
+        frames = []
+        total = int(seconds * 1000 / FRAME_DURATION)
+        for index in range(total):
+            start = index * self.frame_samples
+            pcm = struct.pack(
+                f"<{self.frame_samples}h",
+                *(
+                    int(8000 * math.sin(2 * math.pi * 440 * (start + i) / SAMPLE_RATE))
+                    for i in range(self.frame_samples)
+                ),
+            )
+            frames.append(encoder.encode(pcm, self.frame_samples))
+        return frames
+
+    def frames(self, count: int, uploaded: list) -> tuple[str, list]:
+        """
+        返回 (实际来源, 帧列表).
+        """
+        if self.mode == "synth":
+            synth = self.synth_frames
+            return "synth", [synth[i % len(synth)] for i in range(count)]
+        if self.mode == "echo" and uploaded:
+            return "echo", [uploaded[i % len(uploaded)] for i in range(count)]
+        return "random", [os.urandom(self.rng.randint(80, 160)) for _ in range(count)]
+
+
+class Outbox:
+    """
+    按注入的延迟顺序发送下发消息（同一连接内不乱序）.
+    """
+
+    def __init__(self, faults: FaultInjector, send):
+        self.faults = faults
+        self._send = send
+        self._queue = asyncio.Queue()
+        self._last_due = 0.0
+        self._task = asyncio.create_task(self._pump())
+
+    def put(self, item):
+        due = time.monotonic() + self.faults.delay()
+        self._last_due = max(self._last_due, due)
+        self._queue.put_nowait((self._last_due, item))
+
+    async def _pump(self):
+        try:
+            while True:
+                due, item = await self._queue.get()
+                wait = due - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                await self._send(item)
+        except asyncio.CancelledError:
+            pass
+        except Exception:
+            # 连接已断开，后续消息丢弃
+            pass
+
+    def close(self):
+        self._task.cancel()
+
+
+# -----------------------
+# 会话：与传输无关的消息流
+# -----------------------
+
+
+class SimSession:
+    """一个客户端会话.
+
+    传输层负责调用 on_json/on_audio，并提供 send_json(dict)、send_audio(bytes)
+    和 disconnect() 三个下发接口。
+    """
+
+    def __init__(self, server, transport, send_json, send_audio, disconnect):
+        self.server = server
+        self.transport = transport
+        self.session_id = uuid.uuid4().hex
+        self._send_json = send_json
+        self._send_audio = send_audio
+        self._disconnect = disconnect
+        self.listening = False
+        self.mode = "manual"
+        self.uploaded = []
+        self._vad_handle = None
+        self._reply_task = None
+        self._mcp_sent = {}
+
+    def hello_reply(self, hello: dict, extra: dict = None) -> dict:
+        reply = {
+            "type": "hello",
+            "transport": self.transport,
+            "session_id": self.session_id,
+            "audio_params": {
+                "format": "opus",
+                "sample_rate": SAMPLE_RATE,
+                "channels": 1,
+                "frame_duration": FRAME_DURATION,
+            },
+        }
+        if extra:
+            reply.update(extra)
+        return reply
+
+    def on_hello(self, hello: dict, extra: dict = None):
+        self.server.stats["sessions"] += 1
+        self.send_json(self.hello_reply(hello, extra))
+        if (hello.get("features") or {}).get("mcp"):
+            self._mcp_request(1, "initialize", {"capabilities": {}})
+            self._mcp_request(2, "tools/list", {"cursor": ""})
+
+    def send_json(self, message: dict):
+        message.setdefault("session_id", self.session_id)
+        self._send_json(message)
+
+    def _mcp_request(self, request_id: int, method: str, params: dict):
+        self._mcp_sent[request_id] = time.monotonic()
+        self.send_json(
+            {
+                "type": "mcp",
+                "payload": {
+                    "jsonrpc": "2.0",
+                    "id": request_id,
+                    "method": method,
+                    "params": params,
+                },
+            }
+        )
+
+    def on_json(self, data: dict):
+        msg_type = data.get("type")
+        if msg_type == "listen":
+            state = data.get("state")
+            if state == "start":
+                self._cancel_reply()
+                self.listening = True
+                self.mode = data.get("mode", "manual")
+                self.uploaded = []
+            elif state == "stop":
+                self._end_utterance()
+            elif state == "detect":
+                self.server.stats["wake_words"] += 1
+        elif msg_type == "abort":
+            self.server.stats["aborts"] += 1
+            if self._cancel_reply():
+                self.send_json({"type": "tts", "state": "stop"})
+        elif msg_type == "mcp":
+            payload = data.get("payload") or {}
+            sent = self._mcp_sent.pop(payload.get("id"), None)
+            if sent is not None:
+                self.server.record_latency("mcp_rtt_ms", time.monotonic() - sent)
+        elif msg_type == "goodbye":
+            self.close()
+
+    def on_audio(self, frame: bytes):
+        self.server.stats["frames_in"] += 1
+        if not self.listening:
+            return
+        self.uploaded.append(bytes(frame))
+        if self.mode != "manual":
+            # 服务端 VAD：持续静音（无上行帧）即一句话结束
+            if self._vad_handle:
+                self._vad_handle.cancel()
+            self._vad_handle = asyncio.get_running_loop().call_later(
+                self.server.args.vad_silence_ms / 1000, self._end_utterance
+            )
+
+    def _end_utterance(self):
+        if self._vad_handle:
+            self._vad_handle.cancel()
+            self._vad_handle = None
+        if not self.listening:
+            return
+        self.listening = False
+        self._cancel_reply()
+        self._reply_task = asyncio.create_task(self._reply(self.uploaded))
+
+    def _cancel_reply(self) -> bool:
+        task, self._reply_task = self._reply_task, None
+        if task and not task.done():
+            task.cancel()
+            return True
+        return False
+
+    async def _reply(self, uploaded: list):
+        args = self.server.args
+        try:
+            await asyncio.sleep(args.think_ms / 1000)
+            self.server.stats["turns"] += 1
+            self.send_json({"type": "stt", "text": f"收到{len(uploaded)}帧语音"})
+            self.send_json({"type": "llm", "text": "😊", "emotion": "happy"})
+            self.send_json({"type": "tts", "state": "start"})
+            self.send_json(
+                {"type": "tts", "state": "sentence_start", "text": REPLY_TEXT}
+            )
+
+            count = max(1, int(args.tts_ms / FRAME_DURATION))
+            source, frames = self.server.tts.frames(count, uploaded)
+            self.server.stats[f"tts_{source}"] += 1
+            cut = self.server.faults.disconnect_after(count)
+            started = time.monotonic()
+            for index, frame in enumerate(frames):
+                if index == cut:
+                    self.server.stats["injected_disconnects"] += 1
+                    self._disconnect()
+                    return
+                # 按帧时长实时下发，与真实服务端的流式 TTS 一致
+                wait = started + index * FRAME_DURATION / 1000 - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                self._send_audio(frame)
+                self.server.stats["frames_out"] += 1
+
+            self.send_json({"type": "tts", "state": "sentence_end", "text": REPLY_TEXT})
+            self.send_json({"type": "tts", "state": "stop"})
+        except asyncio.CancelledError:
+            pass
+
+    def close(self):
+        self._cancel_reply()
+        if self._vad_handle:
+            self._vad_handle.cancel()
+            self._vad_handle = None
+
+
+# -----------------------
+# WebSocket 传输
+# -----------------------
+
+
+class WebsocketTransport:
+    def __init__(self, server):
+        self.server = server
+        self._ws_server = None
+
+    async def start(self, host: str, port: int) -> str:
+        import websockets
+
+        self._ws_server = await websockets.serve(
+            self._handler, host, port, max_size=None
+        )
+        port = self._ws_server.sockets[0].getsockname()[1]
+        return f"ws://{host}:{port}/xiaozhi/v1/"
+
+    async def _handler(self, websocket, path=None):
+        server = self.server
+        server.stats["connections"] += 1
+
+        async def send(item):
+            await websocket.send(item)
+
+        outbox = Outbox(server.faults, send)
+
+        def send_json(message):
+            outbox.put(json_codec.dumps(message))
+
+        def disconnect():
+            # 模拟网络中断：直接断开 TCP，不发送关闭帧
+            websocket.transport.abort()
+
+        session = SimSession(server, "websocket", send_json, outbox.put, disconnect)
+        try:
+            async for message in websocket:
+                if isinstance(message, bytes):
+                    session.on_audio(message)
+                    continue
+                data = json_codec.loads(message)
+                if data.get("type") == "hello":
+                    session.on_hello(data)
+                else:
+                    session.on_json(data)
+        except Exception:
+            pass
+        finally:
+            session.close()
+            outbox.close()
+
+    async def stop(self):
+        self._ws_server.close()
+        await self._ws_server.wait_closed()
+
+
+# -----------------------
+# MQTT + UDP 传输
+# -----------------------
+
+
+def _mqtt_packet(packet_type: int, body: bytes) -> bytes:
+    header = bytearray([packet_type])
+    length = len(body)
+    while True:
+        byte, length = length % 128, length // 128
+        header.append(byte | (0x80 if length else 0))
+        if not length:
+            break
+    return bytes(header) + body
+
+
+def _mqtt_string(data: bytes, offset: int) -> tuple[bytes, int]:
+    (size,) = struct.unpack_from(">H", data, offset)
+    start = offset + 2
+    return data[start : start + size], start + size
+
+
+class UdpAudioServer(asyncio.DatagramProtocol):
+    """
+    所有 MQTT 会话共用的 UDP 音频端口，按 nonce 模板 [4:12] 区分会话.
+    """
+
+    def __init__(self, server):
+        self.server = server
+        self.sessions = {}  # nonce[4:12] -> MqttSession
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        if len(data) < 16:
+            return
+        session = self.sessions.get(bytes(data[4:12]))
+        if session is None:
+            self.server.stats["udp_unknown"] += 1
+            return
+        if self.server.faults.drop():
+            self.server.stats["udp_dropped"] += 1
+            return
+        session.peer = addr
+        try:
+            _, frame = session.cipher.decrypt(data)
+        except Exception:
+            self.server.stats["udp_errors"] += 1
+            return
+        session.sim.on_audio(frame)
+
+    def send(self, session, frame: bytes):
+        if session.peer is None:
+            # 客户端尚未发来任何 UDP 包，地址未知
+            self.server.stats["udp_unroutable"] += 1
+            return
+        if self.server.faults.drop():
+            self.server.stats["udp_dropped"] += 1
+            return
+        session.sequence = (session.sequence + 1) & 0xFFFFFFFF
+        packet = session.cipher.encrypt(frame, session.sequence)
+        delay = self.server.faults.delay()
+        if delay:
+            # 每个包独立延迟，抖动下会乱序
+            asyncio.get_running_loop().call_later(
+                delay, self._sendto, packet, session.peer
+            )
+        else:
+            self._sendto(packet, session.peer)
+
+    def _sendto(self, packet: bytes, addr):
+        if self.transport and not self.transport.is_closing():
+            self.transport.sendto(packet, addr)
+
+
+class MqttSession:
+    """
+    一个 MQTT 连接：解析最小的 MQTT 3.1.1 报文并承载一个 SimSession.
+    """
+
+    def __init__(self, transport, reader, writer):
+        self.transport = transport
+        self.server = transport.server
+        self.reader = reader
+        self.writer = writer
+        self.topic = None
+        self.cipher = None
+        self.conn_id = None
+        self.peer = None
+        self.sequence = 0
+        self.sim = None
+        self.outbox = Outbox(self.server.faults, self._write)
+
+    async def _write(self, data: bytes):
+        self.writer.write(data)
+        await self.writer.drain()
+
+    def publish(self, message: dict):
+        if not self.topic:
+            return
+        body = struct.pack(">H", len(self.topic)) + self.topic
+        self.outbox.put(_mqtt_packet(0x30, body + json_codec.dumps(message).encode()))
+
+    def disconnect(self):
+        self.writer.transport.abort()
+
+    async def _read_packet(self):
+        first = await self.reader.readexactly(1)
+        multiplier, length = 1, 0
+        while True:
+            byte = (await self.reader.readexactly(1))[0]
+            length += (byte & 0x7F) * multiplier
+            multiplier *= 128
+            if not byte & 0x80:
+                break
+        body = await self.reader.readexactly(length) if length else b""
+        return first[0], body
+
+    async def run(self):
+        self.server.stats["connections"] += 1
+        try:
+            while True:
+                header, body = await self._read_packet()
+                kind = header >> 4
+                if kind == 1:  # CONNECT
+                    await self._write(_mqtt_packet(0x20, b"\x00\x00"))
+                elif kind == 8:  # SUBSCRIBE
+                    packet_id = body[:2]
+                    topic, _ = _mqtt_string(body, 2)
+                    self.topic = topic
+                    await self._write(_mqtt_packet(0x90, packet_id + b"\x01"))
+                elif kind == 3:  # PUBLISH
+                    qos = (header >> 1) & 0x03
+                    _, offset = _mqtt_string(body, 0)
+                    if qos:
+                        packet_id = body[offset : offset + 2]
+                        offset += 2
+                        await self._write(_mqtt_packet(0x40, packet_id))
+                    self._on_message(body[offset:])
+                elif kind == 12:  # PINGREQ
+                    await self._write(_mqtt_packet(0xD0, b""))
+                elif kind == 14:  # DISCONNECT
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._close()
+
+    def _on_message(self, payload: bytes):
+        try:
+            data = json_codec.loads(payload)
+        except json_codec.JSONDecodeError:
+            return
+        if data.get("type") == "hello":
+            self._start_session(data)
+        elif self.sim is not None:
+            self.sim.on_json(data)
+
+    def _start_session(self, hello: dict):
+        udp = self.transport.udp
+        if self.sim is not None:
+            self.sim.close()
+            udp.sessions.pop(self.conn_id, None)
+        key = os.urandom(16)
+        nonce = bytearray(os.urandom(16))
+        nonce[0:4] = b"\x01\x00\x00\x00"
+        self.conn_id = bytes(nonce[4:12])
+        self.cipher = PacketCipher(key.hex(), nonce.hex())
+        self.peer = None
+        self.sequence = 0
+        udp.sessions[self.conn_id] = self
+        self.sim = SimSession(
+            self.server,
+            "udp",
+            self.publish,
+            lambda frame: udp.send(self, frame),
+            self.disconnect,
+        )
+        self.sim.on_hello(
+            hello,
+            {
+                "udp": {
+                    "server": self.transport.host,
+                    "port": self.transport.udp_port,
+                    "key": key.hex(),
+                    "nonce": nonce.hex(),
+                }
+            },
+        )
+
+    def _close(self):
+        self.outbox.close()
+        if self.sim is not None:
+            self.sim.close()
+            self.transport.udp.sessions.pop(self.conn_id, None)
+        self.writer.close()
+
+
+class MqttTransport:
+    def __init__(self, server):
+        self.server = server
+        self.host = None
+        self.udp = None
+        self.udp_port = 0
+        self._tcp_server = None
+        self._udp_transport = None
+
+    async def start(self, host: str, port: int) -> str:
+        loop = asyncio.get_running_loop()
+        self.host = host
+        self._tcp_server = await asyncio.start_server(self._handle, host, port)
+        port = self._tcp_server.sockets[0].getsockname()[1]
+        self._udp_transport, self.udp = await loop.create_datagram_endpoint(
+            lambda: UdpAudioServer(self.server), local_addr=(host, 0)
+        )
+        self.udp_port = self._udp_transport.get_extra_info("sockname")[1]
+        return f"{host}:{port}"
+
+    async def _handle(self, reader, writer):
+        await MqttSession(self, reader, writer).run()
+
+    async def stop(self):
+        self._tcp_server.close()
+        await self._tcp_server.wait_closed()
+        self._udp_transport.close()
+
+
+# -----------------------
+# 入口
+# -----------------------
+
+
+class SimServer:
+    def __init__(self, args):
+        self.args = args
+        self.faults = FaultInjector(args)
+        self.tts = TtsSource(args.tts_source, args.seed)
+        self.stats = Counter()
+        self.latencies = {}
+
+    def record_latency(self, name: str, seconds: float):
+        self.latencies.setdefault(name, []).append(seconds * 1000)
+
+    def summary(self) -> dict:
+        result = dict(self.stats)
+        result["tts_source"] = self.tts.mode
+        for name, values in self.latencies.items():
+            values = sorted(values)
+            result[name] = {
+                "count": len(values),
+                "p50": round(values[len(values) // 2], 2),
+                "max": round(values[-1], 2),
+            }
+        return result
+
+
+async def serve(args):
+    server = SimServer(args)
+    if args.transport == "websocket":
+        transport = WebsocketTransport(server)
+    else:
+        transport = MqttTransport(server)
+    address = await transport.start(args.host, args.port)
+    print(f"READY {args.transport} {address}", flush=True)
+
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    try:
+        loop.add_signal_handler(signal.SIGTERM, stop.set)
+        loop.add_signal_handler(signal.SIGINT, stop.set)
+    except (NotImplementedError, RuntimeError):
+        # Windows 不支持，依赖 KeyboardInterrupt 或 --control-stdin
+        pass
+    if args.control_stdin:
+
+        def watch_stdin():
+            for _ in sys.stdin:
+                pass
+            loop.call_soon_threadsafe(stop.set)
+
+        threading.Thread(target=watch_stdin, daemon=True).start()
+
+    try:
+        await stop.wait()
+    finally:
+        await transport.stop()
+        print(f"STATS {json_codec.dumps(server.summary())}", flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="本地模拟小智服务端")
+    parser.add_argument(
+        "--transport", choices=["websocket", "mqtt"], default="websocket"
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0, help="0 为自动分配")
+    parser.add_argument("--think-ms", type=float, default=300, help="语音结束到 stt 的耗时")
+    parser.add_argument("--tts-ms", type=float, default=2000, help="每轮 TTS 音频时长")
+    parser.add_argument(
+        "--tts-source", choices=["auto", "synth", "echo", "random"], default="auto"
+    )
+    parser.add_argument("--vad-silence-ms", type=float, default=500)
+    parser.add_argument("--latency-ms", type=float, default=0, help="下发附加延迟")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="下发延迟抖动上限")
+    parser.add_argument("--loss", type=float, default=0, help="UDP 丢包率 0~1")
+    parser.add_argument(
+        "--disconnect-rate", type=float, default=0, help="每轮 TTS 中途断线的概率"
+    )
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--control-stdin", action="store_true", help="标准输入关闭时退出"
+    )
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
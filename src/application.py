@@ -1,6 +1,8 @@
 import asyncio
 import sys
 import threading
+import time
+from collections import deque
 from pathlib import Path
 from typing import Any, Awaitable
 
@@ -12,6 +14,7 @@ try:
 except Exception:
     pass
 
+from src.audio_codecs.frame_transport import FrameTransport
 from src.constants.constants import DeviceState, ListeningMode
 from src.plugins.calendar import CalendarPlugin
 from src.plugins.iot import IoTPlugin
@@ -93,6 +96,24 @@ class Application:
 
         # 插件
         self.plugins = PluginManager()
+        # 当前会话是否已广播协议就绪（保温连接在后台建立时不广播，首次使用时补发）
+        self._plugins_notified = False
+
+        # 收到的音频：有界队列 + 单个常驻消费协程按序交给插件，满时丢弃最旧帧
+        incoming = self.config.get_config("AUDIO_OPTIONS.INCOMING_QUEUE", {}) or {}
+        self._incoming_audio = FrameTransport(
+            max(1, int(incoming.get("MAX_FRAMES", 50))), "incoming"
+        )
+        self._incoming_batch = max(1, int(incoming.get("MAX_BATCH", 8)))
+        self._incoming_task: asyncio.Task | None = None
+        # 中止或通道关闭时递增，之前入队的帧不再交给插件
+        self._incoming_generation = 0
+        self._incoming_delays: deque = deque(maxlen=500)
+        self._incoming_stats = {
+            "delivered": 0,
+            "discarded": 0,  # 中止/通道关闭后丢弃的帧
+            "max_queue_delay_ms": 0.0,
+        }
 
     # -------------------------
     # 生命周期
@@ -105,20 +126,9 @@ class Application:
             self._initialize_async_objects()
             self._set_protocol(protocol)
             self._setup_protocol_callbacks()
-            # 插件：setup（延迟导入AudioPlugin，确保上面setup_opus已执行）
-            from src.plugins.audio import AudioPlugin
-
-            # 注册音频、UI、MCP、IoT、唤醒词、快捷键与日程插件（UI模式可通过配置 SYSTEM_OPTIONS.UI.MODE 指定 gui/cli）
-            self.plugins.register(
-                McpPlugin(),
-                IoTPlugin(),
-                AudioPlugin(),
-                WakeWordPlugin(),
-                CalendarPlugin(),
-                UIPlugin(mode=mode),
-                ShortcutsPlugin(),
-            )
+            self.plugins.register(*self._create_plugins(mode))
             await self.plugins.setup_all(self)
+            self._ensure_incoming_audio_consumer()
             # 启动后广播初始状态，确保 UI 就绪时能看到“待命”
             try:
                 await self.plugins.notify_device_state_changed(self.device_state)
@@ -140,6 +150,25 @@ class Application:
             except Exception as e:
                 logger.error(f"关闭应用时出错: {e}")
 
+    def _create_plugins(self, mode: str) -> list:
+        """创建要注册的插件.
+
+        默认注册音频、UI、MCP、IoT、唤醒词、快捷键与日程插件；无音频设备/界面的场景
+        （如 scripts/load_test_clients.py 的无头客户端）可在子类中覆盖。
+        """
+        # 延迟导入AudioPlugin，确保模块加载时的setup_opus已执行
+        from src.plugins.audio import AudioPlugin
+
+        return [
+            McpPlugin(),
+            IoTPlugin(),
+            AudioPlugin(),
+            WakeWordPlugin(),
+            CalendarPlugin(),
+            UIPlugin(mode=mode),
+            ShortcutsPlugin(),
+        ]
+
     async def connect_protocol(self):
         """
         确保协议通道打开并广播一次协议就绪。返回是否已打开。
@@ -147,6 +176,7 @@ class Application:
         # 已打开直接返回
         try:
             if self.is_audio_channel_opened():
+                await self._notify_protocol_connected_once()
                 return True
             if not self._connect_lock:
                 # 未初始化锁时，直接尝试一次
@@ -157,11 +187,12 @@ class Application:
                     logger.error("协议连接失败")
                     return False
                 logger.info("协议连接已建立，按Ctrl+C退出")
-                await self.plugins.notify_protocol_connected(self.protocol)
+                await self._notify_protocol_connected_once()
                 return True
 
             async with self._connect_lock:
                 if self.is_audio_channel_opened():
+                    await self._notify_protocol_connected_once()
                     return True
                 opened = await asyncio.wait_for(
                     self.protocol.open_audio_channel(), timeout=12.0
@@ -170,12 +201,21 @@ class Application:
                     logger.error("协议连接失败")
                     return False
                 logger.info("协议连接已建立，按Ctrl+C退出")
-                await self.plugins.notify_protocol_connected(self.protocol)
+                await self._notify_protocol_connected_once()
                 return True
         except asyncio.TimeoutError:
             logger.error("协议连接超时")
             return False
 
+    async def _notify_protocol_connected_once(self) -> None:
+        """
+        每个会话只广播一次协议就绪；通道关闭后重置.
+        """
+        if self._plugins_notified:
+            return
+        self._plugins_notified = True
+        await self.plugins.notify_protocol_connected(self.protocol)
+
     def _initialize_async_objects(self) -> None:
         logger.debug("初始化异步对象")
         self._shutdown_event = asyncio.Event()
@@ -188,6 +228,10 @@ class Application:
             self.protocol = MqttProtocol(asyncio.get_running_loop())
         else:
             self.protocol = WebsocketProtocol()
+        # 收到音频的队列深度并入协议遥测
+        self.protocol.telemetry.add_source(
+            "incoming_audio_queue", self._incoming_audio.qsize
+        )
 
     # -------------------------
     # 手动聆听（按住说话）
@@ -202,6 +246,7 @@ class Application:
             # 如果说话中发送打断
             if self.device_state == DeviceState.SPEAKING:
                 logger.info("说话中发送打断")
+                self._discard_incoming_audio()
                 await self.protocol.send_abort_speaking(None)
                 await self.set_device_state(DeviceState.IDLE)
             await self.protocol.send_start_listening(ListeningMode.MANUAL)
@@ -299,10 +344,69 @@ class Application:
         # if self._shutdown_event and not self._shutdown_event.is_set():
         #     self._shutdown_event.set()
 
-    def _on_incoming_audio(self, data: bytes):
-        logger.debug(f"收到二进制消息，长度: {len(data)}")
-        # 转发给插件
-        self.spawn(self.plugins.notify_incoming_audio(data), "plugin:on_audio")
+    def _on_incoming_audio(self, data: bytes, sequence: int | None = None):
+        # 入队后由常驻消费协程转发给插件，不再为每帧创建任务
+        # （sequence 由 UDP 通道从 nonce 解析，供抖动缓冲重排）
+        self._incoming_audio.put(
+            (self._incoming_generation, time.monotonic(), data, sequence)
+        )
+        if self._incoming_task is None or self._incoming_task.done():
+            self._ensure_incoming_audio_consumer()
+
+    def _ensure_incoming_audio_consumer(self) -> None:
+        """
+        启动收到音频的常驻消费协程（已在运行则忽略）.
+        """
+        if self._incoming_task is None or self._incoming_task.done():
+            self._incoming_task = self.spawn(
+                self._incoming_audio_loop(), "audio:incoming"
+            )
+
+    async def _incoming_audio_loop(self) -> None:
+        """常驻消费协程：按到达顺序把收到的音频交给插件.
+
+        中止或通道关闭后，队列中已过期（generation 不一致）的帧直接丢弃。
+        """
+        queue = self._incoming_audio
+        stats = self._incoming_stats
+        while True:
+            batch = await queue.get_batch(self._incoming_batch)
+            for generation, enqueued_at, data, sequence in batch:
+                if generation != self._incoming_generation:
+                    stats["discarded"] += 1
+                    continue
+                delay_ms = (time.monotonic() - enqueued_at) * 1000
+                self._incoming_delays.append(delay_ms)
+                if delay_ms > stats["max_queue_delay_ms"]:
+                    stats["max_queue_delay_ms"] = delay_ms
+                try:
+                    await self.plugins.notify_incoming_audio(data, sequence)
+                    stats["delivered"] += 1
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.debug(f"转发收到的音频失败: {e}")
+
+    def _discard_incoming_audio(self) -> None:
+        """
+        丢弃尚未交给插件的收到音频（中止说话或通道关闭时调用）.
+        """
+        self._incoming_generation += 1
+        self._incoming_stats["discarded"] += self._incoming_audio.clear()
+
+    def get_incoming_audio_stats(self) -> dict:
+        """
+        收到音频的排队延迟分位数、转发/丢弃计数、队列状态和各插件处理耗时.
+        """
+        delays = sorted(self._incoming_delays)
+        stats = dict(self._incoming_stats)
+        if delays:
+            stats["queue_delay_p50_ms"] = round(delays[len(delays) // 2], 2)
+            stats["queue_delay_p95_ms"] = round(delays[int(len(delays) * 0.95)], 2)
+        stats["max_queue_delay_ms"] = round(stats["max_queue_delay_ms"], 2)
+        stats["queue"] = self._incoming_audio.get_stats()
+        stats["plugins"] = self.plugins.get_audio_stats()
+        return stats
 
     def _on_incoming_json(self, json_data):
         try:
@@ -384,6 +488,8 @@ class Application:
 
     async def _on_audio_channel_closed(self):
         logger.info("协议通道已关闭")
+        self._plugins_notified = False
+        self._discard_incoming_audio()
         # 通道关闭回到 IDLE
         await self.set_device_state(DeviceState.IDLE)
 
@@ -462,6 +568,7 @@ class Application:
 
         logger.info(f"中止语音输出，原因: {reason}")
         self.aborted = True
+        self._discard_incoming_audio()
         await self.protocol.send_abort_speaking(reason)
         logger.debug(f"已发送中止命令，session_id: {getattr(self.protocol, 'session_id', 'unknown')}")
 
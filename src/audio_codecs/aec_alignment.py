@@ -0,0 +1,177 @@
+from collections import deque
+from typing import Optional
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+class EchoDelayEstimator:
+    """参考信号与采集信号的回声延迟估计.
+
+    两路信号按 5ms 块取绝对值均值得到包络（16kHz 下相当于 80 倍抽取），
+    每隔 interval_ms 在 ±max_delay_ms 范围内做归一化互相关，峰值足够明显时才采纳，
+    最近几次结果取中位数以抑制偶发错判。
+
+    正延迟：采集中的回声晚于配对的参考帧，交给 APM 的 stream delay；
+    负延迟：参考信号落后于回声，调用方应丢弃相应长度的参考数据重新对齐。
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        block_ms: int = 5,
+        window_ms: int = 1000,
+        max_delay_ms: int = 500,
+        interval_ms: int = 2000,
+        min_correlation: float = 0.5,
+    ):
+        self.block_size = sample_rate * block_ms // 1000
+        self.block_ms = block_ms
+        self.min_correlation = min_correlation
+        self._window = window_ms // block_ms
+        self._max_lag = max_delay_ms // block_ms
+        self._interval = interval_ms // block_ms
+
+        history = self._window + self._max_lag
+        self._capture_env = np.zeros(history, dtype=np.float32)
+        self._reference_env = np.zeros(history, dtype=np.float32)
+        self._filled = 0
+        self._since_estimate = 0
+
+        self._recent = deque(maxlen=5)
+        self.delay_ms: Optional[int] = None
+        self.correlation = 0.0
+        self.estimates = 0
+
+    def push(self, capture: np.ndarray, reference: np.ndarray) -> bool:
+        """送入一对等长的采集/参考帧（16kHz int16，帧长为块大小的整数倍）.
+
+        Returns:
+            本次是否产生了新的延迟估计
+        """
+        blocks = len(capture) // self.block_size
+        if blocks == 0:
+            return False
+        usable = blocks * self.block_size
+        self._append(self._capture_env, capture[:usable], blocks)
+        self._append(self._reference_env, reference[:usable], blocks)
+        self._filled = min(self._filled + blocks, len(self._capture_env))
+        self._since_estimate += blocks
+
+        if self._since_estimate < self._interval or self._filled < len(
+            self._capture_env
+        ):
+            return False
+        self._since_estimate = 0
+        return self._estimate()
+
+    def _append(self, history: np.ndarray, samples: np.ndarray, blocks: int):
+        history[:-blocks] = history[blocks:]
+        envelope = np.abs(samples.reshape(blocks, self.block_size), dtype=np.float32)
+        history[-blocks:] = envelope.mean(axis=1)
+
+    def _estimate(self) -> bool:
+        window, max_lag = self._window, self._max_lag
+        reference = self._reference_env - self._reference_env.mean()
+        capture = self._capture_env - self._capture_env.mean()
+        if float(reference[-window:].std()) < 1.0:
+            return False  # 没有播放内容，无从估计
+
+        # 正延迟：固定最近的采集窗口，在参考历史上向前滑动
+        # 负延迟：固定最近的参考窗口，在采集历史上向前滑动
+        positive = self._correlate(capture[-window:], reference)
+        negative = self._correlate(reference[-window:], capture)
+        lags = np.concatenate((-np.arange(max_lag, 0, -1), np.arange(0, max_lag + 1)))
+        scores = np.concatenate((negative[:0:-1], positive))
+        best = int(np.argmax(scores))
+        self.correlation = float(scores[best])
+        if self.correlation < self.min_correlation:
+            return False
+
+        self._recent.append(int(lags[best]) * self.block_ms)
+        self.delay_ms = int(np.median(self._recent))
+        self.estimates += 1
+        return True
+
+    @staticmethod
+    def _correlate(fixed: np.ndarray, history: np.ndarray) -> np.ndarray:
+        """
+        fixed 与 history 中所有等长窗口的归一化互相关，按窗口结束位置距末尾由近到远排列.
+        """
+        windows = sliding_window_view(history, len(fixed))[::-1]
+        norms = np.linalg.norm(windows, axis=1) * np.linalg.norm(fixed)
+        norms[norms == 0] = np.inf
+        return windows @ fixed / norms
+
+    def reset(self):
+        """
+        重新对齐参考信号后调用：清空历史，旧的延迟估计不再有效.
+        """
+        self._capture_env.fill(0)
+        self._reference_env.fill(0)
+        self._filled = 0
+        self._since_estimate = 0
+        self._recent.clear()
+
+    def get_stats(self) -> dict:
+        return {
+            "delay_ms": self.delay_ms,
+            "correlation": round(self.correlation, 3),
+            "estimates": self.estimates,
+        }
+
+
+class ClockDriftEstimator:
+    """参考信号与采集信号之间的时钟漂移估计.
+
+    记录参考信号累计写入样本数与采集累计消费样本数，在滑动窗口上做线性回归，
+    斜率偏离1的部分即两路时钟的速率差（ppm）。缓冲区裁剪/欠载不影响累计计数。
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        window_sec: float = 30.0,
+        interval_sec: float = 5.0,
+        smoothing: float = 0.3,
+    ):
+        self._window = int(window_sec * sample_rate)
+        self._interval = int(interval_sec * sample_rate)
+        self._smoothing = smoothing
+        self._points = deque()
+        self._last_estimate_at = 0
+        self.drift_ppm: Optional[float] = None
+
+    def update(self, written_total: int, consumed_total: int) -> bool:
+        """记录一次计数（每个采集帧调用）.
+
+        Returns:
+            本次是否更新了漂移估计
+        """
+        points = self._points
+        points.append((consumed_total, written_total))
+        while points and consumed_total - points[0][0] > self._window:
+            points.popleft()
+
+        if consumed_total - self._last_estimate_at < self._interval:
+            return False
+        if consumed_total - points[0][0] < self._window // 2:
+            return False
+        self._last_estimate_at = consumed_total
+
+        data = np.asarray(points, dtype=np.float64)
+        slope = float(np.polyfit(data[:, 0], data[:, 1], 1)[0])
+        ppm = (slope - 1.0) * 1e6
+        if self.drift_ppm is None:
+            self.drift_ppm = ppm
+        else:
+            self.drift_ppm += self._smoothing * (ppm - self.drift_ppm)
+        return True
+
+    def reset(self):
+        """
+        调整重采样比例后调用：此前的计数基于旧比例，需要重新累计.
+        """
+        self._points.clear()
+        self._last_estimate_at = 0
+        self.drift_ppm = None
@@ -1,15 +1,26 @@
 import platform
-from collections import deque
 from typing import Any, Dict, Optional
 
 import numpy as np
 import sounddevice as sd
+import soxr
 
+from src.audio_codecs.aec_alignment import ClockDriftEstimator, EchoDelayEstimator
+from src.audio_codecs.ring_buffer import AudioRingBuffer
 from src.constants.constants import AudioConfig
+from src.utils.config_manager import ConfigManager
 from src.utils.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# 漂移补偿：估计值超过死区才调整重采样比例，总补偿量限制在 ±1%
+DRIFT_DEADBAND_PPM = 50
+MAX_DRIFT_CORRECTION_PPM = 10000
+
+
+def _round_ms(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(value, 1)
+
 
 class AECProcessor:
     """
@@ -23,7 +34,7 @@ class AECProcessor:
         self._is_linux = self._platform == "linux"
         self._is_windows = self._platform == "windows"
 
-        # WebRTC APM 实例（仅 macOS 使用）
+        # WebRTC APM 实例（macOS，以及启用播放参考的 Linux）
         self.apm = None
         self.apm_config = None
         self.capture_config = None
@@ -35,19 +46,59 @@ class AECProcessor:
         self.reference_sample_rate = None
 
         # 缓冲区
-        self._reference_buffer = deque()
         self._webrtc_frame_size = 160  # WebRTC标准：16kHz, 10ms = 160 samples
         self._system_frame_size = AudioConfig.INPUT_FRAME_SIZE  # 系统配置的帧大小
+        # 参考信号保留约200ms，环形缓冲多预留一倍空间给回调突发写入
+        self._reference_max_samples = self._webrtc_frame_size * 20
+        self._reference_buffer = AudioRingBuffer(self._reference_max_samples * 2)
+        # 按帧长预分配的参考/输出数组，处理路径上不再分配
+        self._reference_frames: Dict[int, np.ndarray] = {}
+        self._processed_frames: Dict[int, np.ndarray] = {}
+
+        # Linux 播放参考：直接使用本进程写入输出流的 PCM 作为 render 信号
+        config = ConfigManager.get_instance()
+        self._playback_reference_enabled = bool(
+            config.get_config("AEC_OPTIONS.ENABLED", False)
+        ) and bool(config.get_config("AEC_OPTIONS.PLAYBACK_REFERENCE", True))
+        self._use_playback_reference = False
+        self._playback_sample_rate = None
+        self._reference_pushed_samples = 0
+
+        # 参考信号重采样（源采样率 -> 16kHz），输出采样率按漂移估计微调
+        self._reference_source_rate = None
+        self._reference_resampler = None
+        self._drift_ratio = 1.0
+
+        # 流延迟：初值取 PortAudio time_info 的输出延迟（写入->DAC）+ 输入延迟（ADC->回调），
+        # 互相关延迟估计给出结果后以估计值为准
+        self._stream_delay_ms = 40
+        self._output_latency_ms = None
+        self._input_latency_ms = None
+        self._delay_estimator = EchoDelayEstimator(AudioConfig.INPUT_SAMPLE_RATE)
+        self._drift_estimator = ClockDriftEstimator(AudioConfig.INPUT_SAMPLE_RATE)
+        self._capture_consumed_samples = 0
+        self._reference_realignments = 0
 
         # 状态标志
         self._is_initialized = False
         self._is_closing = False
 
-    async def initialize(self):
-        """
-        初始化AEC处理器.
+    async def initialize(self, playback_sample_rate: Optional[int] = None):
+        """初始化AEC处理器.
+
+        Args:
+            playback_sample_rate: 输出设备采样率，Linux 播放参考模式下用于参考信号重采样
         """
         try:
+            if self._is_linux and self._playback_reference_enabled:
+                if playback_sample_rate and await self._initialize_playback_reference(
+                    playback_sample_rate
+                ):
+                    self._is_initialized = True
+                    logger.info("AEC处理器初始化完成（WebRTC + 播放参考信号）")
+                    return
+                logger.info("Linux 播放参考不可用，回退到系统级回声消除")
+
             if self._is_windows or self._is_linux:
                 # Windows 和 Linux 平台使用系统级AEC，无需额外处理
                 logger.info(
@@ -74,14 +125,14 @@ class AECProcessor:
 
     async def _initialize_apm(self):
         """
-        初始化WebRTC音频处理模块（仅macOS）
+        初始化WebRTC音频处理模块（macOS / Linux 播放参考）
         """
-        if not self._is_macos:
-            logger.warning("非macOS平台调用了_initialize_apm，这不应该发生")
+        if self._is_windows:
+            logger.warning("Windows平台调用了_initialize_apm，这不应该发生")
             return
 
         try:
-            # 延迟导入，仅在macOS需要时加载本地库
+            # 延迟导入，仅在需要时加载本地库
             from libs.webrtc_apm import WebRTCAudioProcessing, create_default_config
 
             self.apm = WebRTCAudioProcessing()
@@ -115,7 +166,7 @@ class AECProcessor:
             self.render_config = self.apm.create_stream_config(sample_rate, channels)
 
             # 设置流延迟
-            self.apm.set_stream_delay_ms(40)  # 50ms延迟
+            self.apm.set_stream_delay_ms(self._stream_delay_ms)
 
             logger.info("WebRTC APM初始化完成")
 
@@ -123,6 +174,188 @@ class AECProcessor:
             logger.error(f"WebRTC APM初始化失败: {e}")
             raise
 
+    async def _initialize_playback_reference(self, sample_rate: int) -> bool:
+        """
+        初始化 Linux 播放参考路径：加载 WebRTC APM，并准备输出采样率 -> 16kHz 的重采样器.
+        """
+        try:
+            await self._initialize_apm()
+        except Exception as e:
+            logger.warning(f"Linux WebRTC APM 加载失败: {e}")
+            self.apm = None
+            return False
+
+        self._playback_sample_rate = int(sample_rate)
+        self._set_reference_source(self._playback_sample_rate)
+        self._reference_buffer.clear()
+        self._use_playback_reference = True
+        logger.info(
+            f"播放参考信号已启用: {self._playback_sample_rate}Hz -> "
+            f"{AudioConfig.INPUT_SAMPLE_RATE}Hz"
+        )
+        return True
+
+    def push_playback_reference(self, outdata: np.ndarray, time_info=None):
+        """写入本进程刚交给输出流的 PCM（播放回调中调用）.
+
+        静音同样写入，保证参考信号与采集信号在时间上连续对齐。
+
+        Args:
+            outdata: 输出回调填好的缓冲（设备采样率，int16）
+            time_info: PortAudio 回调时间信息，用于估计输出延迟
+        """
+        if not self._use_playback_reference or self._is_closing:
+            return
+
+        try:
+            if time_info is not None:
+                latency = time_info.outputBufferDacTime - time_info.currentTime
+                if latency > 0:
+                    self._output_latency_ms = latency * 1000
+
+            self._write_reference(outdata.reshape(-1))
+        except Exception as e:
+            logger.error(f"写入播放参考信号失败: {e}")
+
+    def _set_reference_source(self, sample_rate: int):
+        """
+        设置参考信号源采样率并创建重采样器.
+        """
+        self._reference_source_rate = int(sample_rate)
+        self._drift_ratio = 1.0
+        self._rebuild_reference_resampler()
+
+    def _rebuild_reference_resampler(self):
+        """按源采样率和漂移补偿比例重建 soxr 流式重采样器.
+
+        soxr 流不支持运行中修改比例，漂移补偿调整时重建（每次调整只有一次极短的滤波器重启）。
+        新对象整体替换属性，生产端下一次回调即使用新的重采样器。
+        """
+        target_rate = AudioConfig.INPUT_SAMPLE_RATE * self._drift_ratio
+        if self._reference_source_rate == target_rate:
+            self._reference_resampler = None
+            return
+        self._reference_resampler = soxr.ResampleStream(
+            self._reference_source_rate,
+            target_rate,
+            AudioConfig.CHANNELS,
+            dtype="int16",
+            quality="QQ",
+        )
+
+    def _write_reference(self, samples: np.ndarray):
+        """
+        参考信号重采样到16kHz后写入缓冲区（参考/播放回调中调用）.
+        """
+        resampler = self._reference_resampler
+        if resampler is not None:
+            samples = resampler.resample_chunk(samples, last=False)
+        if len(samples) > 0:
+            # 超出约200ms的旧数据由消费端在读取前裁剪
+            self._reference_buffer.write(samples)
+            self._reference_pushed_samples += len(samples)
+
+    def update_capture_latency(self, time_info):
+        """
+        根据录音回调的 time_info 更新输入延迟（录音回调中调用）.
+        """
+        if time_info is None or not self._use_playback_reference:
+            return
+        try:
+            latency = time_info.currentTime - time_info.inputBufferAdcTime
+            if latency > 0:
+                self._input_latency_ms = latency * 1000
+        except Exception:
+            pass
+
+    def _update_stream_delay(self):
+        """
+        互相关估计尚无结果时，按测得的输入+输出延迟设置 APM 流延迟.
+        """
+        if self._delay_estimator.delay_ms is not None:
+            return
+        if self._output_latency_ms is None or self._input_latency_ms is None:
+            return
+        self._set_stream_delay(self._output_latency_ms + self._input_latency_ms)
+
+    def _set_stream_delay(self, delay_ms: float):
+        """
+        更新 APM 流延迟（变化超过10ms才重新设置）.
+        """
+        delay = int(max(0, min(500, delay_ms)))
+        if abs(delay - self._stream_delay_ms) >= 10:
+            self._stream_delay_ms = delay
+            self.apm.set_stream_delay_ms(delay)
+            logger.debug(f"AEC流延迟更新: {delay}ms")
+
+    def _track_alignment(self, capture: np.ndarray, reference: np.ndarray):
+        """
+        用配对的采集/参考帧更新延迟与漂移估计，并据此调整 APM 延迟、参考对齐和重采样比例.
+        """
+        self._capture_consumed_samples += len(capture)
+        if self._drift_estimator.update(
+            self._reference_pushed_samples, self._capture_consumed_samples
+        ):
+            self._apply_drift_correction()
+
+        if not self._delay_estimator.push(capture, reference):
+            return
+        delay = self._delay_estimator.delay_ms
+        if delay >= 0:
+            self._set_stream_delay(delay)
+            return
+
+        # 回声早于配对的参考信号：APM 无法处理，丢弃这段参考数据重新对齐
+        skip = -delay * AudioConfig.INPUT_SAMPLE_RATE // 1000
+        self._reference_buffer.skip(skip)
+        self._delay_estimator.reset()
+        self._reference_realignments += 1
+        logger.info(f"参考信号超前回声 {-delay}ms，已丢弃参考数据重新对齐")
+
+    def _apply_drift_correction(self):
+        """
+        参考时钟偏快（写入多于消费）时降低重采样输出率，偏慢时提高.
+        """
+        drift = self._drift_estimator.drift_ppm
+        if self._reference_source_rate is None or abs(drift) < DRIFT_DEADBAND_PPM:
+            return
+        if abs(drift) > MAX_DRIFT_CORRECTION_PPM:
+            # 参考信号中断等造成的异常值，不做补偿
+            self._drift_estimator.reset()
+            return
+        ratio = self._drift_ratio / (1 + drift * 1e-6)
+        limit = MAX_DRIFT_CORRECTION_PPM * 1e-6
+        self._drift_ratio = min(1 + limit, max(1 - limit, ratio))
+        self._rebuild_reference_resampler()
+        self._drift_estimator.reset()
+        logger.info(
+            f"参考信号时钟漂移 {drift:+.0f}ppm，补偿后总计 "
+            f"{self._drift_correction_ppm():+.0f}ppm"
+        )
+
+    def _drift_correction_ppm(self) -> float:
+        return (1 / self._drift_ratio - 1) * 1e6
+
+    def _alignment_status(self) -> Dict[str, Any]:
+        """
+        延迟/漂移估计状态（供 get_status 使用）.
+        """
+        drift = self._drift_estimator.drift_ppm
+        return {
+            "stream_delay_ms": self._stream_delay_ms,
+            "delay_estimate": self._delay_estimator.get_stats(),
+            "drift_ppm": None if drift is None else round(drift, 1),
+            "drift_correction_ppm": round(self._drift_correction_ppm(), 1),
+            "reference_realignments": self._reference_realignments,
+        }
+
+    @property
+    def uses_software_aec(self) -> bool:
+        """
+        采集音频是否需要经过 process_audio（macOS 或 Linux 播放参考模式）.
+        """
+        return self._is_macos or self._use_playback_reference
+
     async def _initialize_reference_capture(self):
         """
         初始化参考信号捕获（仅macOS）
@@ -139,6 +372,7 @@ class AECProcessor:
 
             self.reference_device_id = reference_device["id"]
             self.reference_sample_rate = int(reference_device["default_samplerate"])
+            self._set_reference_source(self.reference_sample_rate)
 
             # 创建参考信号输入流（固定使用10ms帧，匹配WebRTC标准）
             webrtc_frame_duration = 0.01  # 10ms，WebRTC标准帧长度
@@ -213,26 +447,8 @@ class AECProcessor:
             return
 
         try:
-            audio_data = indata.copy().flatten()
-
-            # 重采样到16kHz（如果需要）
-            if self.reference_sample_rate != AudioConfig.INPUT_SAMPLE_RATE:
-                # 简单的降采样处理（实际应用中应使用更好的重采样器）
-                ratio = AudioConfig.INPUT_SAMPLE_RATE / self.reference_sample_rate
-                target_length = int(len(audio_data) * ratio)
-                audio_data = np.interp(
-                    np.linspace(0, len(audio_data) - 1, target_length),
-                    np.arange(len(audio_data)),
-                    audio_data,
-                ).astype(np.int16)
-
-            # 添加到参考缓冲区
-            self._reference_buffer.extend(audio_data)
-
-            # 保持缓冲区大小合理
-            max_buffer_size = self._webrtc_frame_size * 20  # 保持约200ms的数据
-            while len(self._reference_buffer) > max_buffer_size:
-                self._reference_buffer.popleft()
+            # 重采样到16kHz（如果需要）后写入参考缓冲区
+            self._write_reference(indata.reshape(-1))
 
         except Exception as e:
             logger.error(f"参考信号回调错误: {e}")
@@ -244,7 +460,10 @@ class AECProcessor:
         logger.info("参考信号流已结束")
 
     def process_audio(self, capture_audio: np.ndarray) -> np.ndarray:
-        """处理音频帧，应用AEC 支持10ms/20ms/40ms/60ms等不同帧长度，通过分割处理实现.
+        """处理音频帧，应用AEC 支持10ms/20ms/40ms/60ms等不同帧长度.
+
+        整帧交给 APM 的数组接口（库内按10ms分块），结果写入预分配的输出数组，
+        返回值在下一次调用前有效，调用方应立即拷贝。
 
         Args:
             capture_audio: 麦克风采集的音频数据 (16kHz, int16)
@@ -255,12 +474,8 @@ class AECProcessor:
         if not self._is_initialized:
             return capture_audio
 
-        # Windows 和 Linux 平台直接返回原始音频（系统级处理）
-        if self._is_windows or self._is_linux:
-            return capture_audio
-
-        # macOS 平台使用 WebRTC AEC 处理
-        if not self._is_macos or self.apm is None:
+        # 系统级处理的平台直接返回原始音频
+        if not self.uses_software_aec or self.apm is None:
             return capture_audio
 
         try:
@@ -271,113 +486,74 @@ class AECProcessor:
                 )
                 return capture_audio
 
-            # 计算需要分割的块数
-            num_chunks = len(capture_audio) // self._webrtc_frame_size
+            if self._use_playback_reference:
+                self._update_stream_delay()
 
-            if num_chunks == 1:
-                # 10ms帧，直接处理
-                return self._process_single_aec_frame(capture_audio)
-            else:
-                # 20ms/40ms/60ms帧，分割处理
-                return self._process_chunked_aec_frames(capture_audio, num_chunks)
+            return self._process_aec_frame(capture_audio)
 
         except Exception as e:
             logger.error(f"AEC处理失败: {e}")
             return capture_audio
 
-    def _process_single_aec_frame(self, capture_audio: np.ndarray) -> np.ndarray:
+    def _process_aec_frame(self, capture_audio: np.ndarray) -> np.ndarray:
         """
-        处理单个10ms WebRTC帧（仅macOS）
+        先送入同长度的参考信号（render stream），再处理采集信号（capture stream）.
         """
-        if not self._is_macos:
-            return capture_audio
-
-        try:
-            # 仅在macOS导入ctypes
-            import ctypes
-
-            # 获取参考信号
-            reference_audio = self._get_reference_frame(self._webrtc_frame_size)
+        capture = np.ascontiguousarray(capture_audio, dtype=np.int16)
+        frame_size = len(capture)
+        reference = self._get_reference_frame(frame_size)
+        self._track_alignment(capture, reference)
 
-            # 创建ctypes缓冲区
-            capture_buffer = (ctypes.c_short * self._webrtc_frame_size)(*capture_audio)
-            reference_buffer = (ctypes.c_short * self._webrtc_frame_size)(
-                *reference_audio
-            )
-
-            processed_capture = (ctypes.c_short * self._webrtc_frame_size)()
-            processed_reference = (ctypes.c_short * self._webrtc_frame_size)()
-
-            # 首先处理参考信号（render stream）
-            render_result = self.apm.process_reverse_stream(
-                reference_buffer,
-                self.render_config,
-                self.render_config,
-                processed_reference,
-            )
-
-            if render_result != 0:
-                logger.warning(f"参考信号处理失败，错误码: {render_result}")
-
-            # 然后处理采集信号（capture stream）
-            capture_result = self.apm.process_stream(
-                capture_buffer,
-                self.capture_config,
-                self.capture_config,
-                processed_capture,
-            )
-
-            if capture_result != 0:
-                logger.warning(f"采集信号处理失败，错误码: {capture_result}")
-                return capture_audio
-
-            # 转换回numpy数组
-            return np.array(processed_capture, dtype=np.int16)
+        render_result = self.apm.process_reverse_stream_array(
+            reference, self.render_config, self.render_config
+        )
+        if render_result != 0:
+            logger.warning(f"参考信号处理失败，错误码: {render_result}")
 
-        except Exception as e:
-            logger.error(f"AEC帧处理失败: {e}")
+        processed = self._frame_buffer(self._processed_frames, frame_size)
+        capture_result = self.apm.process_stream_array(
+            capture, self.capture_config, self.capture_config, processed
+        )
+        if capture_result != 0:
+            logger.warning(f"采集信号处理失败，错误码: {capture_result}")
             return capture_audio
 
-    def _process_chunked_aec_frames(
-        self, capture_audio: np.ndarray, num_chunks: int
-    ) -> np.ndarray:
+        return processed
+
+    @staticmethod
+    def _frame_buffer(cache: dict, frame_size: int) -> np.ndarray:
         """
-        分割处理大帧（20ms/40ms/60ms等）
+        按帧长复用预分配的 int16 数组.
         """
-        processed_chunks = []
-
-        for i in range(num_chunks):
-            # 提取当前10ms块
-            start_idx = i * self._webrtc_frame_size
-            end_idx = (i + 1) * self._webrtc_frame_size
-            chunk = capture_audio[start_idx:end_idx]
-
-            # 处理这个10ms块
-            processed_chunk = self._process_single_aec_frame(chunk)
-            processed_chunks.append(processed_chunk)
-
-        # 将所有处理后的块重新组合
-        return np.concatenate(processed_chunks)
+        buffer = cache.get(frame_size)
+        if buffer is None:
+            buffer = np.zeros(frame_size, dtype=np.int16)
+            cache[frame_size] = buffer
+        return buffer
 
     def _get_reference_frame(self, frame_size: int) -> np.ndarray:
         """
         获取指定大小的参考信号帧.
         """
-        # 如果没有参考信号或缓冲区不足，返回静音
-        if len(self._reference_buffer) < frame_size:
-            return np.zeros(frame_size, dtype=np.int16)
+        # 只保留最新约200ms的参考信号（读指针仅由消费端移动）
+        self._reference_buffer.trim_to(self._reference_max_samples)
+
+        frame = self._frame_buffer(self._reference_frames, frame_size)
 
-        # 从缓冲区提取一帧
-        frame_data = []
-        for _ in range(frame_size):
-            frame_data.append(self._reference_buffer.popleft())
+        # 如果没有参考信号或缓冲区不足，返回静音
+        if not self._reference_buffer.read_into(frame):
+            frame.fill(0)
 
-        return np.array(frame_data, dtype=np.int16)
+        return frame
 
     def is_reference_available(self) -> bool:
         """
         检查参考信号是否可用.
         """
+        if self._use_playback_reference:
+            # 播放参考来自本进程输出流，初始化后持续写入
+            return self._reference_pushed_samples > 0
+
         if self._is_windows or self._is_linux:
             # Windows 和 Linux 使用系统级AEC，总是可用
             return self._is_initialized
@@ -403,6 +579,19 @@ class AECProcessor:
             status.update(
                 {"aec_type": "system_level", "description": "Windows 系统底层回声消除"}
             )
+        elif self._use_playback_reference:
+            status.update(
+                {
+                    "aec_type": "webrtc_playback_reference",
+                    "description": "WebRTC + 本进程播放信号参考",
+                    "playback_sample_rate": self._playback_sample_rate,
+                    "reference_buffer_size": self._reference_buffer.available(),
+                    **self._alignment_status(),
+                    "output_latency_ms": _round_ms(self._output_latency_ms),
+                    "input_latency_ms": _round_ms(self._input_latency_ms),
+                    "webrtc_apm_active": self.apm is not None,
+                }
+            )
         elif self._is_linux:
             status.update(
                 {
@@ -416,8 +605,9 @@ class AECProcessor:
                     "aec_type": "webrtc_blackhole",
                     "description": "WebRTC + BlackHole 参考信号",
                     "reference_device_id": self.reference_device_id,
-                    "reference_buffer_size": len(self._reference_buffer),
+                    "reference_buffer_size": self._reference_buffer.available(),
                     "webrtc_apm_active": self.apm is not None,
+                    **self._alignment_status(),
                 }
             )
         else:
@@ -441,31 +631,32 @@ class AECProcessor:
         logger.info("开始关闭AEC处理器...")
 
         try:
-            # 仅在 macOS 平台清理 WebRTC 相关资源
-            if self._is_macos:
-                # 停止参考信号流
-                if self.reference_stream:
-                    try:
-                        self.reference_stream.stop()
-                        self.reference_stream.close()
-                    except Exception as e:
-                        logger.warning(f"关闭参考信号流失败: {e}")
-                    finally:
-                        self.reference_stream = None
-
-                # 清理WebRTC APM
-                if self.apm:
-                    try:
-                        if self.capture_config:
-                            self.apm.destroy_stream_config(self.capture_config)
-                        if self.render_config:
-                            self.apm.destroy_stream_config(self.render_config)
-                    except Exception as e:
-                        logger.warning(f"清理APM配置失败: {e}")
-                    finally:
-                        self.capture_config = None
-                        self.render_config = None
-                        self.apm = None
+            # 停止参考信号流（仅 macOS）
+            if self.reference_stream:
+                try:
+                    self.reference_stream.stop()
+                    self.reference_stream.close()
+                except Exception as e:
+                    logger.warning(f"关闭参考信号流失败: {e}")
+                finally:
+                    self.reference_stream = None
+
+            # 清理WebRTC APM（macOS / Linux 播放参考）
+            if self.apm:
+                try:
+                    if self.capture_config:
+                        self.apm.destroy_stream_config(self.capture_config)
+                    if self.render_config:
+                        self.apm.destroy_stream_config(self.render_config)
+                except Exception as e:
+                    logger.warning(f"清理APM配置失败: {e}")
+                finally:
+                    self.capture_config = None
+                    self.render_config = None
+                    self.apm = None
+
+            self._use_playback_reference = False
+            self._reference_resampler = None
 
             # 清理缓冲区
             self._reference_buffer.clear()
@@ -1,15 +1,21 @@
 import asyncio
 import gc
 import time
-from collections import deque
 from typing import Optional
 
 import numpy as np
 import opuslib
+import opuslib.api.encoder
 import sounddevice as sd
 import soxr
 
 from src.audio_codecs.aec_processor import AECProcessor
+from src.audio_codecs.capture_bus import CaptureBus, CaptureSubscription
+from src.audio_codecs.capture_frame import CaptureFrame, CaptureFramePool
+from src.audio_codecs.codec_worker import CodecWorker
+from src.audio_codecs.frame_transport import FrameTransport
+from src.audio_codecs.jitter_buffer import JitterBuffer
+from src.audio_codecs.ring_buffer import AudioRingBuffer
 from src.constants.constants import AudioConfig
 from src.utils.config_manager import ConfigManager
 from src.utils.logging_config import get_logger
@@ -43,9 +49,9 @@ class AudioCodec:
         self.input_resampler = None  # 设备采样率 -> 16kHz
         self.output_resampler = None  # 24kHz -> 设备采样率(播放用)
 
-        # 重采样缓冲区
-        self._resample_input_buffer = deque()
-        self._resample_output_buffer = deque()
+        # 重采样缓冲区（预分配环形缓冲，创建重采样器时按设备采样率分配）
+        self._resample_input_buffer: Optional[AudioRingBuffer] = None
+        self._resample_output_buffer: Optional[AudioRingBuffer] = None
 
         self._device_input_frame_size = None
         self._is_closing = False
@@ -54,13 +60,45 @@ class AudioCodec:
         self.input_stream = None  # 录音流
         self.output_stream = None  # 播放流
 
-        # 队列：唤醒词检测和播放缓冲
-        self._wakeword_buffer = asyncio.Queue(maxsize=100)
-        self._output_buffer = asyncio.Queue(maxsize=500)
+        # 跨线程帧通道：采集总线（回调线程 -> 各订阅者）和播放缓冲（事件循环 -> 回调线程）
+        # 容量按时长换算，满时丢弃最旧帧以限制延迟
+        frames_per_second = max(1, 1000 // AudioConfig.FRAME_DURATION)
+        self.capture_bus = CaptureBus(max_capacity=frames_per_second)
+        # 兼容旧接口 get_raw_audio_for_detection 等的订阅，首次调用时才创建
+        self._wakeword_subscription: Optional[CaptureSubscription] = None
+        self._output_buffer = FrameTransport(frames_per_second * 10, name="playback")
+
+        # 采集帧槽位池：每帧只写入一次，编码/AEC/各订阅者共享只读视图
+        # 槽位数需覆盖订阅通道最大容量 + 批处理余量，避免未处理的帧被覆盖
+        self._capture_pool = CaptureFramePool(
+            AudioConfig.INPUT_FRAME_SIZE, self.capture_bus.max_capacity + 8
+        )
+
+        # TTS 抖动缓冲：接收 -> 重排/自适应延迟 -> 按帧节拍解码（含 PLC/FEC 补偿）
+        jb_config = self.config.get_config("AUDIO_OPTIONS.JITTER_BUFFER", {}) or {}
+        self._jitter_enabled = bool(jb_config.get("ENABLED", True))
+        self._jitter_use_fec = bool(jb_config.get("USE_FEC", True))
+        self._jitter_buffer = JitterBuffer(
+            AudioConfig.FRAME_DURATION,
+            min_delay_ms=jb_config.get("MIN_DELAY_MS", 40),
+            max_delay_ms=jb_config.get("MAX_DELAY_MS", 400),
+            initial_delay_ms=jb_config.get("INITIAL_DELAY_MS", 60),
+            max_conceal_frames=jb_config.get("MAX_CONCEAL_FRAMES", 5),
+        )
+        self._jitter_event: Optional[asyncio.Event] = None
+        self._playout_task: Optional[asyncio.Task] = None
+        # 播放通道中保持的解码帧数（由设备回调消耗，决定补充节奏）
+        self._playout_lead_frames = 2
 
         # 实时编码回调（直接发送，不走队列）
         self._encoded_audio_callback = None
 
+        # 可选的编解码工作线程：录音回调只拷贝 PCM，编码/解码在独立线程中批量进行
+        worker_config = self.config.get_config("AUDIO_OPTIONS.CODEC_WORKER", {}) or {}
+        self._codec_worker_enabled = bool(worker_config.get("ENABLED", False))
+        self._codec_worker_batch = int(worker_config.get("MAX_BATCH_FRAMES", 4))
+        self._codec_worker: Optional[CodecWorker] = None
+
         # AEC处理器
         self.aec_processor = AECProcessor()
         self._aec_enabled = False
@@ -203,9 +241,29 @@ class AudioCodec:
                 AudioConfig.OUTPUT_SAMPLE_RATE, AudioConfig.CHANNELS
             )
 
+            # 编解码工作线程
+            if self._codec_worker_enabled:
+                self._codec_worker = CodecWorker(
+                    AudioConfig.INPUT_FRAME_SIZE,
+                    encode_fn=self._encode_pcm,
+                    decode_fn=self._decode_to_output,
+                    max_batch_frames=self._codec_worker_batch,
+                )
+                self._codec_worker.set_encoded_callback(self._emit_encoded)
+                self._codec_worker.start()
+
+            # 抖动缓冲播放任务
+            if self._jitter_enabled:
+                self._jitter_event = asyncio.Event()
+                self._playout_task = asyncio.create_task(
+                    self._playout_loop(), name="audio:playout"
+                )
+
             # 初始化AEC处理器
             try:
-                await self.aec_processor.initialize()
+                await self.aec_processor.initialize(
+                    playback_sample_rate=self.device_output_sample_rate
+                )
                 self._aec_enabled = True
                 logger.info("AEC处理器启用")
             except Exception as e:
@@ -231,6 +289,10 @@ class AudioCodec:
                 dtype="int16",
                 quality="QQ",
             )
+            # 预留若干帧余量，避免重采样器输出抖动导致溢出
+            self._resample_input_buffer = AudioRingBuffer(
+                AudioConfig.INPUT_FRAME_SIZE * 8
+            )
             logger.info(f"输入重采样: {self.device_input_sample_rate}Hz -> 16kHz")
 
         # 输出重采样器：24kHz -> 设备采样率
@@ -242,6 +304,12 @@ class AudioCodec:
                 dtype="int16",
                 quality="QQ",
             )
+            device_output_frame_size = int(
+                self.device_output_sample_rate * (AudioConfig.FRAME_DURATION / 1000)
+            )
+            self._resample_output_buffer = AudioRingBuffer(
+                device_output_frame_size * AudioConfig.CHANNELS * 8
+            )
             logger.info(
                 f"输出重采样: {AudioConfig.OUTPUT_SAMPLE_RATE}Hz -> {self.device_output_sample_rate}Hz"
             )
@@ -473,82 +541,91 @@ class AudioCodec:
             return
 
         try:
-            audio_data = indata.copy().flatten()
+            # indata 为 (frames, channels) 的 C 连续数组，reshape 返回视图不拷贝；
+            # 该缓冲会被 PortAudio 复用，因此写入采集槽位（全程唯一的一次拷贝）
+            samples = indata.reshape(-1)
 
             # 重采样到16kHz（如果设备不是16kHz）
             if self.input_resampler is not None:
-                audio_data = self._process_input_resampling(audio_data)
-                if audio_data is None:
-                    return
+                frame = self._process_input_resampling(samples)
+            else:
+                frame = self._capture_pool.load(samples)
+            if frame is None:
+                return
 
-            # 应用AEC处理（仅 macOS 需要）
-            if (
-                self._aec_enabled
-                and len(audio_data) == AudioConfig.INPUT_FRAME_SIZE
-                and self.aec_processor._is_macos
-            ):
+            # 应用AEC处理（macOS / Linux 播放参考），结果写回槽位
+            if self._aec_enabled and self.aec_processor.uses_software_aec:
                 try:
-                    audio_data = self.aec_processor.process_audio(audio_data)
+                    self.aec_processor.update_capture_latency(time_info)
+                    processed = self.aec_processor.process_audio(frame.pcm)
+                    if processed is not frame.pcm:
+                        np.copyto(self._capture_pool.writable(frame), processed)
                 except Exception as e:
                     logger.warning(f"AEC处理失败，使用原始音频: {e}")
 
             # 实时编码并发送（不走队列，减少延迟）
-            if (
-                self._encoded_audio_callback
-                and len(audio_data) == AudioConfig.INPUT_FRAME_SIZE
-            ):
-                try:
-                    pcm_data = audio_data.astype(np.int16).tobytes()
-                    encoded_data = self.opus_encoder.encode(
-                        pcm_data, AudioConfig.INPUT_FRAME_SIZE
-                    )
-                    if encoded_data:
-                        self._encoded_audio_callback(encoded_data)
-                except Exception as e:
-                    logger.warning(f"实时录音编码失败: {e}")
+            if self._encoded_audio_callback:
+                if self._codec_worker is not None:
+                    # 交给编解码工作线程，回调内只做一次拷贝
+                    self._codec_worker.submit_pcm(frame.pcm)
+                else:
+                    try:
+                        encoded_data = self._encode_pcm(frame.pcm)
+                        if encoded_data:
+                            self._encoded_audio_callback(encoded_data)
+                    except Exception as e:
+                        logger.warning(f"实时录音编码失败: {e}")
 
-            # 同时提供给唤醒词检测（走队列）
-            self._put_audio_data_safe(self._wakeword_buffer, audio_data.copy())
+            # 发布到采集总线（唤醒词、VAD 等订阅者，传递槽位引用）
+            self.capture_bus.publish(frame)
 
         except Exception as e:
             logger.error(f"输入回调错误: {e}")
 
-    def _process_input_resampling(self, audio_data):
+    def _encode_pcm(self, pcm: np.ndarray) -> Optional[bytes]:
+        """将一帧16kHz PCM编码为Opus（录音回调或编解码工作线程中调用）.
+
+        直接把 int16 数组的内存地址交给 libopus，不经过 tobytes() 拷贝；
+        Encoder.encode 需要 len(bytes) 作为输出上限，因此改用底层 api 调用。
+        """
+        pcm = np.ascontiguousarray(pcm, dtype=np.int16)
+        return opuslib.api.encoder.encode(
+            self.opus_encoder.encoder_state,
+            pcm.ctypes.data,
+            AudioConfig.INPUT_FRAME_SIZE,
+            pcm.nbytes,
+        )
+
+    def _emit_encoded(self, encoded_data: bytes):
+        """
+        编解码工作线程的编码结果出口.
+        """
+        callback = self._encoded_audio_callback
+        if callback:
+            callback(encoded_data)
+
+    def _process_input_resampling(self, audio_data) -> Optional[CaptureFrame]:
         """
-        输入重采样到16kHz.
+        输入重采样到16kHz，凑满一帧后直接读入采集槽位.
         """
         try:
+            # 清空请求由事件循环发起，在回调线程中执行，保持单生产者/单消费者
+            self._resample_input_buffer.apply_pending_clear()
             resampled_data = self.input_resampler.resample_chunk(audio_data, last=False)
             if len(resampled_data) > 0:
-                self._resample_input_buffer.extend(resampled_data.astype(np.int16))
+                self._resample_input_buffer.write(resampled_data)
 
-            expected_frame_size = AudioConfig.INPUT_FRAME_SIZE
-            if len(self._resample_input_buffer) < expected_frame_size:
+            if self._resample_input_buffer.available() < AudioConfig.INPUT_FRAME_SIZE:
                 return None
 
-            frame_data = []
-            for _ in range(expected_frame_size):
-                frame_data.append(self._resample_input_buffer.popleft())
-
-            return np.array(frame_data, dtype=np.int16)
+            frame = self._capture_pool.acquire()
+            self._resample_input_buffer.read_into(self._capture_pool.writable(frame))
+            return frame
 
         except Exception as e:
             logger.error(f"输入重采样失败: {e}")
             return None
 
-    def _put_audio_data_safe(self, queue, audio_data):
-        """
-        安全入队，队列满时丢弃最旧数据.
-        """
-        try:
-            queue.put_nowait(audio_data)
-        except asyncio.QueueFull:
-            try:
-                queue.get_nowait()
-                queue.put_nowait(audio_data)
-            except asyncio.QueueEmpty:
-                queue.put_nowait(audio_data)
-
     def _output_callback(self, outdata: np.ndarray, frames: int, time_info, status):
         """
         播放回调，硬件驱动调用 从播放队列取数据输出到扬声器.
@@ -569,58 +646,55 @@ class AudioCodec:
             logger.error(f"输出回调错误: {e}")
             outdata.fill(0)
 
+        # 实际送往扬声器的数据即 AEC 参考信号（Linux 播放参考模式）
+        if self._aec_enabled:
+            self.aec_processor.push_playback_reference(outdata, time_info)
+
     def _output_callback_direct(self, outdata: np.ndarray, frames: int):
         """
         直接播放24kHz数据（设备支持24kHz时）
         """
-        try:
-            # 从播放队列获取音频数据
-            audio_data = self._output_buffer.get_nowait()
-
-            if len(audio_data) >= frames * AudioConfig.CHANNELS:
-                output_frames = audio_data[: frames * AudioConfig.CHANNELS]
-                outdata[:] = output_frames.reshape(-1, AudioConfig.CHANNELS)
-            else:
-                out_len = len(audio_data) // AudioConfig.CHANNELS
-                if out_len > 0:
-                    outdata[:out_len] = audio_data[
-                        : out_len * AudioConfig.CHANNELS
-                    ].reshape(-1, AudioConfig.CHANNELS)
-                if out_len < frames:
-                    outdata[out_len:] = 0
-
-        except asyncio.QueueEmpty:
+        # 从播放通道获取音频数据
+        audio_data = self._output_buffer.get_nowait()
+        if audio_data is None:
             # 无数据时输出静音
             outdata.fill(0)
+            return
+
+        if len(audio_data) >= frames * AudioConfig.CHANNELS:
+            output_frames = audio_data[: frames * AudioConfig.CHANNELS]
+            outdata[:] = output_frames.reshape(-1, AudioConfig.CHANNELS)
+        else:
+            out_len = len(audio_data) // AudioConfig.CHANNELS
+            if out_len > 0:
+                outdata[:out_len] = audio_data[
+                    : out_len * AudioConfig.CHANNELS
+                ].reshape(-1, AudioConfig.CHANNELS)
+            if out_len < frames:
+                outdata[out_len:] = 0
 
     def _output_callback_with_resample(self, outdata: np.ndarray, frames: int):
         """
         重采样播放（24kHz -> 设备采样率）
         """
         try:
+            self._resample_output_buffer.apply_pending_clear()
+            need = frames * AudioConfig.CHANNELS
+
             # 持续处理24kHz数据进行重采样
-            while len(self._resample_output_buffer) < frames * AudioConfig.CHANNELS:
-                try:
-                    audio_data = self._output_buffer.get_nowait()
-                    # 24kHz -> 设备采样率重采样
-                    resampled_data = self.output_resampler.resample_chunk(
-                        audio_data, last=False
-                    )
-                    if len(resampled_data) > 0:
-                        self._resample_output_buffer.extend(
-                            resampled_data.astype(np.int16)
-                        )
-                except asyncio.QueueEmpty:
+            while self._resample_output_buffer.available() < need:
+                audio_data = self._output_buffer.get_nowait()
+                if audio_data is None:
                     break
+                # 24kHz -> 设备采样率重采样
+                resampled_data = self.output_resampler.resample_chunk(
+                    audio_data, last=False
+                )
+                if len(resampled_data) > 0:
+                    self._resample_output_buffer.write(resampled_data)
 
-            need = frames * AudioConfig.CHANNELS
-            if len(self._resample_output_buffer) >= need:
-                frame_data = [
-                    self._resample_output_buffer.popleft() for _ in range(need)
-                ]
-                output_array = np.array(frame_data, dtype=np.int16)
-                outdata[:] = output_array.reshape(-1, AudioConfig.CHANNELS)
-            else:
+            # 直接整段拷贝到输出缓冲区（outdata 为 C 连续数组，reshape 返回视图）
+            if not self._resample_output_buffer.read_into(outdata.reshape(-1)):
                 # 数据不足时输出静音
                 outdata.fill(0)
 
@@ -716,24 +790,80 @@ class AudioCodec:
         获取唤醒词音频数据.
         """
         try:
-            if self._wakeword_buffer.empty():
+            # 批量接口不计入欠载统计（欠载只对播放回调有意义）
+            batch = self._detection_subscription().get_batch_nowait(1)
+            if not batch:
                 return None
+            return self._detection_frame_to_bytes(batch[0])
 
-            audio_data = self._wakeword_buffer.get_nowait()
-
-            if hasattr(audio_data, "tobytes"):
-                return audio_data.tobytes()
-            elif hasattr(audio_data, "astype"):
-                return audio_data.astype("int16").tobytes()
-            else:
-                return audio_data
-
-        except asyncio.QueueEmpty:
-            return None
         except Exception as e:
             logger.error(f"获取唤醒词音频数据失败: {e}")
             return None
 
+    async def wait_for_detection_audio(self) -> bytes:
+        """
+        等待下一帧唤醒词音频数据（由录音回调通过 call_soon_threadsafe 唤醒，无需轮询）.
+        """
+        audio_data = await self._detection_subscription().get()
+        return self._detection_frame_to_bytes(audio_data)
+
+    async def wait_for_detection_frame(self) -> CaptureFrame:
+        """
+        等待下一帧采集帧（共享槽位，不拷贝；float32 视图通过 as_float32() 获取）.
+        """
+        return await self._detection_subscription().get()
+
+    def get_detection_frames_nowait(self, max_frames: int) -> list:
+        """
+        非阻塞取走最多 max_frames 个已到达的采集帧.
+        """
+        return self._detection_subscription().get_batch_nowait(max_frames)
+
+    @staticmethod
+    def _detection_frame_to_bytes(audio_data) -> bytes:
+        if hasattr(audio_data, "tobytes"):
+            return audio_data.tobytes()
+        elif hasattr(audio_data, "astype"):
+            return audio_data.astype("int16").tobytes()
+        else:
+            return audio_data
+
+    def get_codec_worker_stats(self) -> dict:
+        """
+        获取编解码工作线程统计（批大小、平均编解码耗时、丢帧数）.
+        """
+        if self._codec_worker is None:
+            return {"enabled": False}
+        return {"enabled": True, **self._codec_worker.get_stats()}
+
+    def _detection_subscription(self) -> CaptureSubscription:
+        if self._wakeword_subscription is None:
+            self._wakeword_subscription = self.capture_bus.subscribe("wakeword")
+        return self._wakeword_subscription
+
+    def subscribe_capture(
+        self, name: str, capacity: Optional[int] = None
+    ) -> CaptureSubscription:
+        """订阅16kHz单声道采集帧（VAD、录音、指标等），无需再打开输入设备.
+
+        Args:
+            name: 订阅者名称
+            capacity: 通道容量（帧），满时丢弃最旧帧；默认约1秒
+
+        Returns:
+            订阅对象，await subscription.get() 获取 CaptureFrame，用完调用 close()
+        """
+        return self.capture_bus.subscribe(name, capacity)
+
+    def get_transport_stats(self) -> dict:
+        """
+        获取跨线程音频通道统计（丢帧、欠载、高水位等），用于线上容量评估.
+        """
+        return {
+            "capture": self.capture_bus.get_stats(),
+            "playback": self._output_buffer.get_stats(),
+        }
+
     def set_encoded_audio_callback(self, callback):
         """
         设置编码回调.
@@ -784,15 +914,67 @@ class AudioCodec:
         logger.info(f"AEC状态: {'启用' if self._aec_enabled else '禁用'}")
         return self._aec_enabled
 
-    async def write_audio(self, opus_data: bytes):
+    async def write_audio(self, opus_data: bytes, sequence: Optional[int] = None):
+        """写入网络接收的Opus数据.
+
+        启用抖动缓冲时：放入抖动缓冲，由播放任务按帧节拍解码；
+        否则：立即解码24kHz -> 播放通道.
+
+        Args:
+            opus_data: Opus 数据包
+            sequence: 包序列号（UDP 通道从 nonce 中解析），None 表示按到达顺序
+        """
+        if self._jitter_enabled and self._playout_task is not None:
+            if self._jitter_buffer.put(opus_data, sequence):
+                self._jitter_event.set()
+            return
+
+        self._submit_decode(opus_data)
+
+    def _submit_decode(self, opus_data: Optional[bytes], lost: bool = False):
+        """
+        解码一帧：启用编解码工作线程时排队异步解码，否则就地解码.
+        """
+        if self._codec_worker is not None:
+            self._codec_worker.submit_packet(opus_data, lost)
+        else:
+            self._decode_to_output(opus_data, lost)
+
+    def _queued_output_frames(self) -> int:
+        """
+        已解码待播放的帧数，加上工作线程中尚未解码完成的帧数.
         """
-        解码音频并播放 网络接收的Opus数据 -> 解码24kHz -> 播放队列.
+        queued = self._output_buffer.qsize()
+        if self._codec_worker is not None:
+            queued += self._codec_worker.pending_decode()
+        return queued
+
+    def _decode_to_output(self, opus_data: bytes, lost: bool = False) -> bool:
+        """解码一帧并放入播放通道.
+
+        Args:
+            opus_data: Opus 数据；lost=True 时为丢失帧之后的包（可为 None）
+            lost: 当前帧丢失，使用 FEC（有后续包时）或 PLC 补偿
+
+        Returns:
+            是否成功产生一帧 PCM
         """
         try:
-            # Opus解码为24kHz PCM数据
-            pcm_data = self.opus_decoder.decode(
-                opus_data, AudioConfig.OUTPUT_FRAME_SIZE
-            )
+            if not lost:
+                # Opus解码为24kHz PCM数据
+                pcm_data = self.opus_decoder.decode(
+                    opus_data, AudioConfig.OUTPUT_FRAME_SIZE
+                )
+            elif opus_data and self._jitter_use_fec:
+                # 利用后续包中的带内FEC恢复丢失帧
+                pcm_data = self.opus_decoder.decode(
+                    opus_data, AudioConfig.OUTPUT_FRAME_SIZE, decode_fec=True
+                )
+            else:
+                # 空包触发 Opus 丢包补偿（PLC）
+                pcm_data = self.opus_decoder.decode(
+                    b"", AudioConfig.OUTPUT_FRAME_SIZE
+                )
 
             audio_array = np.frombuffer(pcm_data, dtype=np.int16)
 
@@ -801,15 +983,52 @@ class AudioCodec:
                 logger.warning(
                     f"解码音频长度异常: {len(audio_array)}, 期望: {expected_length}"
                 )
-                return
+                return False
 
-            # 放入播放队列
-            self._put_audio_data_safe(self._output_buffer, audio_array)
+            # 放入播放通道（满时丢弃最旧帧）
+            self._output_buffer.put(audio_array)
+            return True
 
         except opuslib.OpusError as e:
             logger.warning(f"Opus解码失败，丢弃此帧: {e}")
         except Exception as e:
             logger.warning(f"音频写入失败，丢弃此帧: {e}")
+        return False
+
+    async def _playout_loop(self):
+        """抖动缓冲播放任务.
+
+        无数据时等待写入事件（不空转）；播放期间每半帧检查一次，
+        只在播放通道低于预定帧数时从抖动缓冲取帧，使取帧节奏跟随设备时钟。
+        """
+        tick = AudioConfig.FRAME_DURATION / 1000 / 2
+        try:
+            while not self._is_closing:
+                if self._jitter_buffer.is_empty():
+                    self._jitter_event.clear()
+                    await self._jitter_event.wait()
+                    continue
+
+                while self._queued_output_frames() < self._playout_lead_frames:
+                    kind, payload = self._jitter_buffer.pop()
+                    if kind == JitterBuffer.PACKET:
+                        self._submit_decode(payload)
+                    elif kind == JitterBuffer.LOST:
+                        self._submit_decode(payload, lost=True)
+                    else:
+                        break
+
+                await asyncio.sleep(tick)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"抖动缓冲播放任务异常: {e}", exc_info=True)
+
+    def get_jitter_stats(self) -> dict:
+        """
+        获取抖动缓冲统计（迟到/丢失/补偿帧数、目标延迟等）.
+        """
+        return {"enabled": self._jitter_enabled, **self._jitter_buffer.get_stats()}
 
     async def wait_for_audio_complete(self, timeout=10.0):
         """
@@ -817,7 +1036,9 @@ class AudioCodec:
         """
         start = time.time()
 
-        while not self._output_buffer.empty() and time.time() - start < timeout:
+        while (
+            self._queued_output_frames() > 0 or not self._jitter_buffer.is_empty()
+        ) and time.time() - start < timeout:
             await asyncio.sleep(0.05)
 
         await asyncio.sleep(0.3)
@@ -832,26 +1053,21 @@ class AudioCodec:
         """
         cleared_count = 0
 
-        queues_to_clear = [
-            self._wakeword_buffer,
-            self._output_buffer,
-        ]
+        cleared_count += self.capture_bus.clear()
+        cleared_count += self._output_buffer.clear()
 
-        for queue in queues_to_clear:
-            while not queue.empty():
-                try:
-                    queue.get_nowait()
-                    cleared_count += 1
-                except asyncio.QueueEmpty:
-                    break
+        cleared_count += len(self._jitter_buffer)
+        self._jitter_buffer.reset()
 
-        if self._resample_input_buffer:
-            cleared_count += len(self._resample_input_buffer)
-            self._resample_input_buffer.clear()
+        if self._codec_worker is not None:
+            cleared_count += self._codec_worker.clear()
 
-        if self._resample_output_buffer:
-            cleared_count += len(self._resample_output_buffer)
-            self._resample_output_buffer.clear()
+        # 重采样缓冲只能由音频回调线程读写，这里只发出清空请求
+        if self._resample_input_buffer is not None:
+            cleared_count += self._resample_input_buffer.request_clear()
+
+        if self._resample_output_buffer is not None:
+            cleared_count += self._resample_output_buffer.request_clear()
 
         if cleared_count > 0:
             logger.info(f"清空音频队列，丢弃 {cleared_count} 帧音频数据")
@@ -963,18 +1179,28 @@ class AudioCodec:
             # 2. 等待回调完全停止（给正在执行的回调一点时间完成）
             await asyncio.sleep(0.05)
 
-            # 3. 清空回调引用（打破闭包引用链）
+            # 3. 停止抖动缓冲播放任务，清空回调引用（打破闭包引用链）
+            if self._playout_task and not self._playout_task.done():
+                self._playout_task.cancel()
+                try:
+                    await self._playout_task
+                except asyncio.CancelledError:
+                    pass
+            self._playout_task = None
             self._encoded_audio_callback = None
 
+            # 停止编解码工作线程（必须在释放编解码器之前）
+            if self._codec_worker is not None:
+                self._codec_worker.stop()
+                self._codec_worker = None
+
             # 4. 清空所有队列和缓冲区（关键！必须在清理 resampler 之前）
             # 这些缓冲区可能间接持有 resampler 处理过的数据或引用
             await self.clear_audio_queue()
 
-            # 清空重采样缓冲区（可能持有 numpy 数组，间接引用 resampler）
-            if self._resample_input_buffer:
-                self._resample_input_buffer.clear()
-            if self._resample_output_buffer:
-                self._resample_output_buffer.clear()
+            # 释放重采样环形缓冲区
+            self._resample_input_buffer = None
+            self._resample_output_buffer = None
 
             # 5. 第一次 GC，清理队列和缓冲区中的对象
             gc.collect()
@@ -0,0 +1,127 @@
+import threading
+from typing import List, Optional, Tuple
+
+from src.audio_codecs.frame_transport import FrameTransport
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class CaptureSubscription:
+    """
+    采集总线的一个订阅者，持有独立的跨线程帧通道.
+
+    帧为共享的 CaptureFrame 槽位（16kHz 单声道 int16），订阅者只读不改，
+    处理完成后不应继续持有（槽位会被复用）。
+    """
+
+    def __init__(self, bus: "CaptureBus", name: str, capacity: int):
+        self.name = name
+        self._bus = bus
+        self._transport = FrameTransport(capacity, name=f"capture:{name}")
+        self.active = True
+
+    @property
+    def transport(self) -> FrameTransport:
+        return self._transport
+
+    async def get(self):
+        """
+        等待下一帧（录音回调通过 call_soon_threadsafe 唤醒，不轮询）.
+        """
+        return await self._transport.get()
+
+    async def get_batch(self, max_frames: int) -> list:
+        """
+        等待至少一帧，然后取走已到达的最多 max_frames 帧.
+        """
+        return await self._transport.get_batch(max_frames)
+
+    def get_batch_nowait(self, max_frames: int) -> list:
+        return self._transport.get_batch_nowait(max_frames)
+
+    def clear(self) -> int:
+        return self._transport.clear()
+
+    def close(self):
+        """
+        取消订阅.
+        """
+        self._bus.unsubscribe(self)
+
+    def get_stats(self) -> dict:
+        return self._transport.get_stats()
+
+
+class CaptureBus:
+    """
+    录音帧扇出总线.
+
+    - 录音回调线程每帧调用一次 publish()，帧引用投递到每个订阅者自己的通道
+    - 订阅者可随时增删（VAD、唤醒词、录音、指标等），不需要额外打开音频设备
+    - 订阅列表采用写时复制的元组，publish 遍历时无需加锁
+    - 订阅容量不超过 max_capacity，保证采集槽位池不会覆盖尚未处理的帧
+    """
+
+    def __init__(self, max_capacity: int):
+        self._max_capacity = max(1, int(max_capacity))
+        self._subscribers: Tuple[CaptureSubscription, ...] = ()
+        self._lock = threading.Lock()
+        self._published = 0
+
+    @property
+    def max_capacity(self) -> int:
+        return self._max_capacity
+
+    def subscribe(
+        self, name: str, capacity: Optional[int] = None
+    ) -> CaptureSubscription:
+        """订阅采集帧.
+
+        Args:
+            name: 订阅者名称（用于统计）
+            capacity: 通道容量（帧），满时丢弃最旧帧；默认且最大为 max_capacity
+        """
+        if capacity is None or capacity > self._max_capacity:
+            capacity = self._max_capacity
+        subscription = CaptureSubscription(self, name, capacity)
+        with self._lock:
+            self._subscribers = self._subscribers + (subscription,)
+        logger.debug(f"采集总线新增订阅: {name} (容量 {capacity} 帧)")
+        return subscription
+
+    def unsubscribe(self, subscription: CaptureSubscription):
+        with self._lock:
+            self._subscribers = tuple(
+                s for s in self._subscribers if s is not subscription
+            )
+        if subscription.active:
+            subscription.active = False
+            subscription.clear()
+            logger.debug(f"采集总线取消订阅: {subscription.name}")
+
+    def has_subscribers(self) -> bool:
+        return bool(self._subscribers)
+
+    def publish(self, frame):
+        """
+        发布一帧到所有订阅者（录音回调线程调用）.
+        """
+        self._published += 1
+        for subscription in self._subscribers:
+            subscription._transport.put(frame)
+
+    def clear(self) -> int:
+        """
+        清空所有订阅者通道，返回丢弃的帧数.
+        """
+        return sum(s.clear() for s in self._subscribers)
+
+    def subscribers(self) -> List[str]:
+        return [s.name for s in self._subscribers]
+
+    def get_stats(self) -> dict:
+        return {
+            "published": self._published,
+            "subscribers": {s.name: s.get_stats() for s in self._subscribers},
+        }
@@ -0,0 +1,109 @@
+from typing import List, Optional
+
+import numpy as np
+
+
+class CaptureFrame:
+    """
+    一帧采集音频（16kHz 单声道 int16），存放在预分配槽位中.
+
+    - 录音回调把重采样/AEC 后的数据写入槽位一次，之后所有消费者共享只读视图
+    - float32 归一化结果按需计算一次并缓存在槽位自带的缓冲中，多个消费者复用
+    - 槽位会被循环复用，消费者不应在处理完成后继续持有帧
+    """
+
+    __slots__ = (
+        "index",
+        "seq",
+        "_pcm",
+        "_pcm_view",
+        "_float32",
+        "_float_view",
+        "_float_seq",
+    )
+
+    def __init__(self, index: int, frame_size: int):
+        self.index = index
+        self.seq = -1  # 每次复用递增，用于调试/校验帧是否已被覆盖
+        self._pcm = np.zeros(frame_size, dtype=np.int16)
+        self._pcm_view = self._pcm.view()
+        self._pcm_view.flags.writeable = False
+        self._float32 = np.zeros(frame_size, dtype=np.float32)
+        self._float_view = self._float32.view()
+        self._float_view.flags.writeable = False
+        self._float_seq = -1
+
+    @property
+    def pcm(self) -> np.ndarray:
+        """
+        int16 只读视图（不拷贝）.
+        """
+        return self._pcm_view
+
+    def __len__(self) -> int:
+        return len(self._pcm)
+
+    def as_float32(self) -> np.ndarray:
+        """
+        归一化到 [-1, 1) 的 float32 只读视图，同一帧只转换一次.
+        """
+        if self._float_seq != self.seq:
+            np.multiply(self._pcm, 1.0 / 32768.0, out=self._float32)
+            self._float_seq = self.seq
+        return self._float_view
+
+    def tobytes(self) -> bytes:
+        return self._pcm.tobytes()
+
+
+class CaptureFramePool:
+    """
+    采集帧槽位池（仅录音回调线程写入）.
+
+    槽位按顺序循环复用，容量需大于所有消费者可能积压的最大帧数
+    （跨线程通道容量 + 单次批处理帧数），否则未处理的帧会被新数据覆盖。
+    """
+
+    def __init__(self, frame_size: int, slots: int):
+        if slots <= 0:
+            raise ValueError(f"采集帧槽位数必须大于0: {slots}")
+        self._frame_size = frame_size
+        self._frames: List[CaptureFrame] = [
+            CaptureFrame(i, frame_size) for i in range(slots)
+        ]
+        self._next = 0
+        self._seq = 0
+
+    @property
+    def frame_size(self) -> int:
+        return self._frame_size
+
+    @property
+    def slots(self) -> int:
+        return len(self._frames)
+
+    def acquire(self) -> CaptureFrame:
+        """
+        取出下一个槽位用于写入.
+        """
+        frame = self._frames[self._next]
+        self._next = (self._next + 1) % len(self._frames)
+        frame.seq = self._seq
+        self._seq += 1
+        return frame
+
+    def writable(self, frame: CaptureFrame) -> np.ndarray:
+        """
+        获取槽位的可写 int16 缓冲（仅在发布给消费者之前使用）.
+        """
+        return frame._pcm
+
+    def load(self, data: np.ndarray) -> Optional[CaptureFrame]:
+        """
+        把一帧数据拷贝进下一个槽位，长度不符时返回 None.
+        """
+        if len(data) != self._frame_size:
+            return None
+        frame = self.acquire()
+        np.copyto(frame._pcm, data, casting="unsafe")
+        return frame
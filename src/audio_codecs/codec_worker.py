@@ -0,0 +1,223 @@
+import threading
+import time
+from collections import deque
+from typing import Callable, Optional
+
+import numpy as np
+
+from src.audio_codecs.ring_buffer import AudioRingBuffer
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class CodecWorker:
+    """
+    Opus 编解码工作线程.
+
+    - 录音回调只把 PCM 帧拷贝进环形缓冲并置位唤醒事件，编码在工作线程中进行
+    - 接收的 Opus 包（含丢包补偿请求）排队后由工作线程解码
+    - 每次唤醒处理所有已积压的帧（最多 max_batch_frames），摊薄线程切换开销
+    - 编解码函数由调用方提供，工作线程只负责调度、批处理和统计
+    """
+
+    def __init__(
+        self,
+        frame_size: int,
+        encode_fn: Callable[[np.ndarray], Optional[bytes]],
+        decode_fn: Callable[[Optional[bytes], bool], bool],
+        max_batch_frames: int = 4,
+        ring_frames: int = 50,
+    ):
+        self._frame_size = frame_size
+        self._encode_fn = encode_fn
+        self._decode_fn = decode_fn
+        self._max_batch = max(1, int(max_batch_frames))
+
+        # 编码方向：回调线程写入，工作线程读取（单生产者/单消费者）
+        self._pcm_ring = AudioRingBuffer(frame_size * ring_frames)
+        self._clear_pcm = False  # 请求工作线程清空环形缓冲（读指针只能由消费者移动）
+        self._encode_frame = np.zeros(frame_size, dtype=np.int16)
+        self._on_encoded: Optional[Callable[[bytes], None]] = None
+
+        # 解码方向：(opus_data, lost)，deque 的 append/popleft 本身是线程安全的
+        self._packets: deque = deque()
+        self._decoding = 0
+
+        self._wakeup = threading.Event()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+        # 统计信息
+        self._encoded = 0
+        self._decoded = 0
+        self._dropped_pcm_frames = 0
+        self._errors = 0
+        self._batches = 0
+        self._max_batch_seen = 0
+        self._encode_time = 0.0
+        self._decode_time = 0.0
+
+    def set_encoded_callback(self, callback: Optional[Callable[[bytes], None]]):
+        """
+        设置编码结果回调（在工作线程中调用）.
+        """
+        self._on_encoded = callback
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._run, name="audio-codec-worker", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"编解码工作线程已启动，单次最多处理 {self._max_batch} 帧")
+
+    def stop(self, timeout: float = 1.0):
+        if not self._running:
+            return
+        self._running = False
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                logger.warning("编解码工作线程未在超时时间内退出")
+        self._thread = None
+        self.clear()
+
+    # -----------------------
+    # 生产者接口
+    # -----------------------
+    def submit_pcm(self, frame: np.ndarray) -> bool:
+        """提交一帧待编码 PCM（录音回调线程调用，仅做一次内存拷贝）.
+
+        Returns:
+            缓冲区已满时丢弃整帧并返回 False
+        """
+        if self._pcm_ring.free_space() < len(frame):
+            self._dropped_pcm_frames += 1
+            return False
+        self._pcm_ring.write(frame)
+        self._wakeup.set()
+        return True
+
+    def submit_packet(self, opus_data: Optional[bytes], lost: bool = False):
+        """
+        提交一个待解码的 Opus 包；lost=True 表示请求对丢失帧做 FEC/PLC 补偿.
+        """
+        self._packets.append((opus_data, lost))
+        self._wakeup.set()
+
+    def pending_decode(self) -> int:
+        """
+        尚未输出到播放通道的解码帧数（排队 + 正在解码）.
+        """
+        return len(self._packets) + self._decoding
+
+    def clear(self) -> int:
+        """
+        丢弃尚未处理的 PCM 和 Opus 包，返回丢弃的帧数.
+        """
+        count = len(self._packets)
+        self._packets.clear()
+        # 环形缓冲只能由消费者清空，运行中交给工作线程下次唤醒时丢弃
+        count += self._pcm_ring.available() // self._frame_size
+        if not self._running:
+            self._pcm_ring.clear()
+        else:
+            self._clear_pcm = True
+        return count
+
+    # -----------------------
+    # 工作线程
+    # -----------------------
+    def _run(self):
+        while self._running:
+            self._wakeup.wait(0.1)
+            self._wakeup.clear()
+
+            if self._clear_pcm:
+                self._clear_pcm = False
+                self._pcm_ring.clear()
+
+            # 每轮交替处理，避免一个方向积压时饿死另一个方向
+            while self._running:
+                encoded = self._encode_batch()
+                decoded = self._decode_batch()
+                if not encoded and not decoded:
+                    break
+
+    def _encode_batch(self) -> int:
+        batch = []
+        start = time.perf_counter()
+        while len(batch) < self._max_batch and self._pcm_ring.read_into(
+            self._encode_frame
+        ):
+            try:
+                data = self._encode_fn(self._encode_frame)
+                if data:
+                    batch.append(data)
+            except Exception as e:
+                self._errors += 1
+                logger.warning(f"工作线程编码失败: {e}")
+        if not batch:
+            return 0
+
+        self._encode_time += time.perf_counter() - start
+        self._encoded += len(batch)
+        self._record_batch(len(batch))
+
+        callback = self._on_encoded
+        if callback is not None:
+            for data in batch:
+                try:
+                    callback(data)
+                except Exception as e:
+                    logger.warning(f"编码结果回调失败: {e}")
+        return len(batch)
+
+    def _decode_batch(self) -> int:
+        count = 0
+        start = time.perf_counter()
+        while count < self._max_batch:
+            try:
+                opus_data, lost = self._packets.popleft()
+            except IndexError:
+                break
+            self._decoding = 1
+            try:
+                if self._decode_fn(opus_data, lost):
+                    self._decoded += 1
+            except Exception as e:
+                self._errors += 1
+                logger.warning(f"工作线程解码失败: {e}")
+            finally:
+                self._decoding = 0
+            count += 1
+        if count:
+            self._decode_time += time.perf_counter() - start
+            self._record_batch(count)
+        return count
+
+    def _record_batch(self, size: int):
+        self._batches += 1
+        if size > self._max_batch_seen:
+            self._max_batch_seen = size
+
+    def get_stats(self) -> dict:
+        avg_encode_ms = self._encode_time * 1000 / self._encoded if self._encoded else 0
+        avg_decode_ms = self._decode_time * 1000 / self._decoded if self._decoded else 0
+        return {
+            "running": self._running,
+            "encoded": self._encoded,
+            "decoded": self._decoded,
+            "pending_pcm_frames": self._pcm_ring.available() // self._frame_size,
+            "pending_packets": len(self._packets),
+            "dropped_pcm_frames": self._dropped_pcm_frames,
+            "errors": self._errors,
+            "batches": self._batches,
+            "max_batch": self._max_batch_seen,
+            "avg_encode_ms": round(avg_encode_ms, 3),
+            "avg_decode_ms": round(avg_decode_ms, 3),
+        }
@@ -0,0 +1,170 @@
+import asyncio
+import threading
+from collections import deque
+from typing import Any, List, Optional
+
+
+class FrameTransport:
+    """
+    音频帧跨线程传输通道（PortAudio 回调线程 <-> asyncio 事件循环）.
+
+    - 固定容量，满时丢弃最旧帧，保证排队延迟有上界（容量 x 帧长）
+    - put/get_nowait 可在任意线程调用，内部使用 threading.Lock 保护
+    - 事件循环侧可 await get()，唤醒通过 call_soon_threadsafe 批量投递：
+      在消费者被唤醒之前，多次 put 只会投递一次唤醒
+    - 提供丢帧/溢出/欠载等计数，便于线上确定容量
+    """
+
+    def __init__(self, capacity: int, name: str = "frames"):
+        if capacity <= 0:
+            raise ValueError(f"传输通道容量必须大于0: {capacity}")
+
+        self.name = name
+        self._capacity = int(capacity)
+        self._frames: deque = deque()
+        self._lock = threading.Lock()
+
+        # 事件循环侧等待者
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._waiter: Optional[asyncio.Future] = None
+        self._wakeup_pending = False
+
+        # 统计信息
+        self._put_count = 0
+        self._get_count = 0
+        self._dropped = 0  # 写入时通道已满（溢出）而丢弃的旧帧数
+        self._underruns = 0  # 非阻塞读取时通道为空的次数
+        self._wakeups = 0  # 实际投递到事件循环的唤醒次数
+        self._high_watermark = 0
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    def qsize(self) -> int:
+        return len(self._frames)
+
+    def empty(self) -> bool:
+        return not self._frames
+
+    def put(self, frame: Any) -> bool:
+        """写入一帧（任意线程）.
+
+        Returns:
+            是否因通道已满丢弃了最旧帧
+        """
+        dropped = False
+        with self._lock:
+            if len(self._frames) >= self._capacity:
+                self._frames.popleft()
+                self._dropped += 1
+                dropped = True
+            self._frames.append(frame)
+            self._put_count += 1
+            size = len(self._frames)
+            if size > self._high_watermark:
+                self._high_watermark = size
+
+            loop = self._loop
+            need_wakeup = (
+                self._waiter is not None and not self._wakeup_pending and loop
+            )
+            if need_wakeup:
+                self._wakeup_pending = True
+                self._wakeups += 1
+
+        if need_wakeup:
+            try:
+                loop.call_soon_threadsafe(self._wake_waiter)
+            except RuntimeError:
+                # 事件循环已关闭
+                self._wakeup_pending = False
+        return dropped
+
+    def get_nowait(self) -> Optional[Any]:
+        """
+        非阻塞读取一帧（任意线程），无数据时返回 None 并计入欠载.
+        """
+        with self._lock:
+            if self._frames:
+                self._get_count += 1
+                return self._frames.popleft()
+            self._underruns += 1
+            return None
+
+    def get_batch_nowait(self, max_frames: int) -> List[Any]:
+        """
+        非阻塞批量读取最多 max_frames 帧.
+        """
+        with self._lock:
+            n = min(max_frames, len(self._frames))
+            batch = [self._frames.popleft() for _ in range(n)]
+            self._get_count += n
+            return batch
+
+    async def get(self) -> Any:
+        """
+        事件循环侧等待并读取一帧.
+        """
+        while True:
+            with self._lock:
+                if self._frames:
+                    self._get_count += 1
+                    return self._frames.popleft()
+                loop = asyncio.get_running_loop()
+                self._loop = loop
+                waiter = loop.create_future()
+                self._waiter = waiter
+                self._wakeup_pending = False
+
+            try:
+                await waiter
+            finally:
+                with self._lock:
+                    if self._waiter is waiter:
+                        self._waiter = None
+
+    async def get_batch(self, max_frames: int) -> List[Any]:
+        """
+        等待至少一帧，然后一次性取走已到达的最多 max_frames 帧.
+        """
+        first = await self.get()
+        batch = [first]
+        if max_frames > 1:
+            batch.extend(self.get_batch_nowait(max_frames - 1))
+        return batch
+
+    def _wake_waiter(self):
+        """
+        在事件循环线程中唤醒等待者.
+        """
+        with self._lock:
+            self._wakeup_pending = False
+            waiter = self._waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    def clear(self) -> int:
+        """
+        清空通道，返回丢弃的帧数.
+        """
+        with self._lock:
+            count = len(self._frames)
+            self._frames.clear()
+            return count
+
+    def get_stats(self) -> dict:
+        """
+        获取通道统计信息.
+        """
+        return {
+            "name": self.name,
+            "capacity": self._capacity,
+            "size": len(self._frames),
+            "high_watermark": self._high_watermark,
+            "put": self._put_count,
+            "get": self._get_count,
+            "dropped": self._dropped,
+            "underruns": self._underruns,
+            "wakeups": self._wakeups,
+        }
@@ -0,0 +1,251 @@
+import time
+from typing import Dict, Optional, Tuple
+
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class JitterBuffer:
+    """
+    TTS Opus 包自适应抖动缓冲.
+
+    - 按序列号重排（无序列号的通道按到达顺序编号）
+    - 目标播放延迟根据到达间隔抖动（RFC 3550 估计）自适应调整
+    - 播放端按帧节拍调用 pop()：缺失的帧返回 LOST，由解码端做 PLC/FEC 补偿
+    - 统计迟到、重复、丢失、补偿帧数
+    """
+
+    PACKET = "packet"
+    LOST = "lost"
+    EMPTY = "empty"
+
+    def __init__(
+        self,
+        frame_duration_ms: int,
+        min_delay_ms: int = 40,
+        max_delay_ms: int = 400,
+        initial_delay_ms: int = 60,
+        max_conceal_frames: int = 5,
+        capacity_ms: int = 10000,
+    ):
+        self.frame_duration_ms = frame_duration_ms
+        self.min_delay_ms = max(frame_duration_ms, min_delay_ms)
+        self.max_delay_ms = max(self.min_delay_ms, max_delay_ms)
+        self.initial_delay_ms = min(
+            max(initial_delay_ms, self.min_delay_ms), self.max_delay_ms
+        )
+        self.max_conceal_frames = max_conceal_frames
+        # 容量上限（服务端可能快于实时地突发下发整句音频，容量需远大于目标延迟）
+        self._max_packets = max(1, int(capacity_ms / frame_duration_ms))
+
+        # 超过该距离的序列号视为新的流（服务端重置了序列号）
+        self._restart_distance = max(
+            50, int(self.max_delay_ms / frame_duration_ms) * 4
+        )
+
+        self._packets: Dict[int, bytes] = {}
+        self._next_seq: Optional[int] = None
+        self._local_seq = 0
+        self._playing = False
+
+        # 抖动估计
+        self._jitter_ms = 0.0
+        self._last_arrival: Optional[float] = None
+        self._last_arrival_seq: Optional[int] = None
+        self._target_delay_ms = float(self.initial_delay_ms)
+        self._first_buffered_at: Optional[float] = None
+
+        # 统计信息
+        self._received = 0
+        self._played = 0
+        self._late = 0
+        self._duplicate = 0
+        self._lost = 0
+        self._concealed = 0
+        self._discarded = 0
+        self._rebuffer = 0
+
+    # -----------------------
+    # 写入端
+    # -----------------------
+    def put(
+        self, packet: bytes, sequence: Optional[int] = None, now: float = None
+    ) -> bool:
+        """写入一个 Opus 包.
+
+        Args:
+            packet: Opus 数据
+            sequence: 包序列号，None 表示通道不携带序列号（按到达顺序编号）
+            now: 到达时间（秒，单调时钟），默认取当前时间
+
+        Returns:
+            是否被接收（迟到或重复的包返回 False）
+        """
+        now = time.monotonic() if now is None else now
+
+        if sequence is None:
+            sequence = self._local_seq
+            self._local_seq += 1
+
+        if self._next_seq is not None:
+            if sequence < self._next_seq - self._restart_distance:
+                logger.info(
+                    f"序列号回退 {self._next_seq} -> {sequence}，视为新的音频流"
+                )
+                self.reset(keep_stats=True)
+            elif sequence < self._next_seq:
+                self._late += 1
+                return False
+
+        if sequence in self._packets:
+            self._duplicate += 1
+            return False
+
+        self._update_jitter(sequence, now)
+
+        self._packets[sequence] = packet
+        self._received += 1
+        if self._next_seq is None:
+            self._next_seq = sequence
+        elif not self._playing and sequence < self._next_seq:
+            # 预缓冲阶段收到更早的包，从更早的位置开始播放
+            self._next_seq = sequence
+        if self._first_buffered_at is None:
+            self._first_buffered_at = now
+
+        # 超出容量时丢弃最旧的包
+        while len(self._packets) > self._max_packets:
+            oldest = min(self._packets)
+            del self._packets[oldest]
+            self._discarded += 1
+            self._next_seq = min(self._packets)
+
+        return True
+
+    def _update_jitter(self, sequence: int, now: float):
+        """RFC 3550 到达间隔抖动估计，并据此更新目标延迟.
+
+        句间停顿时服务端不下发音频，下一句首包的到达间隔会远大于期望值。
+        偏差超过最大目标延迟（缓冲无论如何也吸收不了）时视为新的一段语音，
+        不计入抖动，只更新参考点.
+        """
+        if self._last_arrival is not None and self._last_arrival_seq is not None:
+            arrival_delta_ms = (now - self._last_arrival) * 1000
+            expected_delta_ms = (
+                sequence - self._last_arrival_seq
+            ) * self.frame_duration_ms
+            d = abs(arrival_delta_ms - expected_delta_ms)
+            if d > self.max_delay_ms:
+                self._last_arrival = now
+                self._last_arrival_seq = sequence
+                return
+            self._jitter_ms += (d - self._jitter_ms) / 16.0
+
+            target = self.frame_duration_ms + 3.0 * self._jitter_ms
+            self._target_delay_ms = min(
+                max(target, self.min_delay_ms), self.max_delay_ms
+            )
+
+        self._last_arrival = now
+        self._last_arrival_seq = sequence
+
+    # -----------------------
+    # 播放端
+    # -----------------------
+    def pop(self, now: float = None) -> Tuple[str, Optional[bytes]]:
+        """按帧节拍取出下一帧.
+
+        Returns:
+            (PACKET, 数据)：正常帧
+            (LOST, 下一包数据或 None)：该帧丢失，需要补偿（下一包可用于 FEC 解码）
+            (EMPTY, None)：无可播放数据（预缓冲中或已播完）
+        """
+        now = time.monotonic() if now is None else now
+
+        if not self._packets:
+            if self._playing:
+                # 播空，下次重新预缓冲
+                self._playing = False
+                self._rebuffer += 1
+            self._first_buffered_at = None
+            return self.EMPTY, None
+
+        if not self._playing:
+            buffered_ms = len(self._packets) * self.frame_duration_ms
+            waited_ms = (now - (self._first_buffered_at or now)) * 1000
+            if (
+                buffered_ms < self._target_delay_ms
+                and waited_ms < self._target_delay_ms
+            ):
+                return self.EMPTY, None
+            self._playing = True
+            self._next_seq = min(self._packets)
+
+        seq = self._next_seq
+        packet = self._packets.pop(seq, None)
+        if packet is not None:
+            self._next_seq = seq + 1
+            self._played += 1
+            return self.PACKET, packet
+
+        # 当前帧缺失但后续帧已到达：判定丢失
+        next_available = min(self._packets)
+        gap = next_available - seq
+        if gap > self.max_conceal_frames:
+            # 缺口过大不再逐帧补偿，直接跳到下一个可用包
+            self._lost += gap
+            self._next_seq = next_available
+            self._played += 1
+            return self.PACKET, self._packets.pop(next_available)
+
+        self._lost += 1
+        self._concealed += 1
+        self._next_seq = seq + 1
+        return self.LOST, self._packets.get(seq + 1)
+
+    # -----------------------
+    # 状态
+    # -----------------------
+    def __len__(self) -> int:
+        return len(self._packets)
+
+    def is_empty(self) -> bool:
+        return not self._packets
+
+    @property
+    def target_delay_ms(self) -> float:
+        return self._target_delay_ms
+
+    def reset(self, keep_stats: bool = True):
+        """
+        清空缓冲并恢复初始的抖动估计和目标延迟（打断、切换会话时调用）.
+        """
+        self._discarded += len(self._packets)
+        self._packets.clear()
+        self._next_seq = None
+        self._playing = False
+        self._first_buffered_at = None
+        self._last_arrival = None
+        self._last_arrival_seq = None
+        self._jitter_ms = 0.0
+        self._target_delay_ms = float(self.initial_delay_ms)
+        if not keep_stats:
+            self._received = self._played = self._late = self._duplicate = 0
+            self._lost = self._concealed = self._discarded = self._rebuffer = 0
+
+    def get_stats(self) -> dict:
+        return {
+            "buffered": len(self._packets),
+            "playing": self._playing,
+            "target_delay_ms": round(self._target_delay_ms, 1),
+            "jitter_ms": round(self._jitter_ms, 2),
+            "received": self._received,
+            "played": self._played,
+            "late": self._late,
+            "duplicate": self._duplicate,
+            "lost": self._lost,
+            "concealed": self._concealed,
+            "discarded": self._discarded,
+            "rebuffer": self._rebuffer,
+        }
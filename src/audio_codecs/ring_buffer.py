@@ -0,0 +1,162 @@
+from typing import Optional
+
+import numpy as np
+
+
+class AudioRingBuffer:
+    """
+    预分配的 NumPy 单生产者/单消费者环形缓冲区.
+
+    用于替代实时音频回调中的 deque 逐样本 extend/popleft：
+    - 写入/读取均为整段切片拷贝（最多两段），不在回调线程中产生 Python 级逐样本循环
+    - 生产者只推进写指针，消费者只推进读指针，单生产者/单消费者场景下无需加锁
+    - 缓冲区满时丢弃本次写入溢出的部分（不移动读指针），并累计溢出计数
+    - 其它线程不能直接清空，只能 request_clear()，由消费者在自己的线程中执行
+    """
+
+    def __init__(self, capacity: int, dtype=np.int16):
+        if capacity <= 0:
+            raise ValueError(f"环形缓冲区容量必须大于0: {capacity}")
+
+        self._capacity = int(capacity)
+        self._buffer = np.zeros(self._capacity, dtype=dtype)
+
+        # 单调递增的读写位置（实际下标取模），Python int 赋值是原子的
+        self._write_pos = 0
+        self._read_pos = 0
+
+        # 清空请求计数（请求方递增，消费者处理后追平）
+        self._clear_requests = 0
+        self._clears_applied = 0
+
+        # 统计信息
+        self._overflow_samples = 0
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def dtype(self):
+        return self._buffer.dtype
+
+    def available(self) -> int:
+        """
+        可读取的样本数.
+        """
+        return self._write_pos - self._read_pos
+
+    def free_space(self) -> int:
+        """
+        可写入的样本数.
+        """
+        return self._capacity - self.available()
+
+    def __len__(self) -> int:
+        return self.available()
+
+    def write(self, data: np.ndarray) -> int:
+        """写入一段样本（生产者调用）.
+
+        Args:
+            data: 一维样本数组
+
+        Returns:
+            实际写入的样本数，空间不足时超出部分被丢弃
+        """
+        n = len(data)
+        if n == 0:
+            return 0
+
+        free = self._capacity - (self._write_pos - self._read_pos)
+        if n > free:
+            self._overflow_samples += n - free
+            n = free
+            if n == 0:
+                return 0
+
+        start = self._write_pos % self._capacity
+        first = min(n, self._capacity - start)
+        self._buffer[start : start + first] = data[:first]
+        if first < n:
+            self._buffer[: n - first] = data[first:n]
+
+        # 数据拷贝完成后再发布写指针
+        self._write_pos += n
+        return n
+
+    def read_into(self, out: np.ndarray) -> bool:
+        """读取恰好 len(out) 个样本到预分配数组（消费者调用）.
+
+        Returns:
+            数据不足时不读取并返回 False
+        """
+        n = len(out)
+        if self._write_pos - self._read_pos < n:
+            return False
+
+        start = self._read_pos % self._capacity
+        first = min(n, self._capacity - start)
+        out[:first] = self._buffer[start : start + first]
+        if first < n:
+            out[first:] = self._buffer[: n - first]
+
+        self._read_pos += n
+        return True
+
+    def read(self, n: int) -> Optional[np.ndarray]:
+        """
+        读取 n 个样本并返回新数组，数据不足时返回 None.
+        """
+        if self._write_pos - self._read_pos < n:
+            return None
+        out = np.empty(n, dtype=self._buffer.dtype)
+        self.read_into(out)
+        return out
+
+    def skip(self, n: int) -> int:
+        """
+        丢弃最旧的 n 个样本（消费者调用），返回实际丢弃数.
+        """
+        n = max(0, min(n, self._write_pos - self._read_pos))
+        self._read_pos += n
+        return n
+
+    def trim_to(self, max_samples: int) -> int:
+        """
+        仅保留最新的 max_samples 个样本（消费者调用），返回丢弃数.
+        """
+        excess = (self._write_pos - self._read_pos) - max_samples
+        if excess > 0:
+            return self.skip(excess)
+        return 0
+
+    def clear(self) -> int:
+        """
+        清空缓冲区（消费者调用），返回丢弃的样本数.
+        """
+        return self.skip(self._write_pos - self._read_pos)
+
+    def request_clear(self) -> int:
+        """
+        请求清空（事件循环等非消费者线程调用），返回当前可读样本数.
+        """
+        self._clear_requests += 1
+        return self.available()
+
+    def apply_pending_clear(self) -> int:
+        """
+        执行挂起的清空请求（消费者在读取前调用），返回丢弃的样本数.
+        """
+        requests = self._clear_requests
+        if requests == self._clears_applied:
+            return 0
+        self._clears_applied = requests
+        return self.clear()
+
+    def get_stats(self) -> dict:
+        return {
+            "capacity": self._capacity,
+            "available": self.available(),
+            "overflow_samples": self._overflow_samples,
+        }
@@ -0,0 +1,182 @@
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import sherpa_onnx
+
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+MODEL_FILES = ("encoder.onnx", "decoder.onnx", "joiner.onnx", "tokens.txt")
+
+
+@dataclass
+class KeywordSet:
+    """
+    一组唤醒词（例如某个房间/用户专用），与所用模型目录绑定.
+    """
+
+    name: str
+    model_dir: Path
+    keywords: List[str] = field(default_factory=list)
+    keywords_file: Optional[Path] = None
+
+    @staticmethod
+    def label_of(line: str) -> str:
+        """
+        关键词行的输出文本：'@' 之后的标签，没有标签时为去空格的 token 串.
+        """
+        tokens = line.split()
+        for token in tokens:
+            if token.startswith("@"):
+                return token[1:]
+        return "".join(t for t in tokens if t[0] not in ":#")
+
+
+class KwsEngine:
+    """一个 KWS 模型实例（一个 ONNX 会话）上的多组唤醒词.
+
+    同一模型的所有唤醒词组合并为一个检测流：编码器（CPU 主要开销）每帧只运行一次，
+    只是关键词图变大；检出后按标签映射回所属的唤醒词组。
+    不同模型的唤醒词组各自一个 KwsEngine，由调用方分配线程预算并送入同一份音频。
+    """
+
+    def __init__(
+        self,
+        model_dir: Path,
+        keyword_sets: List[KeywordSet],
+        num_threads: int,
+        sample_rate: int,
+        **spotter_options,
+    ):
+        self.model_dir = model_dir
+        self.keyword_sets = keyword_sets
+        self.num_threads = num_threads
+        self.sample_rate = sample_rate
+
+        for name in MODEL_FILES:
+            if not (model_dir / name).exists():
+                raise FileNotFoundError(f"模型文件不存在: {model_dir / name}")
+
+        # 标签 -> 唤醒词组；重复标签以先配置的组为准
+        self._label_to_set: Dict[str, str] = {}
+        lines: List[str] = []
+        for keyword_set in keyword_sets:
+            for line in keyword_set.keywords:
+                label = KeywordSet.label_of(line)
+                owner = self._label_to_set.setdefault(label, keyword_set.name)
+                if owner != keyword_set.name:
+                    logger.warning(
+                        f"唤醒词 {label} 同时出现在 {owner} 和 {keyword_set.name}，"
+                        f"检出时归属 {owner}"
+                    )
+                lines.append(line)
+
+        # 只有模型自带 keywords.txt 时沿用默认流，否则用合并后的关键词创建流
+        default_keywords = model_dir / "keywords.txt"
+        self._custom_keywords: Optional[str] = None
+        if not (
+            len(keyword_sets) == 1 and keyword_sets[0].keywords_file == default_keywords
+        ):
+            self._custom_keywords = "/".join(lines)
+        if not default_keywords.exists():
+            if self._custom_keywords is None:
+                raise FileNotFoundError(f"模型文件不存在: {default_keywords}")
+            # 构造函数要求关键词文件，没有默认文件时用第一组的文件占位
+            default_keywords = keyword_sets[0].keywords_file or default_keywords
+
+        logger.info(
+            f"加载Sherpa-ONNX KeywordSpotter模型: {model_dir} "
+            f"(唤醒词组: {[s.name for s in keyword_sets]}, 线程: {num_threads})"
+        )
+        self.spotter = sherpa_onnx.KeywordSpotter(
+            tokens=str(model_dir / "tokens.txt"),
+            encoder=str(model_dir / "encoder.onnx"),
+            decoder=str(model_dir / "decoder.onnx"),
+            joiner=str(model_dir / "joiner.onnx"),
+            keywords_file=str(default_keywords),
+            num_threads=num_threads,
+            sample_rate=sample_rate,
+            feature_dim=80,
+            **spotter_options,
+        )
+        self.stream = None
+
+    def create_stream(self):
+        if self._custom_keywords is None:
+            self.stream = self.spotter.create_stream()
+        else:
+            self.stream = self.spotter.create_stream(self._custom_keywords)
+        return self.stream
+
+    def decode(
+        self, samples: np.ndarray, reset_after: bool = False
+    ) -> Optional[Tuple[str, str]]:
+        """送入音频并解码（在解码线程中调用）.
+
+        Returns:
+            检出时返回 (唤醒词组名, 关键词)，否则 None
+        """
+        spotter, stream = self.spotter, self.stream
+        stream.accept_waveform(sample_rate=self.sample_rate, waveform=samples)
+        while spotter.is_ready(stream):
+            spotter.decode_stream(stream)
+            result = spotter.get_result(stream)
+            if result:
+                # 检测到后重置流状态，不继续处理剩余数据
+                spotter.reset_stream(stream)
+                owner = self._label_to_set.get(result, self.keyword_sets[0].name)
+                return owner, result
+        if reset_after:
+            spotter.reset_stream(stream)
+        return None
+
+    def reset(self):
+        if self.stream is not None:
+            self.spotter.reset_stream(self.stream)
+
+
+def load_keyword_sets(set_configs: list, default_model_dir: Path, resolve_dir) -> list:
+    """根据配置构建唤醒词组列表.
+
+    Args:
+        set_configs: WAKE_WORD_OPTIONS.KEYWORD_SETS，空时使用模型目录下的 keywords.txt
+        default_model_dir: 默认模型目录
+        resolve_dir: 把配置中的 MODEL_PATH 解析为目录的函数
+
+    Returns:
+        KeywordSet 列表
+    """
+    if not set_configs:
+        set_configs = [{"NAME": "default"}]
+
+    keyword_sets = []
+    for index, item in enumerate(set_configs):
+        name = item.get("NAME") or f"set{index}"
+        model_dir = default_model_dir
+        if item.get("MODEL_PATH"):
+            model_dir = resolve_dir(item["MODEL_PATH"])
+
+        keywords = [k.strip() for k in item.get("KEYWORDS", []) if k.strip()]
+        keywords_file = None
+        if not keywords:
+            keywords_file = model_dir / item.get("KEYWORDS_FILE", "keywords.txt")
+            if not keywords_file.exists():
+                raise FileNotFoundError(f"唤醒词文件不存在: {keywords_file}")
+            with open(keywords_file, "r", encoding="utf-8") as f:
+                keywords = [line.strip() for line in f if line.strip()]
+
+        if not keywords:
+            logger.warning(f"唤醒词组 {name} 为空，已忽略")
+            continue
+        keyword_sets.append(KeywordSet(name, model_dir, keywords, keywords_file))
+    return keyword_sets
+
+
+def split_thread_budget(total_threads: int, engines: int) -> int:
+    """
+    在多个模型之间平分推理线程预算（每个模型至少1个线程）.
+    """
+    return max(1, int(total_threads) // max(1, engines))
@@ -0,0 +1,149 @@
+import math
+
+import numpy as np
+
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class SpeechGate:
+    """
+    唤醒词检测前置的轻量语音门限.
+
+    - 能量模式：按帧 RMS（dBFS）与阈值比较
+    - webrtcvad 模式：在能量达标的前提下再用 WebRTC VAD 判定（按 20ms 切分）
+    - 门打开后保持 hangover 时长，避免词间停顿反复开关
+    - 门关闭时持续保存最近 preroll 时长的音频，打开时先补送，保证门限边缘的词头不被截断
+    """
+
+    CLOSED = "closed"  # 关闭，丢弃当前帧（已存入预录缓冲）
+    OPENED = "opened"  # 本帧打开，调用方应先送入 take_preroll()（已含本帧）
+    OPEN = "open"  # 保持打开，正常送入本帧
+    CLOSING = "closing"  # 本帧为 hangover 最后一帧，送入后门关闭
+
+    def __init__(
+        self,
+        frame_size: int,
+        frame_duration_ms: int,
+        mode: str = "energy",
+        threshold_db: float = -45.0,
+        vad_mode: int = 2,
+        hangover_ms: int = 600,
+        preroll_ms: int = 400,
+        sample_rate: int = 16000,
+    ):
+        self.frame_size = frame_size
+        self.mode = mode
+        self.threshold_db = float(threshold_db)
+        self.sample_rate = sample_rate
+
+        self._vad = None
+        self._vad_chunk = sample_rate * 20 // 1000
+        if mode == "webrtcvad":
+            try:
+                import webrtcvad
+
+                self._vad = webrtcvad.Vad(int(vad_mode))
+            except Exception as e:
+                logger.warning(f"webrtcvad 不可用，语音门限退回能量模式: {e}")
+                self.mode = "energy"
+
+        self._hangover_frames = max(0, -(-int(hangover_ms) // frame_duration_ms))
+        preroll_frames = max(1, -(-int(preroll_ms) // frame_duration_ms))
+        self._preroll = np.zeros((preroll_frames, frame_size), dtype=np.float32)
+        self._preroll_pos = 0
+        self._preroll_count = 0
+
+        self._open = False
+        self._hangover_left = 0
+
+        # 统计信息
+        self._frames = 0
+        self._passed = 0
+        self._openings = 0
+        self._last_level_db = -120.0
+
+    @property
+    def is_open(self) -> bool:
+        return self._open
+
+    def process(self, frame) -> str:
+        """判定一帧采集帧（CaptureFrame）并返回门状态.
+
+        Returns:
+            CLOSED / OPENED / OPEN / CLOSING
+        """
+        samples = frame.as_float32()
+        self._frames += 1
+        speech = self._is_speech(samples, frame.pcm)
+
+        if not self._open:
+            self._push_preroll(samples)
+            if not speech:
+                return self.CLOSED
+            self._open = True
+            self._hangover_left = self._hangover_frames
+            self._openings += 1
+            self._passed += self._preroll_count
+            return self.OPENED
+
+        self._passed += 1
+        if speech:
+            self._hangover_left = self._hangover_frames
+            return self.OPEN
+        if self._hangover_left > 0:
+            self._hangover_left -= 1
+            return self.OPEN
+        self._open = False
+        self._preroll_count = 0
+        return self.CLOSING
+
+    def _is_speech(self, samples: np.ndarray, pcm: np.ndarray) -> bool:
+        # RMS 用点积计算，不产生临时数组
+        energy = float(np.dot(samples, samples)) / len(samples)
+        level_db = 10 * math.log10(energy) if energy > 1e-12 else -120.0
+        self._last_level_db = level_db
+        if level_db < self.threshold_db:
+            return False
+        if self._vad is None:
+            return True
+
+        chunk = self._vad_chunk
+        for start in range(0, len(pcm) - chunk + 1, chunk):
+            data = pcm[start : start + chunk].tobytes()
+            if self._vad.is_speech(data, self.sample_rate):
+                return True
+        return False
+
+    def _push_preroll(self, samples: np.ndarray):
+        self._preroll[self._preroll_pos] = samples
+        self._preroll_pos = (self._preroll_pos + 1) % len(self._preroll)
+        self._preroll_count = min(self._preroll_count + 1, len(self._preroll))
+
+    def take_preroll(self) -> np.ndarray:
+        """
+        按时间顺序取出预录音频（含触发打开的那一帧）并清空预录缓冲.
+        """
+        count = self._preroll_count
+        start = (self._preroll_pos - count) % len(self._preroll)
+        order = [(start + i) % len(self._preroll) for i in range(count)]
+        self._preroll_count = 0
+        return self._preroll[order].reshape(-1)
+
+    def reset(self):
+        self._open = False
+        self._hangover_left = 0
+        self._preroll_count = 0
+
+    def get_stats(self) -> dict:
+        return {
+            "mode": self.mode,
+            "open": self._open,
+            "threshold_db": self.threshold_db,
+            "level_db": round(self._last_level_db, 1),
+            "frames": self._frames,
+            "passed_frames": self._passed,
+            "pass_ratio": round(self._passed / self._frames, 4) if self._frames else 0,
+            "openings": self._openings,
+        }
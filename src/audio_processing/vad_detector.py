@@ -1,30 +1,31 @@
-import logging
-import threading
-import time
+import asyncio
+from typing import Optional
 
 import numpy as np
-import pyaudio
 import webrtcvad
 
-from src.constants.constants import AbortReason, DeviceState
+from src.constants.constants import AbortReason, AudioConfig, DeviceState
+from src.utils.logging_config import get_logger
 
-# 配置日志
-logger = logging.getLogger("VADDetector")
+logger = get_logger(__name__)
 
 
 class VADDetector:
     """
     基于WebRTC VAD的语音活动检测器，用于检测用户打断.
+
+    从 AudioCodec 的采集总线订阅16kHz单声道帧，不再单独打开输入设备；
+    帧到达时由录音回调唤醒，没有轮询等待。
     """
 
-    def __init__(self, audio_codec, protocol, app_instance, loop):
+    def __init__(self, audio_codec, protocol=None, app_instance=None, loop=None):
         """初始化VAD检测器.
 
         参数:
-            audio_codec: 音频编解码器实例
-            protocol: 通信协议实例
+            audio_codec: 音频编解码器实例（提供 subscribe_capture）
+            protocol: 通信协议实例（保留参数，未使用）
             app_instance: 应用程序实例
-            loop: 事件循环
+            loop: 事件循环（保留参数，检测任务运行在当前事件循环中）
         """
         self.audio_codec = audio_codec
         self.protocol = protocol
@@ -35,8 +36,8 @@ class VADDetector:
         self.vad = webrtcvad.Vad()
         self.vad.set_mode(3)  # 设置最高灵敏度
 
-        # 参数设置
-        self.sample_rate = 16000
+        # 参数设置：WebRTC VAD 只接受 10/20/30ms 帧，采集帧按 20ms 切分
+        self.sample_rate = AudioConfig.INPUT_SAMPLE_RATE
         self.frame_duration = 20  # 毫秒
         self.frame_size = int(self.sample_rate * self.frame_duration / 1000)
         self.speech_window = 5  # 连续检测到多少帧语音才触发打断
@@ -45,64 +46,66 @@ class VADDetector:
         # 状态变量
         self.running = False
         self.paused = False
-        self.thread = None
+        self.task: Optional[asyncio.Task] = None
+        self.subscription = None
         self.speech_count = 0
         self.silence_count = 0
         self.triggered = False
 
-        # 创建独立的PyAudio实例和流，避免与主音频流冲突
-        self.pa = None
-        self.stream = None
-
-    def start(self):
+    async def start(self):
         """
         启动VAD检测器.
         """
-        if self.thread and self.thread.is_alive():
+        if self.task and not self.task.done():
             logger.warning("VAD检测器已经在运行")
             return
 
         self.running = True
         self.paused = False
 
-        # 初始化PyAudio和流
-        self._initialize_audio_stream()
+        # 订阅采集总线（约 200ms 积压上限，打断检测只关心最新音频）
+        capacity = max(1, 200 // AudioConfig.FRAME_DURATION)
+        self.subscription = self.audio_codec.subscribe_capture("vad", capacity)
 
-        # 启动检测线程
-        self.thread = threading.Thread(target=self._detection_loop, daemon=True)
-        self.thread.start()
+        self.task = asyncio.create_task(self._detection_loop(), name="vad:detect")
         logger.info("VAD检测器已启动")
 
-    def stop(self):
+    async def stop(self):
         """
         停止VAD检测器.
         """
         self.running = False
 
-        # 关闭音频流
-        self._close_audio_stream()
+        if self.task and not self.task.done():
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+        self.task = None
 
-        if self.thread and self.thread.is_alive():
-            self.thread.join(timeout=1.0)
+        if self.subscription:
+            self.subscription.close()
+            self.subscription = None
 
         logger.info("VAD检测器已停止")
 
-    def pause(self):
+    async def pause(self):
         """
         暂停VAD检测.
         """
         self.paused = True
         logger.info("VAD检测器已暂停")
 
-    def resume(self):
+    async def resume(self):
         """
         恢复VAD检测.
         """
         self.paused = False
-        # 重置状态
-        self.speech_count = 0
-        self.silence_count = 0
-        self.triggered = False
+        self._reset_state()
+        if self.subscription:
+            # 丢弃暂停期间积压的旧帧
+            self.subscription.clear()
         logger.info("VAD检测器已恢复")
 
     def is_running(self):
@@ -111,135 +114,59 @@ class VADDetector:
         """
         return self.running and not self.paused
 
-    def _initialize_audio_stream(self):
-        """
-        初始化独立的音频流.
-        """
-        try:
-            # 创建PyAudio实例
-            self.pa = pyaudio.PyAudio()
-
-            # 获取默认输入设备
-            device_index = None
-            for i in range(self.pa.get_device_count()):
-                device_info = self.pa.get_device_info_by_index(i)
-                if device_info["maxInputChannels"] > 0:
-                    device_index = i
-                    break
-
-            if device_index is None:
-                logger.error("找不到可用的输入设备")
-                return False
-
-            # 创建输入流
-            self.stream = self.pa.open(
-                format=pyaudio.paInt16,
-                channels=1,
-                rate=self.sample_rate,
-                input=True,
-                input_device_index=device_index,
-                frames_per_buffer=self.frame_size,
-                start=True,
-            )
-
-            logger.info(f"VAD检测器音频流已初始化，使用设备索引: {device_index}")
-            return True
-
-        except Exception as e:
-            logger.error(f"初始化VAD音频流失败: {e}")
-            return False
-
-    def _close_audio_stream(self):
-        """
-        关闭音频流.
-        """
-        try:
-            if self.stream:
-                self.stream.stop_stream()
-                self.stream.close()
-                self.stream = None
-
-            if self.pa:
-                self.pa.terminate()
-                self.pa = None
-
-            logger.info("VAD检测器音频流已关闭")
-        except Exception as e:
-            logger.error(f"关闭VAD音频流失败: {e}")
-
-    def _detection_loop(self):
+    async def _detection_loop(self):
         """
         VAD检测主循环.
         """
         logger.info("VAD检测循环已启动")
 
         while self.running:
-            # 如果暂停或者音频流未初始化，则跳过
-            if self.paused or not self.stream:
-                time.sleep(0.1)
-                continue
-
             try:
-                # 只在说话状态下进行检测
-                if self.app.device_state == DeviceState.SPEAKING:
-                    # 读取音频帧
-                    frame = self._read_audio_frame()
-                    if not frame:
-                        time.sleep(0.01)
-                        continue
-
-                    # 检测是否是语音
-                    is_speech = self._detect_speech(frame)
-
-                    # 如果检测到语音并且达到触发条件，处理打断
-                    if is_speech:
-                        self._handle_speech_frame(frame)
-                    else:
-                        self._handle_silence_frame(frame)
-                else:
-                    # 不在说话状态，重置状态
+                frame = await self.subscription.get()
+
+                # 暂停或不在说话状态时只消费帧，不做检测
+                if self.paused or not self.app:
+                    continue
+                if self.app.device_state != DeviceState.SPEAKING:
                     self._reset_state()
+                    continue
+
+                pcm = frame.pcm
+                for start in range(0, len(pcm) - self.frame_size + 1, self.frame_size):
+                    chunk = pcm[start : start + self.frame_size]
+                    if self._detect_speech(chunk):
+                        self._handle_speech_frame(chunk)
+                        if self.paused:
+                            break
+                    else:
+                        self._handle_silence_frame(chunk)
 
+            except asyncio.CancelledError:
+                break
             except Exception as e:
                 logger.error(f"VAD检测循环出错: {e}")
 
-            time.sleep(0.01)  # 小延迟，减少CPU使用
-
         logger.info("VAD检测循环已结束")
 
-    def _read_audio_frame(self):
-        """
-        读取一帧音频数据.
-        """
-        try:
-            if not self.stream or not self.stream.is_active():
-                return None
-
-            # 读取音频数据
-            data = self.stream.read(self.frame_size, exception_on_overflow=False)
-            return data
-        except Exception as e:
-            logger.error(f"读取音频帧失败: {e}")
-            return None
-
-    def _detect_speech(self, frame):
+    def _detect_speech(self, chunk: np.ndarray) -> bool:
         """
         检测是否是语音.
         """
         try:
             # 确保帧长度正确
-            if len(frame) != self.frame_size * 2:  # 16位音频，每个样本2字节
+            if len(chunk) != self.frame_size:
                 return False
 
             # 使用VAD检测
-            is_speech = self.vad.is_speech(frame, self.sample_rate)
+            is_speech = self.vad.is_speech(chunk.tobytes(), self.sample_rate)
+            if not is_speech:
+                return False
 
-            # 计算音频能量
-            audio_data = np.frombuffer(frame, dtype=np.int16)
-            energy = np.mean(np.abs(audio_data))
+            # 计算音频能量（转为 int32 避免 -32768 取绝对值溢出）
+            energy = np.abs(chunk.astype(np.int32)).mean()
 
             # 结合VAD和能量阈值
-            is_valid_speech = is_speech and energy > self.energy_threshold
+            is_valid_speech = energy > self.energy_threshold
 
             if is_valid_speech:
                 logger.debug(
@@ -251,7 +178,7 @@ class VADDetector:
             logger.error(f"检测语音失败: {e}")
             return False
 
-    def _handle_speech_frame(self, frame):
+    def _handle_speech_frame(self, chunk):
         """
         处理语音帧.
         """
@@ -269,11 +196,9 @@ class VADDetector:
             logger.info("VAD检测器已自动暂停以防止重复触发")
 
             # 重置状态
-            self.speech_count = 0
-            self.silence_count = 0
-            self.triggered = False
+            self._reset_state()
 
-    def _handle_silence_frame(self, frame):
+    def _handle_silence_frame(self, chunk):
         """
         处理静音帧.
         """
@@ -292,7 +217,8 @@ class VADDetector:
         """
         触发打断.
         """
-        # 通知应用程序中止当前语音输出
-        self.app.schedule(
-            lambda: self.app.abort_speaking(AbortReason.WAKE_WORD_DETECTED)
+        # 通知应用程序中止当前语音输出（检测循环已在事件循环线程中）
+        self.app.spawn(
+            self.app.abort_speaking(AbortReason.WAKE_WORD_DETECTED),
+            name="vad:abort_speaking",
         )
@@ -1,11 +1,18 @@
 import asyncio
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Callable, Optional
+from typing import Callable, List, Optional
 
 import numpy as np
-import sherpa_onnx
 
+from src.audio_processing.kws_engine import (
+    KwsEngine,
+    load_keyword_sets,
+    split_thread_budget,
+)
+from src.audio_processing.speech_gate import SpeechGate
 from src.constants.constants import AudioConfig
 from src.utils.config_manager import ConfigManager
 from src.utils.logging_config import get_logger
@@ -22,6 +29,22 @@ class WakeWordDetector:
         self.is_running_flag = False
         self.paused = False
         self.detection_task = None
+        self._resume_event: Optional[asyncio.Event] = None
+
+        # 采集总线订阅与专用解码线程（ONNX 推理不占用事件循环）
+        self._subscription = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.engines: List[KwsEngine] = []
+        self.gate: Optional[SpeechGate] = None
+        self._chunk_fill = 0
+
+        # 性能统计：每个送入模型的音频块的解码耗时与CPU时间
+        self._chunk_latencies_ms: deque = deque(maxlen=200)
+        self._chunks_processed = 0
+        self._total_decode_ms = 0.0
+        self._total_cpu_ms = 0.0
+        self._total_process_cpu_ms = 0.0
+        self._total_audio_ms = 0.0
 
         # 防重复触发机制 - 缩短冷却时间提高响应
         self.last_detection_time = 0
@@ -42,9 +65,10 @@ class WakeWordDetector:
         self.enabled = True
         self.sample_rate = AudioConfig.INPUT_SAMPLE_RATE
 
-        # Sherpa-ONNX KWS组件
+        # Sherpa-ONNX KWS组件：每个模型一个引擎，主引擎的 spotter/stream 保留为属性
         self.keyword_spotter = None
         self.stream = None
+        self.last_detected_set: Optional[str] = None
 
         # 初始化配置
         self._load_config(config)
@@ -57,19 +81,17 @@ class WakeWordDetector:
         """
         # 模型路径配置
         model_path = config.get_config("WAKE_WORD_OPTIONS.MODEL_PATH", "models")
-        self.model_dir = resource_finder.find_directory(model_path)
+        self.model_dir = self._resolve_model_dir(model_path)
 
-        if self.model_dir is None:
-            # 兜底方案：尝试直接使用路径
-            self.model_dir = Path(model_path)
-            logger.warning(
-                f"ResourceFinder未找到模型目录，使用原始路径: {self.model_dir}"
-            )
+        # 多组唤醒词（不同房间/用户），为空时使用模型目录下的 keywords.txt
+        self.keyword_set_configs = (
+            config.get_config("WAKE_WORD_OPTIONS.KEYWORD_SETS", []) or []
+        )
 
         # KWS参数配置 - 优化速度
         self.num_threads = config.get_config(
             "WAKE_WORD_OPTIONS.NUM_THREADS", 4
-        )  # 增加线程数
+        )  # 所有模型共享的推理线程总预算
         self.provider = config.get_config("WAKE_WORD_OPTIONS.PROVIDER", "cpu")
         self.max_active_paths = config.get_config(
             "WAKE_WORD_OPTIONS.MAX_ACTIVE_PATHS", 2
@@ -84,56 +106,87 @@ class WakeWordDetector:
             "WAKE_WORD_OPTIONS.NUM_TRAILING_BLANKS", 1
         )
 
+        # 每次送入模型的音频块时长，向上取整到采集帧长的整数倍
+        chunk_ms = config.get_config("WAKE_WORD_OPTIONS.CHUNK_MS", 60)
+        self.chunk_frames = max(1, -(-int(chunk_ms) // AudioConfig.FRAME_DURATION))
+        self.chunk_ms = self.chunk_frames * AudioConfig.FRAME_DURATION
+        self._chunk_buffer = np.zeros(
+            self.chunk_frames * AudioConfig.INPUT_FRAME_SIZE, dtype=np.float32
+        )
+
+        # 可选的能量/VAD 前置门限：静音时不运行模型
+        gate_config = config.get_config("WAKE_WORD_OPTIONS.GATE", {}) or {}
+        if gate_config.get("ENABLED", False):
+            self.gate = SpeechGate(
+                AudioConfig.INPUT_FRAME_SIZE,
+                AudioConfig.FRAME_DURATION,
+                mode=gate_config.get("MODE", "energy"),
+                threshold_db=gate_config.get("THRESHOLD_DB", -45.0),
+                vad_mode=gate_config.get("VAD_MODE", 2),
+                hangover_ms=gate_config.get("HANGOVER_MS", 600),
+                preroll_ms=gate_config.get("PREROLL_MS", 400),
+                sample_rate=self.sample_rate,
+            )
+            logger.info(
+                f"KWS语音门限已启用 - 模式: {self.gate.mode}, "
+                f"阈值: {self.gate.threshold_db}dBFS"
+            )
+
         logger.info(
             f"KWS配置加载完成 - 阈值: {self.keywords_threshold}, 分数: {self.keywords_score}"
         )
 
+    @staticmethod
+    def _resolve_model_dir(model_path: str) -> Path:
+        model_dir = resource_finder.find_directory(model_path)
+        if model_dir is None:
+            # 兜底方案：尝试直接使用路径
+            model_dir = Path(model_path)
+            logger.warning(f"ResourceFinder未找到模型目录，使用原始路径: {model_dir}")
+        return model_dir
+
     def _init_kws_model(self):
-        """
-        初始化Sherpa-ONNX KeywordSpotter模型.
+        """初始化Sherpa-ONNX KeywordSpotter模型.
+
+        同一模型目录下的多组唤醒词合并到一个引擎（编码器只运行一次）；
+        不同模型目录各建一个引擎，推理线程在引擎之间平分 NUM_THREADS。
         """
         try:
-            # 检查模型文件
-            encoder_path = self.model_dir / "encoder.onnx"
-            decoder_path = self.model_dir / "decoder.onnx"
-            joiner_path = self.model_dir / "joiner.onnx"
-            tokens_path = self.model_dir / "tokens.txt"
-            keywords_path = self.model_dir / "keywords.txt"
-
-            required_files = [
-                encoder_path,
-                decoder_path,
-                joiner_path,
-                tokens_path,
-                keywords_path,
-            ]
-            for file_path in required_files:
-                if not file_path.exists():
-                    raise FileNotFoundError(f"模型文件不存在: {file_path}")
-
-            logger.info(f"加载Sherpa-ONNX KeywordSpotter模型: {self.model_dir}")
-
-            # 创建KeywordSpotter
-            self.keyword_spotter = sherpa_onnx.KeywordSpotter(
-                tokens=str(tokens_path),
-                encoder=str(encoder_path),
-                decoder=str(decoder_path),
-                joiner=str(joiner_path),
-                keywords_file=str(keywords_path),
-                num_threads=self.num_threads,
-                sample_rate=self.sample_rate,
-                feature_dim=80,
-                max_active_paths=self.max_active_paths,
-                keywords_score=self.keywords_score,
-                keywords_threshold=self.keywords_threshold,
-                num_trailing_blanks=self.num_trailing_blanks,
-                provider=self.provider,
+            keyword_sets = load_keyword_sets(
+                self.keyword_set_configs, self.model_dir, self._resolve_model_dir
             )
+            if not keyword_sets:
+                raise ValueError("没有可用的唤醒词组")
+
+            groups = {}
+            for keyword_set in keyword_sets:
+                groups.setdefault(keyword_set.model_dir, []).append(keyword_set)
+
+            threads = split_thread_budget(self.num_threads, len(groups))
+            self.engines = [
+                KwsEngine(
+                    model_dir,
+                    sets,
+                    num_threads=threads,
+                    sample_rate=self.sample_rate,
+                    max_active_paths=self.max_active_paths,
+                    keywords_score=self.keywords_score,
+                    keywords_threshold=self.keywords_threshold,
+                    num_trailing_blanks=self.num_trailing_blanks,
+                    provider=self.provider,
+                )
+                for model_dir, sets in groups.items()
+            ]
+            self.keyword_spotter = self.engines[0].spotter
 
-            logger.info("Sherpa-ONNX KeywordSpotter模型加载成功")
+            logger.info(
+                f"Sherpa-ONNX KeywordSpotter模型加载成功 - 模型数: {len(self.engines)}, "
+                f"唤醒词组: {[s.name for s in keyword_sets]}, 每模型线程: {threads}"
+            )
 
         except Exception as e:
             logger.error(f"Sherpa-ONNX KeywordSpotter初始化失败: {e}", exc_info=True)
+            self.engines = []
             self.enabled = False
 
     def on_detected(self, callback: Callable):
@@ -150,7 +203,7 @@ class WakeWordDetector:
             logger.warning("唤醒词功能未启用")
             return False
 
-        if not self.keyword_spotter:
+        if not self.engines:
             logger.error("KeywordSpotter未初始化")
             return False
 
@@ -158,12 +211,24 @@ class WakeWordDetector:
             self.audio_codec = audio_codec
             self.is_running_flag = True
             self.paused = False
-
-            # 创建检测流
-            self.stream = self.keyword_spotter.create_stream()
+            self._resume_event = asyncio.Event()
+            self._resume_event.set()
+
+            # 创建检测流（每个模型一个）
+            for engine in self.engines:
+                engine.create_stream()
+            self.stream = self.engines[0].stream
+
+            # 订阅采集帧（容量上限约1秒，解码跟不上时丢弃最旧帧）
+            self._subscription = audio_codec.subscribe_capture("kws")
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="kws-decode"
+            )
 
             # 启动检测任务
-            self.detection_task = asyncio.create_task(self._detection_loop())
+            self.detection_task = asyncio.create_task(
+                self._detection_loop(), name="kws:detect"
+            )
 
             logger.info("Sherpa-ONNX KeywordSpotter检测器启动成功")
             return True
@@ -182,18 +247,16 @@ class WakeWordDetector:
         while self.is_running_flag:
             try:
                 if self.paused:
-                    await asyncio.sleep(0.1)
+                    # 暂停期间等待恢复事件，不轮询
+                    await self._resume_event.wait()
                     continue
 
-                if not self.audio_codec:
+                if not self.audio_codec or not self._subscription:
                     await asyncio.sleep(0.5)
                     continue
 
-                # 处理音频数据
+                # 处理音频数据（无数据时阻塞等待录音回调唤醒）
                 await self._process_audio()
-
-                # 减少延迟提高响应速度
-                await asyncio.sleep(0.005)
                 error_count = 0
 
             except asyncio.CancelledError:
@@ -218,51 +281,111 @@ class WakeWordDetector:
                 await asyncio.sleep(1)
 
     async def _process_audio(self):
-        """处理音频数据 - 批量处理优化"""
+        """
+        处理一帧采集帧：经过门限后累积到音频块，凑满后交给解码线程处理.
+        """
         try:
-            if not self.audio_codec or not self.stream:
+            if not self.stream:
                 return
 
-            # 批量获取多个音频帧以提高效率
-            audio_batches = []
-            for _ in range(3):  # 一次处理最多3帧
-                data = await self.audio_codec.get_raw_audio_for_detection()
-                if data:
-                    audio_batches.append(data)
-
-            if not audio_batches:
+            # 等待采集帧（录音回调唤醒，不轮询）
+            frame = await self._subscription.get()
+            if self.paused:
                 return
 
-            # 批量处理音频数据
-            for data in audio_batches:
-                # 转换音频格式
-                if isinstance(data, bytes):
-                    samples = (
-                        np.frombuffer(data, dtype=np.int16).astype(np.float32) / 32768.0
-                    )
-                else:
-                    samples = np.array(data, dtype=np.float32)
+            if self.gate is not None:
+                state = self.gate.process(frame)
+                if state == SpeechGate.CLOSED:
+                    return
+                if state == SpeechGate.OPENED:
+                    # 先补送预录音频（已含本帧），保证词头不被截断
+                    await self._decode(self.gate.take_preroll())
+                    return
+                if state == SpeechGate.CLOSING:
+                    # 门关闭：送完剩余数据并重置流，避免跨静音段拼接
+                    self._append_frame(frame)
+                    await self._flush_chunk(reset_after=True)
+                    return
+
+            self._append_frame(frame)
+            if self._chunk_fill >= len(self._chunk_buffer):
+                await self._flush_chunk()
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.debug(f"KWS音频处理错误: {e}")
 
-                # 提供音频数据给KeywordSpotter
-                self.stream.accept_waveform(
-                    sample_rate=self.sample_rate, waveform=samples
-                )
+    def _append_frame(self, frame):
+        samples = frame.as_float32()
+        end = self._chunk_fill + len(samples)
+        self._chunk_buffer[self._chunk_fill : end] = samples
+        self._chunk_fill = end
 
-            # 处理检测结果
-            while self.keyword_spotter.is_ready(self.stream):
-                self.keyword_spotter.decode_stream(self.stream)
-                result = self.keyword_spotter.get_result(self.stream)
+    async def _flush_chunk(self, reset_after: bool = False):
+        """
+        把已累积的音频块交给解码线程.
+        """
+        if self._chunk_fill == 0 and not reset_after:
+            return
+        samples = self._chunk_buffer[: self._chunk_fill]
+        try:
+            await self._decode(samples, reset_after)
+        finally:
+            self._chunk_fill = 0
 
-                if result:
-                    await self._handle_detection_result(result)
-                    # 重置流状态
-                    self.keyword_spotter.reset_stream(self.stream)
-                    break  # 检测到后立即处理，不继续批量处理
+    async def _decode(self, samples: np.ndarray, reset_after: bool = False):
+        """
+        在专用解码线程中运行模型并处理检测结果.
+        """
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        result, thread_cpu, process_cpu = await loop.run_in_executor(
+            self._executor, self._decode_chunk, samples, reset_after
+        )
+        latency_ms = (time.perf_counter() - started) * 1000
+        audio_ms = len(samples) * 1000 / self.sample_rate
+        self._record_chunk(latency_ms, thread_cpu, process_cpu, audio_ms)
 
-        except Exception as e:
-            logger.debug(f"KWS音频处理错误: {e}")
+        if result:
+            keyword_set, keyword = result
+            await self._handle_detection_result(keyword, keyword_set)
+
+    def _decode_chunk(self, samples: np.ndarray, reset_after: bool = False):
+        """在解码线程中把同一段音频送入所有模型并解码.
 
-    async def _handle_detection_result(self, result):
+        Returns:
+            ((唤醒词组, 关键词) 或 None, 解码线程CPU时间, 进程CPU时间)，单位秒；
+            ONNX 多线程推理的工作线程只计入进程CPU时间（含同期其他线程的开销）
+        """
+        thread_start = time.thread_time()
+        process_start = time.process_time()
+        result = None
+        for engine in self.engines:
+            hit = engine.decode(samples, reset_after)
+            if hit and result is None:
+                result = hit
+        return (
+            result,
+            time.thread_time() - thread_start,
+            time.process_time() - process_start,
+        )
+
+    def _record_chunk(
+        self,
+        latency_ms: float,
+        thread_cpu: float,
+        process_cpu: float,
+        audio_ms: float,
+    ):
+        self._chunk_latencies_ms.append(latency_ms)
+        self._chunks_processed += 1
+        self._total_decode_ms += latency_ms
+        self._total_cpu_ms += thread_cpu * 1000
+        self._total_process_cpu_ms += process_cpu * 1000
+        self._total_audio_ms += audio_ms
+
+    async def _handle_detection_result(self, result, keyword_set: str = None):
         """
         处理检测结果.
         """
@@ -272,6 +395,8 @@ class WakeWordDetector:
             return
 
         self.last_detection_time = current_time
+        self.last_detected_set = keyword_set
+        logger.info(f"检测到唤醒词: {result} (唤醒词组: {keyword_set})")
 
         # 触发回调
         if self.on_detected_callback:
@@ -295,6 +420,16 @@ class WakeWordDetector:
                 await self.detection_task
             except asyncio.CancelledError:
                 pass
+            self.detection_task = None
+
+        if self._subscription:
+            self._subscription.close()
+            self._subscription = None
+
+        if self._executor:
+            # 等待正在进行的解码结束，避免与流对象的释放竞争
+            self._executor.shutdown(wait=True)
+            self._executor = None
 
         logger.info("Sherpa-ONNX KeywordSpotter检测器已停止")
 
@@ -303,6 +438,8 @@ class WakeWordDetector:
         暂停检测.
         """
         self.paused = True
+        if self._resume_event:
+            self._resume_event.clear()
         logger.debug("KWS检测已暂停")
 
     async def resume(self):
@@ -310,6 +447,14 @@ class WakeWordDetector:
         恢复检测.
         """
         self.paused = False
+        self._chunk_fill = 0
+        if self.gate is not None:
+            self.gate.reset()
+        if self._subscription:
+            # 丢弃暂停期间积压的旧帧
+            self._subscription.clear()
+        if self._resume_event:
+            self._resume_event.set()
         logger.debug("KWS检测已恢复")
 
     def is_running(self) -> bool:
@@ -347,11 +492,65 @@ class WakeWordDetector:
             "engine": "sherpa-onnx-kws",
             "provider": self.provider,
             "num_threads": self.num_threads,
+            "models": [
+                {
+                    "model_dir": str(engine.model_dir),
+                    "keyword_sets": [s.name for s in engine.keyword_sets],
+                    "num_threads": engine.num_threads,
+                }
+                for engine in self.engines
+            ],
             "keywords_threshold": self.keywords_threshold,
             "keywords_score": self.keywords_score,
             "is_running": self.is_running(),
+            **self._get_decode_stats(),
+            "gate": self.get_gate_stats(),
         }
 
+    def _get_decode_stats(self) -> dict:
+        """
+        音频块解码耗时（墙钟）与CPU时间统计.
+        """
+        stats = {
+            "chunk_ms": getattr(self, "chunk_ms", None),
+            "chunks_processed": self._chunks_processed,
+        }
+        if not self._chunks_processed:
+            return stats
+
+        latencies = np.asarray(self._chunk_latencies_ms)
+        stats.update(
+            {
+                "decode_latency_ms_avg": round(
+                    self._total_decode_ms / self._chunks_processed, 3
+                ),
+                "decode_latency_ms_p50": round(float(np.percentile(latencies, 50)), 3),
+                "decode_latency_ms_p95": round(float(np.percentile(latencies, 95)), 3),
+                "decode_latency_ms_max": round(float(latencies.max()), 3),
+                "cpu_ms_per_chunk": round(
+                    self._total_cpu_ms / self._chunks_processed, 3
+                ),
+                "process_cpu_ms_per_chunk": round(
+                    self._total_process_cpu_ms / self._chunks_processed, 3
+                ),
+                # 解码线程CPU时间 / 处理的音频时长，>1 表示跟不上实时
+                "cpu_load": round(
+                    self._total_cpu_ms / max(self._total_audio_ms, 1e-9), 4
+                ),
+            }
+        )
+        if self._subscription:
+            stats["dropped_frames"] = self._subscription.get_stats()["dropped"]
+        return stats
+
+    def get_gate_stats(self) -> dict:
+        """
+        前置门限统计（通过率、开门次数、当前电平）.
+        """
+        if self.gate is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.gate.get_stats()}
+
     def clear_cache(self):
         """
         清空缓存.
@@ -1,8 +1,8 @@
 import asyncio
-import json
 from typing import Any, Dict, Optional, Tuple
 
 from src.iot.thing import Thing
+from src.utils import json_codec
 from src.utils.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -41,7 +41,7 @@ class ThingManager:
         # 由于get_descriptor_json()是同步方法（返回静态数据），
         # 这里保持简单的同步调用即可
         descriptors = [thing.get_descriptor_json() for thing in self.things]
-        return json.dumps(descriptors)
+        return json_codec.dumps(descriptors)
 
     async def get_states_json(self, delta=False) -> Tuple[bool, str]:
         """获取所有设备的状态JSON.
@@ -79,9 +79,9 @@ class ThingManager:
             if isinstance(state_json, dict):
                 states.append(state_json)
             else:
-                states.append(json.loads(state_json))  # 转换JSON字符串为字典
+                states.append(json_codec.loads(state_json))  # 转换JSON字符串为字典
 
-        return changed, json.dumps(states)
+        return changed, json_codec.dumps(states)
 
     async def get_states_json_str(self) -> str:
         """
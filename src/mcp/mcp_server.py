@@ -4,12 +4,12 @@ Reference: https://modelcontextprotocol.io/specification/2024-11-05
 """
 
 import asyncio
-import json
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 from src.constants.system import SystemConstants
+from src.utils import json_codec
 from src.utils.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -191,13 +191,13 @@ class McpTool:
             else:
                 text = str(result)
 
-            return json.dumps(
+            return json_codec.dumps(
                 {"content": [{"type": "text", "text": text}], "isError": False}
             )
 
         except Exception as e:
             logger.error(f"Error calling tool {self.name}: {e}", exc_info=True)
-            return json.dumps(
+            return json_codec.dumps(
                 {"content": [{"type": "text", "text": str(e)}], "isError": True}
             )
 
@@ -359,14 +359,16 @@ class McpServer:
         解析MCP消息.
         """
         try:
-            if isinstance(message, str):
-                data = json.loads(message)
+            if isinstance(message, (str, bytes)):
+                data = json_codec.loads(message)
             else:
                 data = message
 
+            # 完整消息体只在 DEBUG 级别格式化输出
             logger.info(
-                f"[MCP] 解析消息: {json.dumps(data, ensure_ascii=False, indent=2)}"
+                f"[MCP] 解析消息: method={data.get('method')}, id={data.get('id')}"
             )
+            json_codec.log_pretty(logger, "[MCP] 消息内容: ", data)
 
             # 检查JSONRPC版本
             if data.get("jsonrpc") != "2.0":
@@ -408,6 +410,24 @@ class McpServer:
             if "id" in locals():
                 await self._reply_error(id, str(e))
 
+    async def reject_message(self, message: Union[str, Dict[str, Any]], reason: str):
+        """
+        不处理该消息，对带 id 的请求直接回复错误（通知消息无需回复）.
+        """
+        try:
+            if isinstance(message, (str, bytes)):
+                data = json_codec.loads(message)
+            else:
+                data = message
+            method = data.get("method") or ""
+            id = data.get("id")
+            if id is None or method.startswith("notifications"):
+                return
+            logger.warning(f"[MCP] 拒绝处理请求: method={method}, id={id}")
+            await self._reply_error(id, reason)
+        except Exception as e:
+            logger.error(f"[MCP] 回复拒绝消息失败: {e}")
+
     async def _handle_initialize(self, id: int, params: Dict[str, Any]):
         """
         处理初始化请求.
@@ -448,9 +468,9 @@ class McpServer:
                 else:
                     continue
 
-            # 检查大小
+            # 检查大小（按实际发送的 UTF-8 字节数计算）
             tool_json = tool.to_json()
-            tool_size = len(json.dumps(tool_json))
+            tool_size = len(json_codec.dumps(tool_json).encode("utf-8"))
 
             if total_size + tool_size + 100 > max_payload_size:
                 next_cursor = tool.name
@@ -498,7 +518,7 @@ class McpServer:
         try:
             result = await tool.call(arguments)
             logger.info(f"[MCP] 工具 {tool_name} 执行成功，结果: {result}")
-            await self._reply_result(id, json.loads(result))
+            await self._reply_result(id, json_codec.loads(result))
         except Exception as e:
             logger.error(f"[MCP] 工具 {tool_name} 执行失败: {e}", exc_info=True)
             await self._reply_error(id, str(e))
@@ -527,11 +547,11 @@ class McpServer:
         """
         payload = {"jsonrpc": "2.0", "id": id, "result": result}
 
-        result_len = len(json.dumps(result))
-        logger.info(f"[MCP] 发送成功响应: ID={id}, 结果长度={result_len}")
+        message = json_codec.dumps(payload)
+        logger.info(f"[MCP] 发送成功响应: ID={id}, 消息长度={len(message)}")
 
         if self._send_callback:
-            await self._send_callback(json.dumps(payload))
+            await self._send_callback(message)
         else:
             logger.error("[MCP] 发送回调未设置!")
 
@@ -544,4 +564,4 @@ class McpServer:
         logger.error(f"[MCP] 发送错误响应: ID={id}, 错误={message}")
 
         if self._send_callback:
-            await self._send_callback(json.dumps(payload))
+            await self._send_callback(json_codec.dumps(payload))
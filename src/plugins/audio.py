@@ -1,10 +1,20 @@
 import asyncio
 import os
+import time
+from collections import deque
 from typing import Any
 
 from src.audio_codecs.audio_codec import AudioCodec
-from src.constants.constants import DeviceState, ListeningMode
+from src.audio_codecs.frame_transport import FrameTransport
+from src.constants.constants import AudioConfig, DeviceState, ListeningMode
 from src.plugins.base import Plugin
+from src.utils.config_manager import ConfigManager
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# 唤醒后等待通道打开的最长时间，超过则丢弃暂存音频（与 connect_protocol 超时一致）
+PENDING_AUDIO_TIMEOUT = 12.0
 
 # from src.utils.opus_loader import setup_opus
 # setup_opus()
@@ -18,7 +28,32 @@ class AudioPlugin(Plugin):
         self.app = None  # ApplicationExample
         self.codec: AudioCodec | None = None
         self._loop = None
-        self._send_sem = asyncio.Semaphore(4)
+        config = ConfigManager.get_instance()
+
+        # 麦克风音频发送队列：音频线程写入，单个常驻协程发送；满时丢弃最旧帧
+        send_options = config.get_config("AUDIO_OPTIONS.SEND_QUEUE", {}) or {}
+        self._send_queue = FrameTransport(
+            max(1, int(send_options.get("MAX_FRAMES", 25))), "send"
+        )
+        self._send_batch = max(1, int(send_options.get("MAX_BATCH", 4)))
+        self._send_coalesce = bool(send_options.get("COALESCE", True))
+        self._sender_task = None
+        self._queue_delays: deque = deque(maxlen=500)
+        self._send_stats = {
+            "sent": 0,
+            "batches": 0,
+            "gated": 0,  # 通道未打开或非聆听状态而丢弃的帧
+            "errors": 0,
+            "pending_dropped": 0,
+            "max_queue_delay_ms": 0.0,
+        }
+
+        # 唤醒后、通道打开（进入 LISTENING）前的麦克风音频暂存，打开后立即按序补发
+        buffer_ms = config.get_config("AUDIO_OPTIONS.PRE_OPEN_BUFFER_MS", 600)
+        frames = max(0, int(buffer_ms) // AudioConfig.FRAME_DURATION)
+        self._pending_audio: deque = deque(maxlen=frames or 1)
+        self._pending_enabled = frames > 0
+        self._pending_deadline = 0.0
 
     async def setup(self, app: Any) -> None:
         self.app = app
@@ -42,14 +77,20 @@ class AudioPlugin(Plugin):
 
     async def start(self) -> None:
         if self.codec:
+            self._ensure_sender()
             try:
                 await self.codec.start_streams()
             except Exception:
                 pass
 
     async def on_protocol_connected(self, protocol: Any) -> None:
-        # 协议连上时确保音频流已启动
+        # 发送队列深度并入协议遥测
+        telemetry = getattr(protocol, "telemetry", None)
+        if telemetry is not None:
+            telemetry.add_source("mic_send_queue", self._send_queue.qsize)
+        # 协议连上时确保音频流和发送协程已启动
         if self.codec:
+            self._ensure_sender()
             try:
                 await self.codec.start_streams()
             except Exception:
@@ -59,10 +100,10 @@ class AudioPlugin(Plugin):
         # 示例：不处理
         await asyncio.sleep(0)
 
-    async def on_incoming_audio(self, data: bytes) -> None:
+    async def on_incoming_audio(self, data: bytes, sequence: int | None = None) -> None:
         if self.codec:
             try:
-                await self.codec.write_audio(data)
+                await self.codec.write_audio(data, sequence)
             except Exception:
                 pass
 
@@ -70,6 +111,7 @@ class AudioPlugin(Plugin):
         """
         停止音频流（保留 codec 实例）
         """
+        await self._stop_sender()
         if self.codec:
             try:
                 await self.codec.stop_streams()
@@ -80,6 +122,7 @@ class AudioPlugin(Plugin):
         """
         完全关闭并释放音频资源.
         """
+        await self._stop_sender()
         if self.codec:
             try:
                 # 确保先停止流，再关闭（避免回调还在执行）
@@ -108,36 +151,144 @@ class AudioPlugin(Plugin):
     # 内部：发送麦克风音频
     # -------------------------
     def _on_encoded_audio(self, encoded_data: bytes) -> None:
-        # 音频线程回调 -> 切回主loop
+        # 音频线程回调 -> 发送队列（满时丢弃最旧帧，唤醒批量投递到主loop）
         try:
             if not self.app or not self._loop or not self.app.running:
                 return
             if self._loop.is_closed():
                 return
-            self._loop.call_soon_threadsafe(self._schedule_send_audio, encoded_data)
+            self._send_queue.put((time.monotonic(), encoded_data))
         except Exception:
             pass
 
-    def _schedule_send_audio(self, encoded_data: bytes) -> None:
-        if not self.app or not self.app.running or not self.app.protocol:
+    def _ensure_sender(self) -> None:
+        """
+        启动常驻发送协程（已在运行则忽略）.
+        """
+        if self._sender_task is None or self._sender_task.done():
+            self._sender_task = self.app.spawn(
+                self._sender_loop(), name="audio:sender"
+            )
+
+    async def _stop_sender(self) -> None:
+        if self._sender_task and not self._sender_task.done():
+            self._sender_task.cancel()
+            try:
+                await self._sender_task
+            except asyncio.CancelledError:
+                pass
+            except Exception:
+                pass
+        self._sender_task = None
+        self._send_queue.clear()
+
+    async def _sender_loop(self) -> None:
+        """常驻发送协程：按序取出编码帧，检查一次通道/设备状态后整批发送.
+
+        - 单一消费者保证发送顺序，不再为每帧创建任务
+        - 协议实现了 send_audio_batch 且开启合并时，一批帧一次交给协议
+        - 唤醒后暂存期内未就绪的帧进入 _pending_audio，就绪后先于新帧发出
+        """
+        queue = self._send_queue
+        while True:
+            batch = await queue.get_batch(self._send_batch)
+            now = time.monotonic()
+            frames = []
+            for enqueued_at, data in batch:
+                self._record_queue_delay((now - enqueued_at) * 1000)
+                frames.append(data)
+
+            try:
+                protocol = self.app.protocol if self.app else None
+                ready = (
+                    protocol is not None
+                    and protocol.is_audio_channel_opened()
+                    and self._should_send_microphone_audio()
+                )
+                if not ready:
+                    if not self._buffer_pending_audio(frames, now):
+                        self._send_stats["gated"] += len(frames)
+                    continue
+
+                # 首次就绪即结束暂存期（无论是否有暂存帧），否则之后说话/播放
+                # 期间的麦克风音频（含 TTS 回声）会被存下并在下次聆听时补发
+                if self._pending_deadline:
+                    frames = self._take_pending_audio(now) + frames
+
+                if self._send_coalesce and len(frames) > 1:
+                    await protocol.send_audio_batch(frames)
+                else:
+                    for data in frames:
+                        await protocol.send_audio(data)
+                self._send_stats["sent"] += len(frames)
+                self._send_stats["batches"] += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._send_stats["errors"] += 1
+                logger.debug(f"发送麦克风音频失败: {e}")
+
+    def _record_queue_delay(self, delay_ms: float) -> None:
+        self._queue_delays.append(delay_ms)
+        if delay_ms > self._send_stats["max_queue_delay_ms"]:
+            self._send_stats["max_queue_delay_ms"] = delay_ms
+
+    def arm_pending_audio(self) -> None:
+        """开始暂存麦克风音频（检测到唤醒词时调用）.
+
+        通道打开并进入 LISTENING 之前的编码帧先存入有界队列（满时丢弃最旧的），
+        随后与实时音频按序一起发出，避免唤醒后、握手完成前说的话被丢掉。
+        """
+        if not self._pending_enabled:
             return
+        self._pending_audio.clear()
+        self._pending_deadline = time.monotonic() + PENDING_AUDIO_TIMEOUT
 
-        async def _send():
-            async with self._send_sem:
-                # 仅在允许的设备状态下发送麦克风音频
-                try:
-                    if not (
-                        self.app.protocol
-                        and self.app.protocol.is_audio_channel_opened()
-                    ):
-                        return
-                    if self._should_send_microphone_audio():
-                        await self.app.protocol.send_audio(encoded_data)
-                except Exception:
-                    pass
+    def _buffer_pending_audio(self, frames: list, now: float) -> bool:
+        """
+        暂存未能立即发送的帧；未处于暂存期或已超时时返回 False.
+        """
+        if self._pending_deadline == 0.0:
+            return False
+        if now > self._pending_deadline:
+            logger.debug(
+                f"唤醒后通道未及时打开，丢弃暂存音频 {len(self._pending_audio)} 帧"
+            )
+            self._pending_deadline = 0.0
+            self._pending_audio.clear()
+            return False
+        for data in frames:
+            if len(self._pending_audio) == self._pending_audio.maxlen:
+                self._send_stats["pending_dropped"] += 1
+            self._pending_audio.append(data)
+        return True
+
+    def _take_pending_audio(self, now: float) -> list:
+        """
+        通道就绪时结束暂存期并取出暂存帧；已超过期限的暂存帧丢弃不发.
+        """
+        expired = now > self._pending_deadline
+        self._pending_deadline = 0.0
+        frames = [] if expired else list(self._pending_audio)
+        if expired and self._pending_audio:
+            self._send_stats["pending_dropped"] += len(self._pending_audio)
+            logger.debug(f"暂存音频已超过期限，丢弃 {len(self._pending_audio)} 帧")
+        self._pending_audio.clear()
+        return frames
 
-        # 交给应用的任务管理
-        self.app.spawn(_send(), name="audio:send")
+    def get_send_stats(self) -> dict:
+        """
+        麦克风音频发送统计：排队延迟分位数、发送/丢弃计数、发送队列状态.
+        """
+        delays = sorted(self._queue_delays)
+        stats = dict(self._send_stats)
+        if delays:
+            stats["queue_delay_p50_ms"] = round(delays[len(delays) // 2], 2)
+            stats["queue_delay_p95_ms"] = round(delays[int(len(delays) * 0.95)], 2)
+        stats["max_queue_delay_ms"] = round(stats["max_queue_delay_ms"], 2)
+        stats["pending"] = len(self._pending_audio)
+        stats["queue"] = self._send_queue.get_stats()
+        return stats
 
     def _should_send_microphone_audio(self) -> bool:
         """与应用状态机对齐：
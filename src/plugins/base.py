@@ -37,9 +37,9 @@ class Plugin:
         """
         await asyncio.sleep(0)
 
-    async def on_incoming_audio(self, data: bytes) -> None:
+    async def on_incoming_audio(self, data: bytes, sequence: int | None = None) -> None:
         """
-        收到音频数据时的通知。
+        收到音频数据时的通知。sequence 为传输层携带的包序列号（可能为 None）。
         """
         await asyncio.sleep(0)
 
@@ -49,6 +49,12 @@ class Plugin:
         """
         await asyncio.sleep(0)
 
+    async def on_dispatch_dropped(self, hook: str, args: tuple) -> None:
+        """
+        某次广播因本插件积压或卡住未被处理时的通知（hook 为钩子名，args 为参数）。
+        """
+        await asyncio.sleep(0)
+
     async def stop(self) -> None:
         """
         插件停止（在应用 shutdown 前调用）。
@@ -1,16 +1,140 @@
+import asyncio
+import bisect
+import time
+from collections import deque
 from typing import Any, List
 
+from src.utils.logging_config import get_logger
+
 from .base import Plugin
 
+logger = get_logger(__name__)
+
+# 延迟直方图桶上界（毫秒），最后一个桶为超出上界的部分
+LATENCY_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000)
+
+# 广播类钩子：各插件之间无顺序要求，可并发分发并受超时约束
+_HOOK_NAMES = (
+    "on_protocol_connected",
+    "on_incoming_json",
+    "on_incoming_audio",
+    "on_device_state_changed",
+)
+
+
+class HookStats:
+    """
+    单个插件单个钩子的调用统计：次数、失败、超时、耗时直方图.
+    """
+
+    __slots__ = ("calls", "errors", "timeouts", "total_ms", "max_ms", "buckets")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def record(self, elapsed_ms: float, error: bool = False):
+        self.calls += 1
+        if error:
+            self.errors += 1
+        self.total_ms += elapsed_ms
+        if elapsed_ms > self.max_ms:
+            self.max_ms = elapsed_ms
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+
+    def percentile(self, pct: float) -> float | None:
+        """
+        按直方图估算分位数，返回所在桶的上界（最后一个桶返回最大值）.
+        """
+        if not self.calls:
+            return None
+        target = self.calls * pct / 100
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= target and count:
+                if index < len(LATENCY_BUCKETS_MS):
+                    return float(LATENCY_BUCKETS_MS[index])
+                break
+        return round(self.max_ms, 3)
+
+    def snapshot(self) -> dict:
+        labels = [f"<={b}ms" for b in LATENCY_BUCKETS_MS] + [
+            f">{LATENCY_BUCKETS_MS[-1]}ms"
+        ]
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "avg_ms": round(self.total_ms / self.calls, 3) if self.calls else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "histogram": {
+                label: count for label, count in zip(labels, self.buckets) if count
+            },
+        }
+
 
 class PluginManager:
     """
     轻量插件管理器：统一setup/start/stop/shutdown广播；错误隔离。
+
+    广播类钩子（协议连接、JSON、音频、设备状态）只分发给覆写了该钩子的插件；
+    开启并发分发时各插件同时执行，单个插件变慢不会拖住其它插件；同一插件的
+    调用排在它上一次未完成的调用之后，始终按分发顺序执行。每个插件有处理时限，
+    超时后不再等待（不取消，避免中断进行中的工具调用）并计一次超时，一段时间窗
+    内超时次数达到阈值的插件被隔离一段时间，期间不再收到广播。
+
+    上一次调用已超出时限仍未结束时，新的调用不再排队而是直接跳过并计一次超时，
+    卡死的插件因此很快被隔离；排队的调用数也有上限，超出的调用被丢弃并通过
+    on_dispatch_dropped 通知插件。豁免隔离的插件（默认 mcp，跳过消息会丢失
+    工具调用请求）只计超时、照常排队，仅在超出排队上限时被丢弃。
     """
 
-    def __init__(self) -> None:
+    def __init__(self, options: dict | None = None) -> None:
         self._plugins: List[Plugin] = []
         self._by_name: dict[str, Plugin] = {}
+        # 钩子名 -> 覆写了该钩子的插件；基类实现只让出一次事件循环，无需调用
+        self._subscribers: dict[str, List[Plugin]] = {h: [] for h in _HOOK_NAMES}
+        self._stats: dict[str, dict[str, HookStats]] = {}
+        self._strikes: dict[str, deque] = {}  # 插件名 -> 时间窗内的超时时刻
+        self._quarantined_until: dict[str, float] = {}
+        self._quarantines: dict[str, int] = {}
+        self._skipped: dict[str, int] = {}
+        self._overrunning: set[asyncio.Task] = set()
+        # 插件名 -> 最近一次尚未完成的调用，新调用排在其后执行
+        self._pending: dict[str, asyncio.Task] = {}
+        self._backlog: dict[str, int] = {}  # 插件名 -> 尚未完成的调用数
+        self._dropped: dict[str, int] = {}
+
+        if options is None:
+            try:
+                from src.utils.config_manager import ConfigManager
+
+                options = (
+                    ConfigManager.get_instance().get_config("PLUGIN_OPTIONS", {})
+                    or {}
+                )
+            except Exception:
+                options = {}
+        self._concurrent = bool(options.get("CONCURRENT_DISPATCH", True))
+        self._default_timeout = float(options.get("HOOK_TIMEOUT", 2.0))
+        self._timeouts = {
+            str(name): float(seconds)
+            for name, seconds in (options.get("TIMEOUTS") or {}).items()
+        }
+        self._quarantine_strikes = max(0, int(options.get("QUARANTINE_STRIKES", 3)))
+        self._quarantine_window = float(options.get("QUARANTINE_WINDOW", 60.0))
+        self._quarantine_seconds = float(options.get("QUARANTINE_SECONDS", 30.0))
+        self._quarantine_exempt = {
+            str(name) for name in (options.get("QUARANTINE_EXEMPT", ["mcp"]) or [])
+        }
+        self._max_queued = max(0, int(options.get("MAX_QUEUED_CALLS", 32)))
 
     def register(self, *plugins: Plugin) -> None:
         for p in plugins:
@@ -22,6 +146,9 @@ class PluginManager:
                         self._by_name[name] = p
                 except Exception:
                     pass
+                for hook, subscribers in self._subscribers.items():
+                    if getattr(type(p), hook, None) is not getattr(Plugin, hook):
+                        subscribers.append(p)
 
     def get_plugin(self, name: str) -> Plugin | None:
         """
@@ -48,32 +175,33 @@ class PluginManager:
                 pass
 
     async def notify_protocol_connected(self, protocol: Any) -> None:
-        for p in list(self._plugins):
-            try:
-                p.on_protocol_connected and await p.on_protocol_connected(protocol)
-            except Exception:
-                pass
+        await self._dispatch("on_protocol_connected", protocol)
 
     async def notify_incoming_json(self, message: Any) -> None:
-        for p in list(self._plugins):
-            try:
-                await p.on_incoming_json(message)
-            except Exception:
-                pass
+        await self._dispatch("on_incoming_json", message)
 
-    async def notify_incoming_audio(self, data: bytes) -> None:
-        for p in list(self._plugins):
+    async def notify_incoming_audio(
+        self, data: bytes, sequence: int | None = None
+    ) -> None:
+        """
+        逐帧调用，不创建任务：按注册顺序直接 await，超出时限只在事后计入超时.
+        """
+        for p in self._subscribers["on_incoming_audio"]:
+            if self._is_quarantined(p):
+                continue
+            started = time.perf_counter()
+            error = False
             try:
-                await p.on_incoming_audio(data)
+                await p.on_incoming_audio(data, sequence)
             except Exception:
-                pass
+                error = True
+            elapsed = time.perf_counter() - started
+            self._hook_stats(p, "on_incoming_audio").record(elapsed * 1000, error)
+            if elapsed > self._timeout_for(p):
+                self._on_timeout(p, "on_incoming_audio")
 
     async def notify_device_state_changed(self, state: Any) -> None:
-        for p in list(self._plugins):
-            try:
-                await p.on_device_state_changed(state)
-            except Exception:
-                pass
+        await self._dispatch("on_device_state_changed", state)
 
     async def stop_all(self) -> None:
         # 逆序更稳妥
@@ -89,3 +217,169 @@ class PluginManager:
                 await p.shutdown()
             except Exception:
                 pass
+        # 取消仍在后台运行的超时调用
+        for task in list(self._overrunning):
+            task.cancel()
+        if self._overrunning:
+            await asyncio.gather(*self._overrunning, return_exceptions=True)
+
+    # -------------------------
+    # 内部：钩子分发
+    # -------------------------
+    async def _dispatch(self, hook: str, *args) -> None:
+        targets = [p for p in self._subscribers[hook] if not self._is_quarantined(p)]
+        if not targets:
+            return
+        if self._concurrent and len(targets) > 1:
+            await asyncio.gather(*(self._call(p, hook, args) for p in targets))
+        else:
+            for p in targets:
+                await self._call(p, hook, args)
+
+    async def _call(self, p: Plugin, hook: str, args: tuple) -> None:
+        """
+        调用一个插件的钩子，超时后停止等待并让其在后台完成.
+        """
+        name = p.name
+        previous = self._pending.get(name)
+        exempt = name in self._quarantine_exempt
+        if previous is not None and previous in self._overrunning and not exempt:
+            # 上一次调用已超时仍未结束，排队只会再等满时限：直接跳过并计一次超时
+            self._on_timeout(p, hook)
+            await self._drop(p, hook, args)
+            return
+        if self._backlog.get(name, 0) > self._max_queued:
+            logger.warning(
+                f"插件 {name} 积压 {self._backlog[name]} 个调用，丢弃本次 {hook}"
+            )
+            await self._drop(p, hook, args)
+            return
+
+        task = asyncio.ensure_future(self._invoke(previous, p, hook, args))
+        self._pending[name] = task
+        self._backlog[name] = self._backlog.get(name, 0) + 1
+        task.add_done_callback(lambda t: self._call_finished(name, t))
+        done, _ = await asyncio.wait({task}, timeout=self._timeout_for(p))
+        if done:
+            return
+
+        # 每次未在时限内完成都计入，包括仍在等上一次调用的情况
+        self._on_timeout(p, hook)
+        self._overrunning.add(task)
+
+    async def _drop(self, p: Plugin, hook: str, args: tuple) -> None:
+        """
+        丢弃一次调用并通知插件（如 MCP 回复错误，避免服务端一直等待）.
+        """
+        self._dropped[p.name] = self._dropped.get(p.name, 0) + 1
+        try:
+            await asyncio.wait_for(
+                p.on_dispatch_dropped(hook, args), self._timeout_for(p)
+            )
+        except Exception:
+            pass
+
+    async def _invoke(
+        self, previous: asyncio.Task | None, p: Plugin, hook: str, args: tuple
+    ) -> None:
+        """
+        等上一次调用结束后执行钩子并记录耗时.
+        """
+        if previous is not None and not previous.done():
+            await asyncio.wait({previous})
+        started = time.perf_counter()
+        error = False
+        try:
+            await getattr(p, hook)(*args)
+        except Exception:
+            error = True
+        self._hook_stats(p, hook).record((time.perf_counter() - started) * 1000, error)
+
+    def _call_finished(self, name: str, task: asyncio.Task) -> None:
+        self._overrunning.discard(task)
+        self._backlog[name] -= 1
+        if self._pending.get(name) is task:
+            del self._pending[name]
+
+    def _timeout_for(self, p: Plugin) -> float:
+        return self._timeouts.get(p.name, self._default_timeout)
+
+    def _hook_stats(self, p: Plugin, hook: str) -> HookStats:
+        hooks = self._stats.setdefault(p.name, {})
+        stats = hooks.get(hook)
+        if stats is None:
+            stats = hooks[hook] = HookStats()
+        return stats
+
+    def _on_timeout(self, p: Plugin, hook: str) -> None:
+        self._hook_stats(p, hook).timeouts += 1
+        if p.name in self._quarantine_exempt:
+            logger.warning(
+                f"插件 {p.name}.{hook} 超出处理时限 {self._timeout_for(p)}s（不隔离）"
+            )
+            return
+        now = time.monotonic()
+        if self._quarantined_until.get(p.name, 0.0) > now:
+            # 已在隔离中（隔离前已分发的调用陆续超时），不再累计
+            return
+        strikes = self._strikes.setdefault(p.name, deque())
+        strikes.append(now)
+        while strikes and now - strikes[0] > self._quarantine_window:
+            strikes.popleft()
+        logger.warning(
+            f"插件 {p.name}.{hook} 超出处理时限 {self._timeout_for(p)}s"
+            f"（{self._quarantine_window:g}s 内第 {len(strikes)} 次）"
+        )
+        if self._quarantine_strikes and len(strikes) >= self._quarantine_strikes:
+            strikes.clear()
+            self._quarantined_until[p.name] = now + self._quarantine_seconds
+            self._quarantines[p.name] = self._quarantines.get(p.name, 0) + 1
+            logger.warning(
+                f"插件 {p.name} 多次超时，隔离 {self._quarantine_seconds}s，"
+                f"期间不再分发广播"
+            )
+
+    def _is_quarantined(self, p: Plugin) -> bool:
+        until = self._quarantined_until.get(p.name)
+        if until is None:
+            return False
+        if time.monotonic() >= until:
+            del self._quarantined_until[p.name]
+            logger.info(f"插件 {p.name} 隔离结束，恢复分发")
+            return False
+        self._skipped[p.name] = self._skipped.get(p.name, 0) + 1
+        return True
+
+    # -------------------------
+    # 统计
+    # -------------------------
+    def get_stats(self) -> dict:
+        """
+        各插件各钩子的调用次数、失败、超时和耗时直方图，以及隔离状态.
+        """
+        result = {}
+        for p in self._plugins:
+            name = p.name
+            result[name] = {
+                "timeout_s": self._timeout_for(p),
+                "quarantined": name in self._quarantined_until,
+                "quarantines": self._quarantines.get(name, 0),
+                "skipped": self._skipped.get(name, 0),
+                "dropped": self._dropped.get(name, 0),
+                "backlog": self._backlog.get(name, 0),
+                "hooks": {
+                    hook: stats.snapshot()
+                    for hook, stats in self._stats.get(name, {}).items()
+                },
+            }
+        return result
+
+    def get_audio_stats(self) -> dict:
+        """
+        各插件处理收到音频的统计（get_stats 中 on_incoming_audio 部分）.
+        """
+        return {
+            name: hooks["on_incoming_audio"].snapshot()
+            for name, hooks in self._stats.items()
+            if "on_incoming_audio" in hooks
+        }
@@ -58,6 +58,23 @@ class McpPlugin(Plugin):
         except Exception:
             pass
 
+    async def on_dispatch_dropped(self, hook: str, args: tuple) -> None:
+        # 积压过多未处理的请求直接回复错误，避免服务端一直等待工具调用结果
+        if hook != "on_incoming_json" or not args:
+            return
+        message = args[0]
+        if not isinstance(message, dict) or message.get("type") != "mcp":
+            return
+        payload = message.get("payload")
+        if not payload:
+            return
+        try:
+            if self._server is None:
+                self._server = McpServer.get_instance()
+            await self._server.reject_message(payload, "客户端繁忙，请求未处理")
+        except Exception:
+            pass
+
     async def shutdown(self) -> None:
         # 可选：解除回调引用，帮助GC
         try:
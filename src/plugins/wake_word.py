@@ -133,6 +133,10 @@ class WakeWordPlugin(Plugin):
                 if self.app.is_speaking():
                     await self.app.abort_speaking(AbortReason.WAKE_WORD_DETECTED)
                 else:
+                    # 通道打开前先暂存唤醒后的音频，打开后立即补发
+                    audio_plugin = self.app.plugins.get_plugin("audio")
+                    if audio_plugin and hasattr(audio_plugin, "arm_pending_audio"):
+                        audio_plugin.arm_pending_audio()
                     await self.app.start_auto_conversation()
                 # 打断后清理一下队列
                 try:
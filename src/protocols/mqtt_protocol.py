@@ -1,21 +1,23 @@
 import asyncio
-import json
-import socket
-import threading
 import time
 
 import paho.mqtt.client as mqtt
-from cryptography.hazmat.backends import default_backend
-from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 
 from src.constants.constants import AudioConfig
+from src.protocols.packet_cipher import PacketCipher
 from src.protocols.protocol import Protocol
+from src.protocols.sequence_tracker import SequenceTracker
+from src.protocols.udp_channel import UdpAudioChannel
+from src.utils import json_codec
 from src.utils.config_manager import ConfigManager
 from src.utils.logging_config import get_logger
 
 # 配置日志
 logger = get_logger(__name__)
 
+# 单条控制消息等待发布完成的最长时间（秒）
+PUBLISH_TIMEOUT = 10.0
+
 
 class MqttProtocol(Protocol):
     def __init__(self, loop):
@@ -23,16 +25,10 @@ class MqttProtocol(Protocol):
         self.loop = loop
         self.config = ConfigManager.get_instance()
         self.mqtt_client = None
-        self.udp_socket = None
-        self.udp_thread = None
-        self.udp_running = False
+        self.udp_channel: UdpAudioChannel | None = None
         self.connected = False
 
         # 连接状态监控
-        self._is_closing = False
-        self._reconnect_attempts = 0
-        self._max_reconnect_attempts = 0  # 默认不重连
-        self._auto_reconnect_enabled = False  # 默认关闭自动重连
         self._connection_monitor_task = None
         self._last_activity_time = None
         self._keep_alive_interval = 60  # MQTT保活间隔（秒）
@@ -53,6 +49,24 @@ class MqttProtocol(Protocol):
         self.aes_nonce = None
         self.local_sequence = 0
         self.remote_sequence = 0
+        self._packet_cipher: PacketCipher | None = None
+
+        # 接收端序列号跟踪：去重、小窗口重排、丢包/乱序/抖动统计
+        self._sequence_tracker = SequenceTracker(AudioConfig.FRAME_DURATION)
+        self._reorder_flush_handle: asyncio.TimerHandle | None = None
+
+        # 控制消息异步发布：on_publish 按 mid 完成对应 future，在途数量有上限
+        max_inflight = self.config.get_config(
+            "SYSTEM_OPTIONS.NETWORK.MQTT_MAX_INFLIGHT", 8
+        )
+        self._publish_slots = asyncio.Semaphore(max(1, int(max_inflight)))
+        self._publish_futures: dict[int, asyncio.Future] = {}
+        self._publish_stats = {
+            "published": 0,
+            "failed": 0,
+            "timeouts": 0,
+            "max_wait_ms": 0.0,
+        }
 
         # 事件
         self.server_hello_event = asyncio.Event()
@@ -97,6 +111,7 @@ class MqttProtocol(Protocol):
 
         # 重置hello事件
         self.server_hello_event = asyncio.Event()
+        self.telemetry.mark_connect_start()
 
         # 首先尝试获取MQTT配置
         try:
@@ -136,6 +151,7 @@ class MqttProtocol(Protocol):
 
         # 如果已有MQTT客户端，先断开连接
         if self.mqtt_client:
+            self._fail_pending_publishes("MQTT客户端已重建")
             try:
                 self.mqtt_client.loop_stop()
                 self.mqtt_client.disconnect()
@@ -156,8 +172,11 @@ class MqttProtocol(Protocol):
                 await self._on_network_error(f"解析endpoint失败: {e}")
             return False
 
-        # 创建新的MQTT客户端
-        self.mqtt_client = mqtt.Client(client_id=self.client_id)
+        # 创建新的MQTT客户端；断线重连由 ReconnectPolicy 统一调度，关闭 paho 网络线程
+        # 内置的无抖动重连，避免大量设备同步重连
+        self.mqtt_client = mqtt.Client(
+            client_id=self.client_id, reconnect_on_failure=False
+        )
         self.mqtt_client.username_pw_set(self.username, self.password)
 
         # 根据端口决定是否配置TLS加密连接
@@ -198,8 +217,9 @@ class MqttProtocol(Protocol):
         def on_message_callback(client, userdata, msg):
             try:
                 self._last_activity_time = time.time()  # 更新活动时间
-                payload = msg.payload.decode("utf-8")
-                self._handle_mqtt_message(payload)
+                self.telemetry.record_message_in(len(msg.payload))
+                # 直接解析原始字节，省去一次 UTF-8 解码
+                self._handle_mqtt_message(msg.payload)
             except Exception as e:
                 logger.error(f"处理MQTT消息时出错: {e}")
 
@@ -220,6 +240,11 @@ class MqttProtocol(Protocol):
                 was_connected = self.connected
                 self.connected = False
 
+                # 未完成的发布不会再收到 on_publish，立即以失败结束
+                self.loop.call_soon_threadsafe(
+                    self._fail_pending_publishes, f"MQTT连接断开(rc={rc})"
+                )
+
                 # 通知连接状态变化
                 if self._on_connection_state_changed and was_connected:
                     reason = "正常断开" if rc == 0 else f"异常断开(rc={rc})"
@@ -227,21 +252,13 @@ class MqttProtocol(Protocol):
                         lambda: self._on_connection_state_changed(False, reason)
                     )
 
-                # 停止UDP接收线程
-                self._stop_udp_receiver()
+                # 关闭UDP音频通道（transport 只能在事件循环线程操作）
+                self.loop.call_soon_threadsafe(self._stop_udp_receiver)
 
-                # 只有在异常断开且启用自动重连时才尝试重连
-                if (
-                    rc != 0
-                    and not self._is_closing
-                    and self._auto_reconnect_enabled
-                    and self._reconnect_attempts < self._max_reconnect_attempts
-                ):
-                    # 在事件循环中安排重连
+                # 只有在异常断开且启用自动重连时才尝试重连（断开事件直接触发）
+                if rc != 0 and not self._is_closing and self._auto_reconnect_enabled:
                     self.loop.call_soon_threadsafe(
-                        lambda: asyncio.create_task(
-                            self._attempt_reconnect(f"MQTT断开(rc={rc})")
-                        )
+                        self._start_reconnect, f"MQTT断开(rc={rc})"
                     )
                 else:
                     # 通知音频通道关闭
@@ -252,14 +269,9 @@ class MqttProtocol(Protocol):
 
                     # 通知网络错误
                     if rc != 0 and self._on_network_error:
-                        error_msg = f"MQTT连接断开: {rc}"
-                        if (
-                            self._auto_reconnect_enabled
-                            and self._reconnect_attempts >= self._max_reconnect_attempts
-                        ):
-                            error_msg += " (重连失败)"
-                        self.loop.call_soon_threadsafe(
-                            lambda: self._on_network_error(error_msg)
+                        asyncio.run_coroutine_threadsafe(
+                            self._notify_network_error(f"MQTT连接断开: {rc}"),
+                            self.loop,
                         )
 
             except Exception as e:
@@ -267,9 +279,10 @@ class MqttProtocol(Protocol):
 
         def on_publish_callback(client, userdata, mid):
             """
-            MQTT消息发布回调.
+            MQTT消息发布回调（网络线程），转到事件循环完成对应的 future.
             """
             self._last_activity_time = time.time()  # 更新活动时间
+            self.loop.call_soon_threadsafe(self._resolve_publish, mid)
 
         def on_subscribe_callback(client, userdata, mid, granted_qos):
             """
@@ -320,7 +333,7 @@ class MqttProtocol(Protocol):
             }
 
             # 发送消息并等待响应
-            if not await self.send_text(json.dumps(hello_message)):
+            if not await self.send_text(json_codec.dumps(hello_message)):
                 logger.error("发送hello消息失败")
                 return False
 
@@ -332,26 +345,17 @@ class MqttProtocol(Protocol):
                     await self._on_network_error("等待响应超时")
                 return False
 
-            # 创建UDP套接字
+            # 创建UDP音频通道（收发都在事件循环中完成）
             try:
-                if self.udp_socket:
-                    self.udp_socket.close()
-
-                self.udp_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-                self.udp_socket.settimeout(0.5)
-
-                # 启动UDP接收线程
-                if self.udp_thread and self.udp_thread.is_alive():
-                    self.udp_running = False
-                    self.udp_thread.join(1.0)
-
-                self.udp_running = True
-                self.udp_thread = threading.Thread(target=self._udp_receive_thread)
-                self.udp_thread.daemon = True
-                self.udp_thread.start()
+                self._stop_udp_receiver()
+                self.udp_channel = await UdpAudioChannel.open(
+                    self.udp_server, self.udp_port, self._on_udp_datagrams
+                )
+                logger.info(f"UDP音频通道已打开: {self.udp_server}:{self.udp_port}")
 
                 self.connected = True
-                self._reconnect_attempts = 0  # 重置重连计数
+                self._reconnect_policy.record_success()
+                self._start_telemetry_log()
 
                 # 通知连接状态变化
                 if self._on_connection_state_changed:
@@ -375,7 +379,7 @@ class MqttProtocol(Protocol):
         处理MQTT消息.
         """
         try:
-            data = json.loads(payload)
+            data = json_codec.loads(payload)
             msg_type = data.get("type")
 
             if msg_type == "goodbye":
@@ -407,16 +411,24 @@ class MqttProtocol(Protocol):
                 self.udp_port = udp.get("port")
                 self.aes_key = udp.get("key")
                 self.aes_nonce = udp.get("nonce")
+                try:
+                    # 每个会话只解析一次密钥和nonce模板
+                    self._packet_cipher = PacketCipher(self.aes_key, self.aes_nonce)
+                except Exception as e:
+                    logger.error(f"UDP加密参数无效: {e}")
+                    return
 
                 # 重置序列号
                 self.local_sequence = 0
                 self.remote_sequence = 0
+                self.loop.call_soon_threadsafe(self._sequence_tracker.reset)
 
                 logger.info(
                     f"收到服务器hello响应，UDP服务器: {self.udp_server}:{self.udp_port}"
                 )
 
                 # 设置hello事件
+                self.telemetry.mark_hello()
                 self.loop.call_soon_threadsafe(self.server_hello_event.set)
 
                 # 触发音频通道打开回调
@@ -438,76 +450,62 @@ class MqttProtocol(Protocol):
                             self._on_incoming_json(json_data)
 
                     self.loop.call_soon_threadsafe(process_json)
-        except json.JSONDecodeError:
+        except json_codec.JSONDecodeError:
             logger.error(f"无效的JSON数据: {payload}")
         except Exception as e:
             logger.error(f"处理MQTT消息时出错: {e}")
 
-    def _udp_receive_thread(self):
-        """UDP接收线程.
+    def _on_udp_datagrams(self, packets: list):
+        """处理一批UDP音频数据包（事件循环线程）.
 
-        参考 audio_player.py 的实现方式
+        每包格式：16字节nonce（最后4字节为大端序列号）+ AES-CTR 加密的 Opus 帧
         """
-        logger.info(
-            f"UDP接收线程已启动，监听来自 {self.udp_server}:{self.udp_port} 的数据"
-        )
+        cipher = self._packet_cipher
+        if not self._on_incoming_audio or cipher is None:
+            return
 
-        self.udp_running = True
-        debug_counter = 0
-
-        while self.udp_running:
+        tracker = self._sequence_tracker
+        now = time.monotonic()
+        for data in packets:
             try:
-                data, addr = self.udp_socket.recvfrom(4096)
-                debug_counter += 1
-
-                try:
-                    # 验证数据包
-                    if len(data) < 16:  # 至少需要16字节的nonce
-                        logger.error(f"无效的音频数据包大小: {len(data)}")
-                        continue
-
-                    # 分离nonce和加密数据
-                    received_nonce = data[:16]
-                    encrypted_audio = data[16:]
-
-                    # 使用AES-CTR解密
-                    decrypted = self.aes_ctr_decrypt(
-                        bytes.fromhex(self.aes_key), received_nonce, encrypted_audio
-                    )
-
-                    # 调试信息
-                    if debug_counter % 100 == 0:
-                        logger.debug(
-                            f"已解密音频数据包 #{debug_counter}, 大小: {len(decrypted)} 字节"
-                        )
-
-                    # 处理解密后的音频数据
-                    if self._on_incoming_audio:
-
-                        def process_audio(audio_data=decrypted):
-                            if asyncio.iscoroutinefunction(self._on_incoming_audio):
-                                coro = self._on_incoming_audio(audio_data)
-                                if coro is not None:
-                                    asyncio.create_task(coro)
-                            else:
-                                self._on_incoming_audio(audio_data)
-
-                        self.loop.call_soon_threadsafe(process_audio)
+                sequence, decrypted = cipher.decrypt(data)
+            except Exception as e:
+                logger.error(f"处理音频数据包错误: {e}")
+                continue
+            self.telemetry.record_audio_in(len(data))
+            # 重复/迟到的包被丢弃，乱序的包补齐后按序交出
+            self._deliver_audio(tracker.push(sequence, decrypted, now))
+
+        if tracker.has_pending() and self._reorder_flush_handle is None:
+            self._reorder_flush_handle = self.loop.call_later(
+                tracker.hold_ms / 1000, self._flush_reordered_audio
+            )
 
-                except Exception as e:
-                    logger.error(f"处理音频数据包错误: {e}")
-                    continue
+    def _flush_reordered_audio(self):
+        """
+        缺口等待超时：放弃缺失的包，交出其后已到达的包.
+        """
+        self._reorder_flush_handle = None
+        tracker = self._sequence_tracker
+        self._deliver_audio(tracker.flush_expired())
+        if tracker.has_pending():
+            self._reorder_flush_handle = self.loop.call_later(
+                tracker.hold_ms / 1000, self._flush_reordered_audio
+            )
 
-            except socket.timeout:
-                # 超时是正常的，继续循环
-                pass
+    def _deliver_audio(self, ready: list):
+        if not ready or not self._on_incoming_audio:
+            return
+        is_coroutine = asyncio.iscoroutinefunction(self._on_incoming_audio)
+        for sequence, audio in ready:
+            self.remote_sequence = sequence
+            try:
+                if is_coroutine:
+                    self.loop.create_task(self._on_incoming_audio(audio, sequence))
+                else:
+                    self._on_incoming_audio(audio, sequence)
             except Exception as e:
-                logger.error(f"UDP接收线程错误: {e}")
-                if not self.udp_running:
-                    break
-                time.sleep(0.1)  # 避免在错误情况下过度消耗CPU
-
-        logger.info("UDP接收线程已停止")
+                logger.error(f"处理音频数据包错误: {e}")
 
     async def send_text(self, message):
         """
@@ -517,54 +515,90 @@ class MqttProtocol(Protocol):
             logger.error("MQTT客户端未初始化")
             return False
 
-        try:
-            result = self.mqtt_client.publish(self.publish_topic, message)
-            result.wait_for_publish()
+        # 不阻塞事件循环：publish 只负责入队，完成由 on_publish 回调通知
+        async with self._publish_slots:
+            started = time.monotonic()
+            mid = None
+            try:
+                result = self.mqtt_client.publish(self.publish_topic, message)
+                if result.rc != mqtt.MQTT_ERR_SUCCESS:
+                    raise RuntimeError(mqtt.error_string(result.rc))
+                mid = result.mid
+                future = self.loop.create_future()
+                self._publish_futures[mid] = future
+                await asyncio.wait_for(future, timeout=PUBLISH_TIMEOUT)
+            except asyncio.TimeoutError:
+                self._publish_futures.pop(mid, None)
+                self._publish_stats["timeouts"] += 1
+                logger.warning(f"MQTT消息发布超时({PUBLISH_TIMEOUT}秒)，mid={mid}")
+                return False
+            except ConnectionError as e:
+                # 连接断开导致的失败由断开处理流程统一上报
+                self._publish_stats["failed"] += 1
+                logger.warning(f"MQTT消息未发布完成: {e}")
+                return False
+            except Exception as e:
+                self._publish_futures.pop(mid, None)
+                self._publish_stats["failed"] += 1
+                logger.error(f"发送MQTT消息失败: {e}")
+                if self._on_network_error:
+                    await self._on_network_error(f"发送MQTT消息失败: {e}")
+                return False
+
+            wait_ms = (time.monotonic() - started) * 1000
+            self._publish_stats["published"] += 1
+            self.telemetry.record_message_out(
+                len(message.encode()) if isinstance(message, str) else len(message)
+            )
+            if wait_ms > self._publish_stats["max_wait_ms"]:
+                self._publish_stats["max_wait_ms"] = wait_ms
             return True
-        except Exception as e:
-            logger.error(f"发送MQTT消息失败: {e}")
-            if self._on_network_error:
-                await self._on_network_error(f"发送MQTT消息失败: {e}")
-            return False
+
+    def _resolve_publish(self, mid: int):
+        """
+        on_publish 到达（事件循环线程）：完成对应的发布 future.
+        """
+        future = self._publish_futures.pop(mid, None)
+        if future and not future.done():
+            future.set_result(None)
+
+    def _fail_pending_publishes(self, reason: str):
+        """
+        连接断开或客户端重建时，让所有在途发布立即失败，不必等到超时.
+        """
+        futures = list(self._publish_futures.values())
+        self._publish_futures.clear()
+        for future in futures:
+            if not future.done():
+                future.set_exception(ConnectionError(reason))
 
     async def send_audio(self, audio_data):
         """发送音频数据.
 
         参考 audio_sender.py 的实现方式
         """
-        if not self.udp_socket or not self.udp_server or not self.udp_port:
+        if not self.udp_channel or self.udp_channel.closed:
             logger.error("UDP通道未初始化")
             return False
+        if self._packet_cipher is None:
+            logger.error("UDP加密参数未初始化")
+            return False
 
         try:
-            # 生成新的nonce (类似于 audio_sender.py 中的实现)
-            # 格式: 0x01 (1字节) + 0x00 (3字节) + 长度 (2字节) + 原始nonce (8字节) + 序列号 (8字节)
+            # nonce: 模板前缀(2字节) + 长度(2字节) + 模板(8字节) + 序列号(4字节)
             self.local_sequence = (self.local_sequence + 1) & 0xFFFFFFFF
-            new_nonce = (
-                self.aes_nonce[:4]  # 固定前缀
-                + format(len(audio_data), "04x")  # 数据长度
-                + self.aes_nonce[8:24]  # 原始nonce
-                + format(self.local_sequence, "08x")  # 序列号
-            )
-
-            encrypt_encoded_data = self.aes_ctr_encrypt(
-                bytes.fromhex(self.aes_key), bytes.fromhex(new_nonce), bytes(audio_data)
-            )
+            packet = self._packet_cipher.encrypt(audio_data, self.local_sequence)
 
-            # 拼接nonce和密文
-            packet = bytes.fromhex(new_nonce) + encrypt_encoded_data
-
-            # 发送数据包
-            self.udp_socket.sendto(packet, (self.udp_server, self.udp_port))
+            # 发送数据包（asyncio transport，不阻塞事件循环）
+            if not self.udp_channel.send(packet):
+                return False
+            self.telemetry.record_audio_out(len(packet))
 
-            # 每发送10个包打印一次日志
-            if self.local_sequence % 10 == 0:
-                logger.info(
+            if self.local_sequence % 500 == 0:
+                logger.debug(
                     f"已发送音频数据包，序列号: {self.local_sequence}，目标: "
                     f"{self.udp_server}:{self.udp_port}"
                 )
-
-            self.local_sequence += 1
             return True
         except Exception as e:
             logger.error(f"发送音频数据失败: {e}")
@@ -577,6 +611,7 @@ class MqttProtocol(Protocol):
         打开音频通道.
         """
         if not self.connected:
+            self._stop_reconnect()
             return await self.connect()
         return True
 
@@ -585,12 +620,13 @@ class MqttProtocol(Protocol):
         关闭音频通道.
         """
         self._is_closing = True
+        self._stop_reconnect()
 
         try:
             # 如果有会话ID，发送goodbye消息
             if self.session_id:
                 goodbye_msg = {"type": "goodbye", "session_id": self.session_id}
-                await self.send_text(json.dumps(goodbye_msg))
+                await self.send_text(json_codec.dumps(goodbye_msg))
 
             # 处理goodbye
             await self._handle_goodbye()
@@ -616,58 +652,17 @@ class MqttProtocol(Protocol):
             return False
 
         # 检查UDP连接状态
-        return self.udp_socket is not None and self.udp_running
-
-    def aes_ctr_encrypt(self, key, nonce, plaintext):
-        """AES-CTR模式加密函数
-        Args:
-            key: bytes格式的加密密钥
-            nonce: bytes格式的初始向量
-            plaintext: 待加密的原始数据
-        Returns:
-            bytes格式的加密数据
-        """
-        cipher = Cipher(
-            algorithms.AES(key), modes.CTR(nonce), backend=default_backend()
-        )
-        encryptor = cipher.encryptor()
-        return encryptor.update(plaintext) + encryptor.finalize()
-
-    def aes_ctr_decrypt(self, key, nonce, ciphertext):
-        """AES-CTR模式解密函数
-        Args:
-            key: bytes格式的解密密钥
-            nonce: bytes格式的初始向量（需要与加密时使用的相同）
-            ciphertext: bytes格式的加密数据
-        Returns:
-            bytes格式的解密后的原始数据
-        """
-        cipher = Cipher(
-            algorithms.AES(key), modes.CTR(nonce), backend=default_backend()
-        )
-        decryptor = cipher.decryptor()
-        plaintext = decryptor.update(ciphertext) + decryptor.finalize()
-        return plaintext
+        return self.udp_channel is not None and not self.udp_channel.closed
 
     async def _handle_goodbye(self):
         """
         处理goodbye消息.
         """
         try:
-            # 停止UDP接收线程
-            if self.udp_thread and self.udp_thread.is_alive():
-                self.udp_running = False
-                self.udp_thread.join(1.0)
-                self.udp_thread = None
-            logger.info("UDP接收线程已停止")
-
-            # 关闭UDP套接字
-            if self.udp_socket:
-                try:
-                    self.udp_socket.close()
-                except Exception as e:
-                    logger.error(f"关闭UDP套接字失败: {e}")
-                self.udp_socket = None
+            self.telemetry.stop_periodic_log()
+
+            # 关闭UDP音频通道
+            self._stop_udp_receiver()
 
             # 停止MQTT客户端
             if self.mqtt_client:
@@ -678,6 +673,7 @@ class MqttProtocol(Protocol):
                 except Exception as e:
                     logger.error(f"断开MQTT连接失败: {e}")
                 self.mqtt_client = None
+            self._fail_pending_publishes("MQTT连接已关闭")
 
             # 重置所有状态
             self.connected = False
@@ -688,6 +684,7 @@ class MqttProtocol(Protocol):
             self.udp_port = 0
             self.aes_key = None
             self.aes_nonce = None
+            self._packet_cipher = None
 
             # 调用音频通道关闭回调
             if self._on_audio_channel_closed:
@@ -698,33 +695,26 @@ class MqttProtocol(Protocol):
 
     def _stop_udp_receiver(self):
         """
-        停止UDP接收线程和关闭UDP套接字.
+        关闭UDP音频通道（须在事件循环线程调用）.
         """
-        # 关闭UDP接收线程
-        if (
-            hasattr(self, "udp_thread")
-            and self.udp_thread
-            and self.udp_thread.is_alive()
-        ):
-            self.udp_running = False
+        if self._reorder_flush_handle is not None:
+            self._reorder_flush_handle.cancel()
+            self._reorder_flush_handle = None
+        channel, self.udp_channel = self.udp_channel, None
+        if channel:
             try:
-                self.udp_thread.join(1.0)
-            except RuntimeError:
-                pass  # 处理线程已经终止的情况
-
-        # 关闭UDP套接字
-        if hasattr(self, "udp_socket") and self.udp_socket:
-            try:
-                self.udp_socket.close()
+                channel.close()
+                logger.info("UDP音频通道已关闭")
             except Exception as e:
-                logger.error(f"关闭UDP套接字失败: {e}")
+                logger.error(f"关闭UDP通道失败: {e}")
 
     def __del__(self):
         """
         析构函数，清理资源.
         """
-        # 停止UDP接收相关资源
-        self._stop_udp_receiver()
+        # 关闭UDP音频通道
+        if getattr(self, "udp_channel", None):
+            self._stop_udp_receiver()
 
         # 关闭MQTT客户端
         if hasattr(self, "mqtt_client") and self.mqtt_client:
@@ -752,15 +742,10 @@ class MqttProtocol(Protocol):
         连接健康状态监控.
         """
         try:
+            # 连接断开由 on_disconnect 回调触发处理，这里只检测长时间无活动
             while self.connected and not self._is_closing:
                 await asyncio.sleep(30)  # 每30秒检查一次
 
-                # 检查MQTT连接状态
-                if self.mqtt_client and not self.mqtt_client.is_connected():
-                    logger.warning("检测到MQTT连接已断开")
-                    await self._handle_connection_loss("MQTT连接检测失败")
-                    break
-
                 # 检查最后活动时间（超时检测）
                 if self._last_activity_time:
                     time_since_activity = time.time() - self._last_activity_time
@@ -804,82 +789,12 @@ class MqttProtocol(Protocol):
                 logger.error(f"调用音频通道关闭回调失败: {e}")
 
         # 只有在启用自动重连且未手动关闭时才尝试重连
-        if (
-            not self._is_closing
-            and self._auto_reconnect_enabled
-            and self._reconnect_attempts < self._max_reconnect_attempts
-        ):
-            await self._attempt_reconnect(reason)
-        else:
-            # 通知网络错误
-            if self._on_network_error:
-                if (
-                    self._auto_reconnect_enabled
-                    and self._reconnect_attempts >= self._max_reconnect_attempts
-                ):
-                    await self._on_network_error(f"MQTT连接丢失且重连失败: {reason}")
-                else:
-                    await self._on_network_error(f"MQTT连接丢失: {reason}")
-
-    async def _attempt_reconnect(self, original_reason: str):
-        """
-        尝试自动重连.
-        """
-        self._reconnect_attempts += 1
-
-        # 通知开始重连
-        if self._on_reconnecting:
-            try:
-                self._on_reconnecting(
-                    self._reconnect_attempts, self._max_reconnect_attempts
-                )
-            except Exception as e:
-                logger.error(f"调用重连回调失败: {e}")
-
-        logger.info(
-            f"尝试MQTT自动重连 ({self._reconnect_attempts}/{self._max_reconnect_attempts})"
-        )
-
-        # 等待一段时间后重连（指数退避）
-        await asyncio.sleep(min(self._reconnect_attempts * 2, 30))
-
-        try:
-            success = await self.connect()
-            if success:
-                logger.info("MQTT自动重连成功")
-                # 通知连接状态变化
-                if self._on_connection_state_changed:
-                    self._on_connection_state_changed(True, "重连成功")
-            else:
-                logger.warning(
-                    f"MQTT自动重连失败 ({self._reconnect_attempts}/{self._max_reconnect_attempts})"
-                )
-                # 如果还能重试，不立即报错
-                if self._reconnect_attempts >= self._max_reconnect_attempts:
-                    if self._on_network_error:
-                        await self._on_network_error(
-                            f"MQTT重连失败，已达到最大重连次数: {original_reason}"
-                        )
-        except Exception as e:
-            logger.error(f"MQTT重连过程中出错: {e}")
-            if self._reconnect_attempts >= self._max_reconnect_attempts:
-                if self._on_network_error:
-                    await self._on_network_error(f"MQTT重连异常: {str(e)}")
-
-    def enable_auto_reconnect(self, enabled: bool = True, max_attempts: int = 5):
-        """启用或禁用自动重连功能.
-
-        Args:
-            enabled: 是否启用自动重连
-            max_attempts: 最大重连尝试次数
-        """
-        self._auto_reconnect_enabled = enabled
-        if enabled:
-            self._max_reconnect_attempts = max_attempts
-            logger.info(f"启用MQTT自动重连，最大尝试次数: {max_attempts}")
+        if self._is_closing:
+            return
+        if self._auto_reconnect_enabled:
+            self._start_reconnect(reason)
         else:
-            self._max_reconnect_attempts = 0
-            logger.info("禁用MQTT自动重连")
+            await self._notify_network_error(f"MQTT连接丢失: {reason}")
 
     def get_connection_info(self) -> dict:
         """获取连接信息.
@@ -893,9 +808,7 @@ class MqttProtocol(Protocol):
                 self.mqtt_client.is_connected() if self.mqtt_client else False
             ),
             "is_closing": self._is_closing,
-            "auto_reconnect_enabled": self._auto_reconnect_enabled,
-            "reconnect_attempts": self._reconnect_attempts,
-            "max_reconnect_attempts": self._max_reconnect_attempts,
+            **self._reconnect_info(),
             "last_activity_time": self._last_activity_time,
             "keep_alive_interval": self._keep_alive_interval,
             "connection_timeout": self._connection_timeout,
@@ -904,6 +817,21 @@ class MqttProtocol(Protocol):
                 f"{self.udp_server}:{self.udp_port}" if self.udp_server else None
             ),
             "session_id": self.session_id,
+            "udp": self.udp_channel.get_stats() if self.udp_channel else None,
+            "udp_receive": self._sequence_tracker.get_stats(),
+            "publish": {
+                **self._publish_stats,
+                "max_wait_ms": round(self._publish_stats["max_wait_ms"], 2),
+                "inflight": len(self._publish_futures),
+            },
+            "telemetry": self.get_telemetry(),
+        }
+
+    def _send_queue_depth(self) -> dict:
+        udp_stats = self.udp_channel.get_stats() if self.udp_channel else {}
+        return {
+            "udp_buffer_bytes": udp_stats.get("send_buffer", 0),
+            "publish_inflight": len(self._publish_futures),
         }
 
     async def _cleanup_connection(self):
@@ -911,16 +839,18 @@ class MqttProtocol(Protocol):
         清理连接相关资源.
         """
         self.connected = False
+        self.telemetry.stop_periodic_log()
 
-        # 取消连接监控任务
-        if self._connection_monitor_task and not self._connection_monitor_task.done():
-            self._connection_monitor_task.cancel()
+        # 取消连接监控任务（监控任务自身发现超时进入这里时不取消自己）
+        monitor = self._connection_monitor_task
+        if monitor and not monitor.done() and monitor is not asyncio.current_task():
+            monitor.cancel()
             try:
-                await self._connection_monitor_task
+                await monitor
             except asyncio.CancelledError:
                 pass
 
-        # 停止UDP接收线程
+        # 关闭UDP音频通道
         self._stop_udp_receiver()
 
         # 停止MQTT客户端
@@ -930,6 +860,7 @@ class MqttProtocol(Protocol):
                 self.mqtt_client.disconnect()
             except Exception as e:
                 logger.error(f"断开MQTT连接时出错: {e}")
+        self._fail_pending_publishes("MQTT连接已断开")
 
         # 重置时间戳
         self._last_activity_time = None
@@ -0,0 +1,76 @@
+import struct
+
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+
+NONCE_SIZE = 16
+BLOCK_SIZE = 16
+_COUNTER_MASK = (1 << 128) - 1
+
+
+class PacketCipher:
+    """UDP 音频数据包的 AES-CTR 加解密.
+
+    数据包格式：16字节nonce + 密文。nonce 由服务器下发的模板生成：
+    [0:2] 模板 | [2:4] 负载长度(大端) | [4:12] 模板 | [12:16] 序列号(大端)
+
+    每个会话只解析一次密钥和 nonce 模板。cryptography 的 CTR 模式对象不能更换
+    nonce，因此这里复用一个 AES-ECB 加密器直接生成 CTR 密钥流（计数块即 nonce
+    按 128 位大端整数递增），与每包新建 Cipher/encryptor 的结果完全一致。
+    """
+
+    def __init__(self, key_hex: str, nonce_hex: str):
+        key = bytes.fromhex(key_hex)
+        nonce = bytes.fromhex(nonce_hex)
+        if len(nonce) != NONCE_SIZE:
+            raise ValueError(f"nonce长度必须为{NONCE_SIZE}字节: {len(nonce)}")
+
+        # AES 密钥长度校验由 algorithms.AES 完成
+        self._keystream = Cipher(algorithms.AES(key), modes.ECB()).encryptor()
+        self._nonce = bytearray(nonce)
+
+    def encrypt(self, payload: bytes, sequence: int) -> bytes:
+        """加密一帧音频并拼接 nonce.
+
+        Args:
+            payload: 原始 Opus 帧
+            sequence: 32位序列号
+
+        Returns:
+            nonce + 密文
+        """
+        nonce = self._nonce
+        struct.pack_into(">H", nonce, 2, len(payload) & 0xFFFF)
+        struct.pack_into(">I", nonce, 12, sequence & 0xFFFFFFFF)
+        header = bytes(nonce)
+        return header + self._apply(header, payload)
+
+    def decrypt(self, packet: bytes) -> tuple[int, bytes]:
+        """解密一个数据包.
+
+        Args:
+            packet: nonce + 密文
+
+        Returns:
+            (序列号, 明文)
+        """
+        if len(packet) < NONCE_SIZE:
+            raise ValueError(f"无效的音频数据包大小: {len(packet)}")
+        nonce = packet[:NONCE_SIZE]
+        sequence = int.from_bytes(nonce[12:16], "big")
+        return sequence, self._apply(nonce, packet[NONCE_SIZE:])
+
+    def _apply(self, nonce: bytes, data: bytes) -> bytes:
+        """
+        data 与以 nonce 为初始计数块的 CTR 密钥流异或（加解密相同）.
+        """
+        size = len(data)
+        if size == 0:
+            return b""
+        base = int.from_bytes(nonce, "big")
+        blocks = b"".join(
+            ((base + i) & _COUNTER_MASK).to_bytes(BLOCK_SIZE, "big")
+            for i in range((size + BLOCK_SIZE - 1) // BLOCK_SIZE)
+        )
+        keystream = self._keystream.update(blocks)
+        mixed = int.from_bytes(data, "big") ^ int.from_bytes(keystream[:size], "big")
+        return mixed.to_bytes(size, "big")
@@ -1,6 +1,10 @@
-import json
+import asyncio
 
 from src.constants.constants import AbortReason, ListeningMode
+from src.protocols.reconnect_policy import ReconnectPolicy
+from src.protocols.telemetry import ProtocolTelemetry
+from src.utils import json_codec
+from src.utils.config_manager import ConfigManager
 from src.utils.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -18,6 +22,17 @@ class Protocol:
         # 新增连接状态变化回调
         self._on_connection_state_changed = None
         self._on_reconnecting = None
+        # 连接与延迟遥测（子类在收发路径上累计）
+        self.telemetry = ProtocolTelemetry(type(self).__name__)
+        # 自动重连：由连接断开事件触发，退避与熔断由 ReconnectPolicy 决定
+        self._is_closing = False
+        self._reconnect_policy = ReconnectPolicy.from_config()
+        self._auto_reconnect_enabled = bool(
+            ConfigManager.get_instance().get_config(
+                "SYSTEM_OPTIONS.NETWORK.RECONNECT.ENABLED", False
+            )
+        )
+        self._reconnect_task = None
 
     def on_incoming_json(self, callback):
         """
@@ -26,8 +41,11 @@ class Protocol:
         self._on_incoming_json = callback
 
     def on_incoming_audio(self, callback):
-        """
-        设置音频数据接收回调函数.
+        """设置音频数据接收回调函数.
+
+        Args:
+            callback: 回调函数，接收参数 (data: bytes, sequence: int | None = None)，
+                sequence 为传输层携带的包序列号，不携带时省略
         """
         self._on_incoming_audio = callback
 
@@ -65,6 +83,149 @@ class Protocol:
         """
         self._on_reconnecting = callback
 
+    def enable_auto_reconnect(self, enabled: bool = True, max_attempts: int = 0):
+        """启用或禁用自动重连功能.
+
+        Args:
+            enabled: 是否启用自动重连
+            max_attempts: 每次断线的最大重连尝试次数，0 表示只受
+                SYSTEM_OPTIONS.NETWORK.RECONNECT.MAX_ELAPSED 限制
+        """
+        self._auto_reconnect_enabled = enabled
+        if enabled:
+            self._reconnect_policy.max_attempts = max(0, int(max_attempts))
+            logger.info(f"启用自动重连，最大尝试次数: {max_attempts or '不限'}")
+        else:
+            self._stop_reconnect()
+            logger.info("禁用自动重连")
+
+    def _reconnect_info(self) -> dict:
+        """
+        重连状态，并入子类的 get_connection_info().
+        """
+        return {
+            "auto_reconnect_enabled": self._auto_reconnect_enabled,
+            "reconnect_attempts": self._reconnect_policy.attempts,
+            "max_reconnect_attempts": self._reconnect_policy.max_attempts,
+            "reconnecting": bool(
+                self._reconnect_task and not self._reconnect_task.done()
+            ),
+            "reconnect": self._reconnect_policy.get_stats(),
+        }
+
+    def _start_reconnect(self, reason: str, background: bool = False) -> bool:
+        """开始自动重连（已在重连或正在关闭时忽略），须在事件循环线程调用.
+
+        Args:
+            reason: 断开原因
+            background: 后台重连，不触发重连/网络错误回调（WebSocket 保温模式）
+        """
+        if self._is_closing:
+            return False
+        if self._reconnect_task and not self._reconnect_task.done():
+            return True
+        self._reconnect_task = asyncio.create_task(
+            self._reconnect_loop(reason, background),
+            name=f"{type(self).__name__}:reconnect",
+        )
+        return True
+
+    def _stop_reconnect(self):
+        """
+        取消正在进行的自动重连.
+        """
+        task, self._reconnect_task = self._reconnect_task, None
+        if task and not task.done() and task is not asyncio.current_task():
+            task.cancel()
+
+    async def _reconnect_loop(self, reason: str, background: bool):
+        """
+        按重连策略反复尝试，直到连上、放弃或协议关闭.
+        """
+        policy = self._reconnect_policy
+        policy.start_outage()
+        try:
+            while not self._is_closing:
+                delay = policy.next_delay()
+                if delay is None:
+                    logger.warning(
+                        f"自动重连放弃（已尝试{policy.attempts}次）: {reason}"
+                    )
+                    if not background:
+                        await self._notify_network_error(f"连接丢失且重连失败: {reason}")
+                    return
+
+                if self._on_reconnecting and not background:
+                    try:
+                        self._on_reconnecting(policy.attempts, policy.max_attempts)
+                    except Exception as e:
+                        logger.error(f"调用重连回调失败: {e}")
+
+                logger.info(
+                    f"{delay:.1f}秒后第{policy.attempts}次重连"
+                    f"（熔断状态: {policy.state}）"
+                )
+                await asyncio.sleep(delay)
+                if self._is_closing or self.is_audio_channel_opened():
+                    return
+
+                try:
+                    success = await self._reconnect_once(background)
+                except Exception as e:
+                    logger.error(f"重连过程中出错: {e}")
+                    success = False
+
+                if success:
+                    # connect() 成功时已调用 policy.record_success()
+                    logger.info("自动重连成功")
+                    self.telemetry.record_reconnect()
+                    if self._on_connection_state_changed and not background:
+                        self._on_connection_state_changed(True, "重连成功")
+                    return
+                policy.record_failure()
+        except asyncio.CancelledError:
+            logger.debug("自动重连任务被取消")
+
+    async def _reconnect_once(self, background: bool) -> bool:
+        """
+        执行一次重连，子类可覆盖（如 WebSocket 的后台连接）.
+        """
+        return await self.connect()
+
+    async def _notify_network_error(self, message: str):
+        """
+        调用网络错误回调（兼容同步与异步回调）.
+        """
+        if not self._on_network_error:
+            return
+        try:
+            result = self._on_network_error(message)
+            if asyncio.iscoroutine(result):
+                await result
+        except Exception as e:
+            logger.error(f"调用网络错误回调失败: {e}")
+
+    def get_telemetry(self) -> dict:
+        """
+        连接与延迟遥测快照（计数、RTT、hello 耗时、首帧 TTS 耗时、发送排队情况）.
+        """
+        return self.telemetry.snapshot(self._send_queue_depth())
+
+    def _send_queue_depth(self) -> dict:
+        """
+        发送侧排队情况，由子类按各自的传输实现.
+        """
+        return {}
+
+    def _start_telemetry_log(self):
+        """
+        按 SYSTEM_OPTIONS.NETWORK.TELEMETRY_LOG_INTERVAL 周期输出遥测（0为关闭）.
+        """
+        interval = ConfigManager.get_instance().get_config(
+            "SYSTEM_OPTIONS.NETWORK.TELEMETRY_LOG_INTERVAL", 0
+        )
+        self.telemetry.start_periodic_log(float(interval or 0), self._send_queue_depth)
+
     async def send_text(self, message):
         """
         发送文本消息的抽象方法，需要在子类中实现.
@@ -77,6 +238,14 @@ class Protocol:
         """
         raise NotImplementedError("send_audio方法必须由子类实现")
 
+    async def send_audio_batch(self, frames: list):
+        """按顺序发送多帧音频.
+
+        默认逐帧调用 send_audio，子类可覆盖以减少每帧的状态检查和调度开销。
+        """
+        for data in frames:
+            await self.send_audio(data)
+
     def is_audio_channel_opened(self) -> bool:
         """
         检查音频通道是否打开的抽象方法，需要在子类中实现.
@@ -104,7 +273,7 @@ class Protocol:
             message["reason"] = "wake_word_detected"
         
         logger.debug(f"发送中止消息: {message}")
-        await self.send_text(json.dumps(message))
+        await self.send_text(json_codec.dumps(message))
 
     async def send_wake_word_detected(self, wake_word):
         """
@@ -116,7 +285,7 @@ class Protocol:
             "state": "detect",
             "text": wake_word,
         }
-        await self.send_text(json.dumps(message))
+        await self.send_text(json_codec.dumps(message))
 
     async def send_start_listening(self, mode):
         """
@@ -135,14 +304,15 @@ class Protocol:
         }
         
         logger.debug(f"发送监听消息: {message}")
-        await self.send_text(json.dumps(message))
+        self.telemetry.mark_listen_start()
+        await self.send_text(json_codec.dumps(message))
 
     async def send_stop_listening(self):
         """
         发送停止监听的消息.
         """
         message = {"session_id": self.session_id, "type": "listen", "state": "stop"}
-        await self.send_text(json.dumps(message))
+        await self.send_text(json_codec.dumps(message))
 
     async def send_iot_descriptors(self, descriptors):
         """
@@ -151,7 +321,7 @@ class Protocol:
         try:
             # 解析描述符数据
             if isinstance(descriptors, str):
-                descriptors_data = json.loads(descriptors)
+                descriptors_data = json_codec.loads(descriptors)
             else:
                 descriptors_data = descriptors
 
@@ -174,7 +344,7 @@ class Protocol:
                 }
 
                 try:
-                    await self.send_text(json.dumps(message))
+                    await self.send_text(json_codec.dumps(message))
                 except Exception as e:
                     logger.error(
                         f"Failed to send JSON message for IoT descriptor "
@@ -182,7 +352,7 @@ class Protocol:
                     )
                     continue
 
-        except json.JSONDecodeError as e:
+        except json_codec.JSONDecodeError as e:
             logger.error(f"Failed to parse IoT descriptors: {e}")
             return
 
@@ -191,7 +361,7 @@ class Protocol:
         发送物联网设备状态信息.
         """
         if isinstance(states, str):
-            states_data = json.loads(states)
+            states_data = json_codec.loads(states)
         else:
             states_data = states
 
@@ -201,14 +371,14 @@ class Protocol:
             "update": True,
             "states": states_data,
         }
-        await self.send_text(json.dumps(message))
+        await self.send_text(json_codec.dumps(message))
 
     async def send_mcp_message(self, payload):
         """
         发送MCP消息.
         """
         if isinstance(payload, str):
-            payload_data = json.loads(payload)
+            payload_data = json_codec.loads(payload)
         else:
             payload_data = payload
 
@@ -218,4 +388,4 @@ class Protocol:
             "payload": payload_data,
         }
 
-        await self.send_text(json.dumps(message))
+        await self.send_text(json_codec.dumps(message))
@@ -0,0 +1,163 @@
+import random
+import time
+from typing import Callable, Optional
+
+from src.utils.config_manager import ConfigManager
+
+# 熔断器状态
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class ReconnectPolicy:
+    """断线重连策略：指数退避 + 全抖动，限制总时长，带熔断.
+
+    - 第 n 次连续失败后的等待时间在 [0, min(max_delay, base_delay * 2^n)] 内均匀随机，
+      服务端重启导致大量设备同时断线时，重连请求被打散而不是同步到达
+    - 一次断线从第一次尝试起超过 max_elapsed 秒或 max_attempts 次仍未连上则放弃
+    - 连续失败 failure_threshold 次后熔断（open），在 open_seconds 的 50%~100%
+      （随机）内不再尝试；到期后进入半开（half_open）只放行一次探测，成功则恢复
+      （closed），失败则重新熔断
+
+    熔断只约束自动重连，用户主动发起的连接不受影响；任意一次连接成功都会复位。
+    """
+
+    def __init__(
+        self,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        max_elapsed: float = 300.0,
+        max_attempts: int = 0,
+        failure_threshold: int = 5,
+        open_seconds: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+        rng: Callable[[], float] = random.random,
+    ):
+        """
+        Args:
+            base_delay: 退避基数（秒）
+            max_delay: 单次等待上限（秒）
+            max_elapsed: 一次断线的最长重连时长（秒），0 为不限
+            max_attempts: 一次断线的最多尝试次数，0 为不限
+            failure_threshold: 触发熔断的连续失败次数，0 为不熔断
+            open_seconds: 熔断持续时间上限（秒）
+            clock: 单调时钟，模拟时可替换
+            rng: [0, 1) 随机数，模拟时可替换
+        """
+        self.base_delay = max(0.0, base_delay)
+        self.max_delay = max(self.base_delay, max_delay)
+        self.max_elapsed = max(0.0, max_elapsed)
+        self.max_attempts = max(0, int(max_attempts))
+        self.failure_threshold = max(0, int(failure_threshold))
+        self.open_seconds = max(0.0, open_seconds)
+        self._clock = clock
+        self._rng = rng
+
+        self.state = CLOSED
+        self.attempts = 0  # 本次断线以来的尝试次数
+        self._failures = 0  # 连续失败次数
+        self._outage_started: Optional[float] = None
+        self._open_until = 0.0
+        self._stats = {
+            "attempts": 0,
+            "successes": 0,
+            "failures": 0,
+            "breaker_opens": 0,
+            "give_ups": 0,
+        }
+
+    @classmethod
+    def from_config(cls) -> "ReconnectPolicy":
+        """
+        按 SYSTEM_OPTIONS.NETWORK.RECONNECT 创建.
+        """
+        options = (
+            ConfigManager.get_instance().get_config(
+                "SYSTEM_OPTIONS.NETWORK.RECONNECT", {}
+            )
+            or {}
+        )
+        return cls(
+            base_delay=float(options.get("BASE_DELAY", 1.0)),
+            max_delay=float(options.get("MAX_DELAY", 30.0)),
+            max_elapsed=float(options.get("MAX_ELAPSED", 300.0)),
+            max_attempts=int(options.get("MAX_ATTEMPTS", 0)),
+            failure_threshold=int(options.get("FAILURE_THRESHOLD", 5)),
+            open_seconds=float(options.get("OPEN_SECONDS", 60.0)),
+        )
+
+    def start_outage(self):
+        """
+        连接断开、开始自动重连时调用：重新计算本次断线的尝试次数和时长.
+        """
+        self.attempts = 0
+        self._outage_started = self._clock()
+
+    def next_delay(self) -> Optional[float]:
+        """计算下一次尝试前的等待时间，并计入一次尝试.
+
+        Returns:
+            等待秒数；超过 max_attempts / max_elapsed 时返回 None，表示放弃
+        """
+        now = self._clock()
+        if self._outage_started is None:
+            self._outage_started = now
+        elapsed = now - self._outage_started
+
+        if (self.max_attempts and self.attempts >= self.max_attempts) or (
+            self.max_elapsed and elapsed >= self.max_elapsed
+        ):
+            self._stats["give_ups"] += 1
+            return None
+
+        if self.state == OPEN:
+            # 等到熔断期结束，这一次即半开探测
+            delay = max(0.0, self._open_until - now)
+            self.state = HALF_OPEN
+        else:
+            cap = min(self.max_delay, self.base_delay * 2 ** min(self._failures, 32))
+            delay = self._rng() * cap
+
+        if self.max_elapsed:
+            # 最后一次尝试不晚于截止时间
+            delay = min(delay, self.max_elapsed - elapsed)
+
+        self.attempts += 1
+        self._stats["attempts"] += 1
+        return delay
+
+    def record_success(self):
+        """
+        连接成功（包括用户主动连接）：复位退避和熔断.
+        """
+        self.state = CLOSED
+        self.attempts = 0
+        self._failures = 0
+        self._outage_started = None
+        self._stats["successes"] += 1
+
+    def record_failure(self):
+        """
+        一次重连失败：半开探测失败或连续失败达到阈值时熔断.
+        """
+        self._failures += 1
+        self._stats["failures"] += 1
+        if self.state == HALF_OPEN or (
+            self.failure_threshold
+            and self.state == CLOSED
+            and self._failures >= self.failure_threshold
+        ):
+            self.state = OPEN
+            self._open_until = self._clock() + self.open_seconds * (
+                0.5 + self._rng() * 0.5
+            )
+            self._stats["breaker_opens"] += 1
+
+    def get_stats(self) -> dict:
+        return {
+            **self._stats,
+            "state": self.state,
+            "outage_attempts": self.attempts,
+            "consecutive_failures": self._failures,
+        }
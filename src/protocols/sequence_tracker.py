@@ -0,0 +1,223 @@
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+SEQUENCE_MODULO = 1 << 32
+
+# 滑动窗口中每个期望序列号的结果
+_IN_ORDER = 0
+_REORDERED = 1
+_LOST = 2
+
+
+class SequenceTracker:
+    """UDP 音频包接收端序列号跟踪.
+
+    - 丢弃重复包和已越过的迟到包
+    - 乱序到达的包在小窗口内暂存，补齐后按序交出；缺口等待超过 max_hold 个包
+      或 hold_ms 仍未补上则判定丢失，跳过缺口继续交付
+    - 统计丢包、乱序、重复、迟到，并按 RFC 3550 估计到达间隔抖动（句间停顿
+      造成的长间隔不计入）
+
+    序列号为32位并按模 2^32 比较，回绕后可继续跟踪；与期望值相差过大时视为服务端
+    重置了序列号，从新的位置重新开始。
+    """
+
+    def __init__(
+        self,
+        frame_duration_ms: int,
+        max_hold: int = 4,
+        hold_ms: int = 120,
+        window: int = 500,
+        restart_distance: int = 1000,
+        gap_reset_ms: int = 400,
+    ):
+        self.frame_duration_ms = frame_duration_ms
+        # 到达间隔偏离期望超过该值时视为新的一段语音，不计入抖动
+        self.gap_reset_ms = gap_reset_ms
+        self.max_hold = max(0, max_hold)
+        self.hold_ms = hold_ms
+        self._restart_distance = restart_distance
+        self._window = deque(maxlen=window)
+
+        self._expected: Optional[int] = None
+        self._highest: Optional[int] = None
+        self._held: Dict[int, bytes] = {}
+        self._held_since: Optional[float] = None
+        self._recent_delivered = deque(maxlen=64)
+
+        self._jitter_ms = 0.0
+        self._last_arrival: Optional[Tuple[int, float]] = None
+
+        self._stats = {
+            "received": 0,
+            "delivered": 0,
+            "lost": 0,
+            "reordered": 0,
+            "duplicate": 0,
+            "late": 0,
+            "restarts": 0,
+        }
+
+    @staticmethod
+    def _distance(sequence: int, reference: int) -> int:
+        """
+        sequence 相对 reference 的有符号距离（模 2^32）.
+        """
+        diff = (sequence - reference) % SEQUENCE_MODULO
+        return diff - SEQUENCE_MODULO if diff >= SEQUENCE_MODULO // 2 else diff
+
+    def reset(self):
+        """
+        新会话开始（服务端重新下发 hello）时调用.
+        """
+        self._expected = None
+        self._highest = None
+        self._held.clear()
+        self._held_since = None
+        self._recent_delivered.clear()
+        self._last_arrival = None
+
+    def push(
+        self, sequence: int, payload: bytes, now: float = None
+    ) -> List[Tuple[int, bytes]]:
+        """写入一个收到的包.
+
+        Args:
+            sequence: 包序列号
+            payload: 解密后的音频数据
+            now: 到达时间（秒，单调时钟），默认取当前时间
+
+        Returns:
+            可以按序交给播放端的 (序列号, 数据) 列表
+        """
+        now = time.monotonic() if now is None else now
+        self._stats["received"] += 1
+
+        if self._expected is None:
+            self._expected = self._highest = sequence
+        distance = self._distance(sequence, self._expected)
+
+        if abs(distance) > self._restart_distance:
+            # 序列号跳变：交出暂存的包后从新位置开始
+            ready = self._release_all(now)
+            self._stats["restarts"] += 1
+            self._expected = self._highest = sequence
+            self._last_arrival = None
+            distance = 0
+        else:
+            ready = []
+
+        if distance < 0:
+            if sequence in self._recent_delivered:
+                self._stats["duplicate"] += 1
+            else:
+                self._stats["late"] += 1  # 缺口已被判定丢失后才到达
+            return ready
+        if sequence in self._held:
+            self._stats["duplicate"] += 1
+            return ready
+
+        self._update_jitter(sequence, now)
+        if self._distance(sequence, self._highest) < 0:
+            # 比它更新的包已经先到了
+            self._stats["reordered"] += 1
+            self._window.append(_REORDERED)
+        else:
+            self._highest = sequence
+            self._window.append(_IN_ORDER)
+
+        if distance == 0:
+            ready.append(self._take(sequence, payload))
+            ready.extend(self._release_consecutive(now))
+        else:
+            # 前面还有缺口，先暂存
+            self._held[sequence] = payload
+            if self._held_since is None:
+                self._held_since = now
+            if len(self._held) > self.max_hold:
+                ready.extend(self._skip_gap(now))
+
+        if not self._held:
+            self._held_since = None
+        return ready
+
+    def flush_expired(self, now: float = None) -> List[Tuple[int, bytes]]:
+        """放弃等待超过 hold_ms 的缺口，交出其后已到达的包.
+
+        Returns:
+            可以按序交给播放端的 (序列号, 数据) 列表
+        """
+        if not self._held:
+            return []
+        now = time.monotonic() if now is None else now
+        if (now - self._held_since) * 1000 < self.hold_ms:
+            return []
+        return self._release_all(now)
+
+    def has_pending(self) -> bool:
+        return bool(self._held)
+
+    def _take(self, sequence: int, payload: bytes) -> Tuple[int, bytes]:
+        self._expected = (sequence + 1) % SEQUENCE_MODULO
+        self._recent_delivered.append(sequence)
+        self._stats["delivered"] += 1
+        return sequence, payload
+
+    def _release_consecutive(self, now: float) -> List[Tuple[int, bytes]]:
+        ready = []
+        while self._expected in self._held:
+            sequence = self._expected
+            ready.append(self._take(sequence, self._held.pop(sequence)))
+        if self._held:
+            self._held_since = now  # 剩余缺口从现在开始重新计时
+        return ready
+
+    def _skip_gap(self, now: float) -> List[Tuple[int, bytes]]:
+        """
+        把期望序列号推进到最早的暂存包，中间缺失的计为丢包.
+        """
+        first = min(self._held, key=lambda seq: self._distance(seq, self._expected))
+        missing = self._distance(first, self._expected)
+        self._stats["lost"] += missing
+        self._window.extend([_LOST] * min(missing, self._window.maxlen))
+        self._expected = first
+        return self._release_consecutive(now)
+
+    def _release_all(self, now: float) -> List[Tuple[int, bytes]]:
+        ready = []
+        while self._held:
+            ready.extend(self._skip_gap(now))
+        self._held_since = None
+        return ready
+
+    def _update_jitter(self, sequence: int, now: float):
+        """RFC 3550 到达间隔抖动：以帧时长作为发送时间戳单位.
+
+        TTS 句间停顿期间服务端不发包，下一句首包的间隔可达数百毫秒到数秒，
+        偏差超过 gap_reset_ms 时只更新参考点，避免健康链路也报出高抖动.
+        """
+        if self._last_arrival is not None:
+            last_sequence, last_now = self._last_arrival
+            frames = self._distance(sequence, last_sequence)
+            delta = abs((now - last_now) * 1000 - frames * self.frame_duration_ms)
+            if delta <= self.gap_reset_ms:
+                self._jitter_ms += (delta - self._jitter_ms) / 16
+        self._last_arrival = (sequence, now)
+
+    def get_stats(self) -> dict:
+        """
+        累计计数，以及最近 window 个期望序列号上的丢包率/乱序率.
+        """
+        window = self._window
+        total = len(window)
+        stats = dict(self._stats)
+        stats["jitter_ms"] = round(self._jitter_ms, 2)
+        stats["held"] = len(self._held)
+        stats["recent_loss_rate"] = (
+            round(window.count(_LOST) / total, 4) if total else 0.0
+        )
+        stats["recent_reorder_rate"] = (
+            round(window.count(_REORDERED) / total, 4) if total else 0.0
+        )
+        return stats
@@ -0,0 +1,177 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Optional
+
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+def _summarize(samples: deque) -> Optional[dict]:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return {
+        "last": round(samples[-1], 1),
+        "p50": round(ordered[len(ordered) // 2], 1),
+        "max": round(ordered[-1], 1),
+        "count": len(samples),
+    }
+
+
+class ProtocolTelemetry:
+    """协议层连接与延迟遥测.
+
+    - 收发字节数、音频帧数、控制消息数，重连次数
+    - RTT（WebSocket ping/pong）
+    - 建立连接到收到服务器 hello 的耗时
+    - 发出开始聆听到收到第一帧 TTS 音频的耗时
+
+    MQTT 的消息回调在 paho 网络线程执行，计数用锁保护。
+    """
+
+    def __init__(self, name: str, samples: int = 50):
+        self.name = name
+        self._lock = threading.Lock()
+        self._counters = {
+            "bytes_in": 0,
+            "bytes_out": 0,
+            "frames_in": 0,
+            "frames_out": 0,
+            "messages_in": 0,
+            "messages_out": 0,
+            "connects": 0,
+            "reconnects": 0,
+        }
+        self._rtt_ms = deque(maxlen=samples)
+        self._hello_ms = deque(maxlen=samples)
+        self._first_tts_ms = deque(maxlen=samples)
+        self._connect_started: Optional[float] = None
+        self._listen_started: Optional[float] = None
+        self._log_task: Optional[asyncio.Task] = None
+        self._sources: Dict[str, Callable[[], Any]] = {}
+
+    # -----------------------
+    # 计数
+    # -----------------------
+    def record_audio_in(self, size: int, frames: int = 1):
+        now = time.monotonic()
+        with self._lock:
+            self._counters["bytes_in"] += size
+            self._counters["frames_in"] += frames
+            if self._listen_started is not None:
+                self._first_tts_ms.append((now - self._listen_started) * 1000)
+                self._listen_started = None
+
+    def record_audio_out(self, size: int, frames: int = 1):
+        with self._lock:
+            self._counters["bytes_out"] += size
+            self._counters["frames_out"] += frames
+
+    def record_message_in(self, size: int):
+        with self._lock:
+            self._counters["bytes_in"] += size
+            self._counters["messages_in"] += 1
+
+    def record_message_out(self, size: int):
+        with self._lock:
+            self._counters["bytes_out"] += size
+            self._counters["messages_out"] += 1
+
+    def record_reconnect(self):
+        with self._lock:
+            self._counters["reconnects"] += 1
+
+    def record_rtt(self, rtt_ms: float):
+        with self._lock:
+            self._rtt_ms.append(rtt_ms)
+
+    # -----------------------
+    # 时间点
+    # -----------------------
+    def mark_connect_start(self):
+        self._connect_started = time.monotonic()
+
+    def mark_hello(self):
+        """
+        收到服务器 hello：记录从 mark_connect_start 起的耗时.
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._counters["connects"] += 1
+            if self._connect_started is not None:
+                self._hello_ms.append((now - self._connect_started) * 1000)
+                self._connect_started = None
+
+    def mark_listen_start(self):
+        """
+        发出开始聆听：下一帧收到的音频即视为首帧 TTS.
+        """
+        self._listen_started = time.monotonic()
+
+    # -----------------------
+    # 导出
+    # -----------------------
+    def add_source(self, name: str, provider: Callable[[], Any]):
+        """注册外部实时数据（如插件的发送队列深度），快照时调用并以 name 为键并入.
+
+        Args:
+            name: 快照中的键
+            provider: 无参函数，返回可序列化的值
+        """
+        self._sources[name] = provider
+
+    def snapshot(self, extra: dict = None) -> dict:
+        with self._lock:
+            data = {
+                "protocol": self.name,
+                **self._counters,
+                "rtt_ms": _summarize(self._rtt_ms),
+                "time_to_hello_ms": _summarize(self._hello_ms),
+                "listen_to_first_tts_ms": _summarize(self._first_tts_ms),
+            }
+        if extra:
+            data.update(extra)
+        for name, provider in list(self._sources.items()):
+            try:
+                data[name] = provider()
+            except Exception as e:
+                data[name] = None
+                logger.debug(f"获取遥测数据 {name} 失败: {e}")
+        return data
+
+    def start_periodic_log(
+        self, interval: float, extra_provider: Callable[[], dict] = None
+    ):
+        """按固定间隔以 INFO 级别输出快照（interval <= 0 或已在运行时忽略）.
+
+        Args:
+            interval: 输出间隔（秒）
+            extra_provider: 每次输出前调用，返回需要并入快照的实时数据
+        """
+        if interval <= 0 or (self._log_task and not self._log_task.done()):
+            return
+        self._log_task = asyncio.create_task(
+            self._log_loop(interval, extra_provider)
+        )
+
+    def stop_periodic_log(self):
+        """
+        停止周期输出（连接关闭或清理时调用，重复调用无副作用）.
+        """
+        if self._log_task and not self._log_task.done():
+            self._log_task.cancel()
+        self._log_task = None
+
+    async def _log_loop(self, interval: float, extra_provider):
+        try:
+            while True:
+                await asyncio.sleep(interval)
+                extra = extra_provider() if extra_provider else None
+                logger.info(f"协议遥测: {self.snapshot(extra)}")
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.warning(f"输出协议遥测失败: {e}")
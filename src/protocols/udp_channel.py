@@ -0,0 +1,146 @@
+import asyncio
+import socket
+from typing import Callable, List, Optional
+
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# 单个音频数据包上限（16字节nonce + Opus帧），与原接收线程的缓冲区一致
+MAX_DATAGRAM_SIZE = 4096
+
+
+class UdpAudioChannel(asyncio.DatagramProtocol):
+    """基于 asyncio 的 UDP 音频通道.
+
+    收发都在事件循环线程完成，不需要轮询线程：
+    - 套接字可读时先收下触发回调的数据报，再非阻塞地把内核队列里已到达的
+      数据报一并取出（最多 max_batch 个），整批交给 on_datagrams 回调
+    - 发送走 transport.sendto，内核缓冲区满时由 asyncio 暂存，不阻塞事件循环
+    """
+
+    def __init__(
+        self,
+        on_datagrams: Callable[[List[bytes]], None],
+        max_batch: int = 32,
+    ):
+        self._on_datagrams = on_datagrams
+        self._max_batch = max(1, max_batch)
+        self._transport: Optional[asyncio.DatagramTransport] = None
+        self._sock: Optional[socket.socket] = None
+        self.closed = True
+
+        self._stats = {
+            "received": 0,
+            "sent": 0,
+            "batches": 0,
+            "max_batch": 0,
+            "send_errors": 0,
+            "errors": 0,
+        }
+
+    @classmethod
+    async def open(
+        cls,
+        host: str,
+        port: int,
+        on_datagrams: Callable[[List[bytes]], None],
+        max_batch: int = 32,
+    ) -> "UdpAudioChannel":
+        """创建连接到 host:port 的 UDP 通道.
+
+        Args:
+            host: 服务器地址（域名解析在事件循环的线程池中完成）
+            port: 服务器端口
+            on_datagrams: 收到一批数据报时在事件循环线程中调用
+            max_batch: 每次最多连续取出的数据报数量
+
+        Returns:
+            已就绪的 UdpAudioChannel
+        """
+        loop = asyncio.get_running_loop()
+        infos = await loop.getaddrinfo(host, port, type=socket.SOCK_DGRAM)
+        if not infos:
+            raise OSError(f"无法解析UDP服务器地址: {host}:{port}")
+        family, sock_type, proto, _, address = infos[0]
+
+        sock = socket.socket(family, sock_type, proto)
+        try:
+            sock.setblocking(False)
+            sock.connect(address)
+            channel = cls(on_datagrams, max_batch)
+            await loop.create_datagram_endpoint(lambda: channel, sock=sock)
+        except Exception:
+            sock.close()
+            raise
+        channel._sock = sock
+        return channel
+
+    def connection_made(self, transport):
+        self._transport = transport
+        self.closed = False
+
+    def datagram_received(self, data: bytes, addr):
+        batch = [data]
+        sock = self._sock
+        if sock is not None:
+            # 同一次可读事件里把已经到达的数据报一起取走，减少事件循环往返
+            try:
+                while len(batch) < self._max_batch:
+                    batch.append(sock.recv(MAX_DATAGRAM_SIZE))
+            except (BlockingIOError, InterruptedError):
+                pass
+            except OSError as e:
+                self._stats["errors"] += 1
+                logger.debug(f"UDP批量接收中断: {e}")
+
+        self._stats["received"] += len(batch)
+        self._stats["batches"] += 1
+        if len(batch) > self._stats["max_batch"]:
+            self._stats["max_batch"] = len(batch)
+
+        try:
+            self._on_datagrams(batch)
+        except Exception as e:
+            logger.error(f"处理UDP数据报失败: {e}", exc_info=True)
+
+    def error_received(self, exc):
+        # 常见于服务器端口暂不可达（ICMP），不影响后续收发
+        self._stats["errors"] += 1
+        logger.debug(f"UDP通道错误: {exc}")
+
+    def connection_lost(self, exc):
+        self.closed = True
+        self._transport = None
+        self._sock = None
+        if exc:
+            logger.warning(f"UDP通道异常关闭: {exc}")
+
+    def send(self, packet: bytes) -> bool:
+        """
+        发送一个数据报（不阻塞）.
+        """
+        if self.closed or self._transport is None:
+            return False
+        try:
+            self._transport.sendto(packet)
+        except Exception as e:
+            self._stats["send_errors"] += 1
+            logger.debug(f"UDP发送失败: {e}")
+            return False
+        self._stats["sent"] += 1
+        return True
+
+    def close(self):
+        """
+        关闭通道（须在事件循环线程调用）.
+        """
+        if self._transport is not None:
+            self._transport.close()
+        self.closed = True
+
+    def get_stats(self) -> dict:
+        stats = dict(self._stats)
+        if self._transport is not None:
+            stats["send_buffer"] = self._transport.get_write_buffer_size()
+        return stats
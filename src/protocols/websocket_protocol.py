@@ -1,5 +1,4 @@
 import asyncio
-import json
 import ssl
 import time
 
@@ -7,6 +6,7 @@ import websockets
 
 from src.constants.constants import AudioConfig
 from src.protocols.protocol import Protocol
+from src.utils import json_codec
 from src.utils.config_manager import ConfigManager
 from src.utils.logging_config import get_logger
 
@@ -34,11 +34,15 @@ class WebsocketProtocol(Protocol):
         self._heartbeat_task = None
         self._connection_monitor_task = None
 
-        # 连接状态标志
-        self._is_closing = False
-        self._reconnect_attempts = 0
-        self._max_reconnect_attempts = 0  # 默认不重连
-        self._auto_reconnect_enabled = False  # 默认关闭自动重连
+        # 连接断开的处理任务（同一次断开只处理一次）
+        self._loss_task = None
+
+        # 保温模式：连接断开后在后台主动重连，唤醒后无需等待握手
+        self._keep_warm = bool(
+            self.config.get_config("SYSTEM_OPTIONS.NETWORK.WEBSOCKET_KEEP_WARM", False)
+        )
+        self._warm_connect_task = None
+        self._warm_reconnects = 0
 
         self.WEBSOCKET_URL = self.config.get_config(
             "SYSTEM_OPTIONS.NETWORK.WEBSOCKET_URL"
@@ -56,14 +60,18 @@ class WebsocketProtocol(Protocol):
             "Client-Id": client_id,
         }
 
-    async def connect(self) -> bool:
-        """
-        连接到WebSocket服务器.
+    async def connect(self, background: bool = False) -> bool:
+        """连接到WebSocket服务器.
+
+        Args:
+            background: 保温模式的后台重连。此时不触发音频通道打开/网络错误回调，
+                设备状态保持不变，下次 open_audio_channel() 直接复用该连接
         """
         if self._is_closing:
             logger.warning("连接正在关闭中，取消新的连接尝试")
             return False
 
+        self.telemetry.mark_connect_start()
         try:
             # 在连接时创建 Event，确保在正确的事件循环中
             self.hello_received = asyncio.Event()
@@ -103,7 +111,7 @@ class WebsocketProtocol(Protocol):
                 )
 
             # 启动消息处理循环（保存任务引用，关闭时可取消）
-            self._message_task = asyncio.create_task(self._message_handler())
+            self._message_task = asyncio.create_task(self._message_handler(background))
 
             # 注释掉自定义心跳，使用websockets内置的心跳机制
             # self._start_heartbeat()
@@ -126,14 +134,15 @@ class WebsocketProtocol(Protocol):
                     "frame_duration": AudioConfig.FRAME_DURATION,
                 },
             }
-            await self.send_text(json.dumps(hello_message))
+            await self.send_text(json_codec.dumps(hello_message))
 
             # 等待服务器hello响应
             try:
                 await asyncio.wait_for(self.hello_received.wait(), timeout=10.0)
                 self.connected = True
-                self._reconnect_attempts = 0  # 重置重连计数
+                self._reconnect_policy.record_success()
                 logger.info("已连接到WebSocket服务器")
+                self._start_telemetry_log()
 
                 # 通知连接状态变化
                 if self._on_connection_state_changed:
@@ -143,14 +152,14 @@ class WebsocketProtocol(Protocol):
             except asyncio.TimeoutError:
                 logger.error("等待服务器hello响应超时")
                 await self._cleanup_connection()
-                if self._on_network_error:
+                if self._on_network_error and not background:
                     self._on_network_error("等待响应超时")
                 return False
 
         except Exception as e:
             logger.error(f"WebSocket连接失败: {e}")
             await self._cleanup_connection()
-            if self._on_network_error:
+            if self._on_network_error and not background:
                 self._on_network_error(f"无法连接服务: {str(e)}")
             return False
 
@@ -210,29 +219,55 @@ class WebsocketProtocol(Protocol):
             logger.error(f"心跳循环异常: {e}")
 
     async def _connection_monitor(self):
+        """连接健康状态监控.
+
+        等待连接关闭事件（wait_closed），关闭后立即进入断线处理；等待期间每5秒采样一次
+        websockets 内置心跳的 RTT。
         """
-        连接健康状态监控.
-        """
+        websocket = self.websocket
+        if websocket is None:
+            return
+        closed = asyncio.ensure_future(websocket.wait_closed())
+        last_latency = 0.0
         try:
-            while self.websocket and not self._is_closing:
-                await asyncio.sleep(5)  # 每5秒检查一次
-
-                # 检查连接状态
-                if self.websocket:
-                    if self.websocket.close_code is not None:
+            while not self._is_closing:
+                done, _ = await asyncio.wait({closed}, timeout=5)
+
+                # websockets 内置心跳每次收到 pong 都会更新 latency
+                latency = getattr(websocket, "latency", 0)
+                if latency and latency != last_latency:
+                    last_latency = latency
+                    self._last_pong_time = time.time()
+                    self.telemetry.record_rtt(latency * 1000)
+
+                if done:
+                    if not self._is_closing and websocket is self.websocket:
                         logger.warning("检测到WebSocket连接已关闭")
-                        await self._handle_connection_loss("连接已关闭")
-                        break
+                        await self._handle_connection_loss(
+                            f"连接已关闭: {websocket.close_code}"
+                        )
+                    break
 
         except asyncio.CancelledError:
             logger.debug("连接监控任务被取消")
         except Exception as e:
             logger.error(f"连接监控异常: {e}")
+        finally:
+            closed.cancel()
 
     async def _handle_connection_loss(self, reason: str):
+        """连接丢失：同一条连接只处理一次.
+
+        消息处理、连接监控和发送路径都可能发现断开；清理过程会取消前两个任务，
+        因此在独立任务中处理，调用方不必等待。
         """
-        处理连接丢失.
-        """
+        if self.websocket is None or (self._loss_task and not self._loss_task.done()):
+            return
+        self._loss_task = asyncio.create_task(
+            self._process_connection_loss(reason), name="websocket:connection_loss"
+        )
+
+    async def _process_connection_loss(self, reason: str):
         logger.warning(f"连接丢失: {reason}")
 
         # 更新连接状态
@@ -256,83 +291,32 @@ class WebsocketProtocol(Protocol):
             except Exception as e:
                 logger.error(f"调用音频通道关闭回调失败: {e}")
 
-        # 只有在启用自动重连且未手动关闭时才尝试重连
-        if (
-            not self._is_closing
-            and self._auto_reconnect_enabled
-            and self._reconnect_attempts < self._max_reconnect_attempts
-        ):
-            await self._attempt_reconnect(reason)
+        if self._is_closing:
+            return
+
+        # 保温模式：后台重连，不报网络错误
+        if self._keep_warm:
+            self._start_reconnect(reason, background=True)
+        elif self._auto_reconnect_enabled:
+            self._start_reconnect(reason)
         else:
-            # 通知网络错误
-            if self._on_network_error:
-                if (
-                    self._auto_reconnect_enabled
-                    and self._reconnect_attempts >= self._max_reconnect_attempts
-                ):
-                    self._on_network_error(f"连接丢失且重连失败: {reason}")
-                else:
-                    self._on_network_error(f"连接丢失: {reason}")
-
-    async def _attempt_reconnect(self, original_reason: str):
+            await self._notify_network_error(f"连接丢失: {reason}")
+
+    async def _reconnect_once(self, background: bool) -> bool:
         """
-        尝试自动重连.
+        保温模式下在后台握手，open_audio_channel() 可直接等待这次握手.
         """
-        self._reconnect_attempts += 1
-
-        # 通知开始重连
-        if self._on_reconnecting:
-            try:
-                self._on_reconnecting(
-                    self._reconnect_attempts, self._max_reconnect_attempts
-                )
-            except Exception as e:
-                logger.error(f"调用重连回调失败: {e}")
-
-        logger.info(
-            f"尝试自动重连 ({self._reconnect_attempts}/{self._max_reconnect_attempts})"
-        )
-
-        # 等待一段时间后重连
-        await asyncio.sleep(min(self._reconnect_attempts * 2, 30))  # 指数退避，最大30秒
-
+        if not background:
+            return await self.connect()
+        self._warm_connect_task = asyncio.create_task(self.connect(background=True))
         try:
-            success = await self.connect()
-            if success:
-                logger.info("自动重连成功")
-                # 通知连接状态变化
-                if self._on_connection_state_changed:
-                    self._on_connection_state_changed(True, "重连成功")
-            else:
-                logger.warning(
-                    f"自动重连失败 ({self._reconnect_attempts}/{self._max_reconnect_attempts})"
-                )
-                # 如果还能重试，不立即报错
-                if self._reconnect_attempts >= self._max_reconnect_attempts:
-                    if self._on_network_error:
-                        self._on_network_error(
-                            f"重连失败，已达到最大重连次数: {original_reason}"
-                        )
-        except Exception as e:
-            logger.error(f"重连过程中出错: {e}")
-            if self._reconnect_attempts >= self._max_reconnect_attempts:
-                if self._on_network_error:
-                    self._on_network_error(f"重连异常: {str(e)}")
-
-    def enable_auto_reconnect(self, enabled: bool = True, max_attempts: int = 5):
-        """启用或禁用自动重连功能.
-
-        Args:
-            enabled: 是否启用自动重连
-            max_attempts: 最大重连尝试次数
-        """
-        self._auto_reconnect_enabled = enabled
-        if enabled:
-            self._max_reconnect_attempts = max_attempts
-            logger.info(f"启用自动重连，最大尝试次数: {max_attempts}")
-        else:
-            self._max_reconnect_attempts = 0
-            logger.info("禁用自动重连")
+            success = await self._warm_connect_task
+        finally:
+            self._warm_connect_task = None
+        if success:
+            self._warm_reconnects += 1
+            logger.info("保温连接已在后台重新建立")
+        return success
 
     def get_connection_info(self) -> dict:
         """获取连接信息.
@@ -346,17 +330,28 @@ class WebsocketProtocol(Protocol):
                 self.websocket.close_code is not None if self.websocket else True
             ),
             "is_closing": self._is_closing,
-            "auto_reconnect_enabled": self._auto_reconnect_enabled,
-            "reconnect_attempts": self._reconnect_attempts,
-            "max_reconnect_attempts": self._max_reconnect_attempts,
+            **self._reconnect_info(),
             "last_ping_time": self._last_ping_time,
             "last_pong_time": self._last_pong_time,
             "websocket_url": self.WEBSOCKET_URL,
+            "keep_warm": self._keep_warm,
+            "warm_reconnects": self._warm_reconnects,
+            "telemetry": self.get_telemetry(),
         }
 
-    async def _message_handler(self):
-        """
-        处理接收到的WebSocket消息.
+    def _send_queue_depth(self) -> dict:
+        transport = getattr(self.websocket, "transport", None)
+        return {
+            "write_buffer_bytes": (
+                transport.get_write_buffer_size() if transport else 0
+            )
+        }
+
+    async def _message_handler(self, background: bool = False):
+        """处理接收到的WebSocket消息.
+
+        Args:
+            background: 本连接是否为保温模式的后台连接，传给 hello 处理
         """
         try:
             async for message in self.websocket:
@@ -365,19 +360,21 @@ class WebsocketProtocol(Protocol):
 
                 try:
                     if isinstance(message, str):
+                        self.telemetry.record_message_in(len(message.encode()))
                         try:
-                            data = json.loads(message)
+                            data = json_codec.loads(message)
                             msg_type = data.get("type")
                             if msg_type == "hello":
                                 # 处理服务器 hello 消息
-                                await self._handle_server_hello(data)
+                                await self._handle_server_hello(data, background)
                             else:
                                 if self._on_incoming_json:
                                     self._on_incoming_json(data)
-                        except json.JSONDecodeError as e:
+                        except json_codec.JSONDecodeError as e:
                             logger.error(f"无效的JSON消息: {message}, 错误: {e}")
                     elif isinstance(message, bytes):
                         # 二进制消息，可能是音频
+                        self.telemetry.record_audio_in(len(message))
                         if self._on_incoming_audio:
                             self._on_incoming_audio(message)
                 except Exception as e:
@@ -418,6 +415,7 @@ class WebsocketProtocol(Protocol):
 
         try:
             await self.websocket.send(data)
+            self.telemetry.record_audio_out(len(data))
         except websockets.ConnectionClosed as e:
             logger.warning(f"发送音频时连接已关闭: {e}")
             await self._handle_connection_loss(f"发送音频失败: {e.code} {e.reason}")
@@ -429,6 +427,26 @@ class WebsocketProtocol(Protocol):
             # 不要在这里调用网络错误回调，让连接处理器处理
             await self._handle_connection_loss(f"发送音频异常: {str(e)}")
 
+    async def send_audio_batch(self, frames: list):
+        """连续发送多帧音频.
+
+        服务端按消息解析 Opus 包，每帧仍是一条独立的二进制消息；
+        只在开头检查一次通道状态，中间不再让出给其他发送任务。
+        """
+        if not self.is_audio_channel_opened():
+            return
+
+        try:
+            for data in frames:
+                await self.websocket.send(data)
+            self.telemetry.record_audio_out(sum(map(len, frames)), len(frames))
+        except websockets.ConnectionClosed as e:
+            logger.warning(f"发送音频时连接已关闭: {e}")
+            await self._handle_connection_loss(f"发送音频失败: {e.code} {e.reason}")
+        except Exception as e:
+            logger.error(f"发送音频数据失败: {e}")
+            await self._handle_connection_loss(f"发送音频异常: {str(e)}")
+
     async def send_text(self, message: str):
         """
         发送文本消息.
@@ -439,6 +457,7 @@ class WebsocketProtocol(Protocol):
 
         try:
             await self.websocket.send(message)
+            self.telemetry.record_message_out(len(message.encode()))
         except websockets.ConnectionClosed as e:
             logger.warning(f"发送文本时连接已关闭: {e}")
             await self._handle_connection_loss(f"发送文本失败: {e.code} {e.reason}")
@@ -466,15 +485,26 @@ class WebsocketProtocol(Protocol):
     async def open_audio_channel(self) -> bool:
         """建立 WebSocket 连接.
 
-        如果尚未连接,则创建新的 WebSocket 连接
+        如果尚未连接,则创建新的 WebSocket 连接；保温模式下后台重连正在握手时，
+        直接等待该次握手完成而不是重新建立连接
         Returns:
             bool: 连接是否成功
         """
-        if not self.is_audio_channel_opened():
-            return await self.connect()
-        return True
+        if self.is_audio_channel_opened():
+            return True
+
+        pending = self._warm_connect_task
+        if pending is not None and not pending.done():
+            try:
+                if await asyncio.shield(pending) and self.is_audio_channel_opened():
+                    return True
+            except Exception as e:
+                logger.debug(f"等待后台连接失败: {e}")
+
+        self._stop_reconnect()
+        return await self.connect()
 
-    async def _handle_server_hello(self, data: dict):
+    async def _handle_server_hello(self, data: dict, background: bool = False):
         """
         处理服务器的 hello 消息.
         """
@@ -495,9 +525,10 @@ class WebsocketProtocol(Protocol):
 
             # 设置 hello 接收事件
             self.hello_received.set()
+            self.telemetry.mark_hello()
 
-            # 通知音频通道已打开
-            if self._on_audio_channel_opened:
+            # 通知音频通道已打开（保温模式后台重连不通知，设备状态保持不变）
+            if self._on_audio_channel_opened and not background:
                 await self._on_audio_channel_opened()
 
             logger.info("成功处理服务器 hello 消息")
@@ -512,6 +543,7 @@ class WebsocketProtocol(Protocol):
         清理连接相关资源.
         """
         self.connected = False
+        self.telemetry.stop_periodic_log()
 
         # 取消消息处理任务，防止事件循环退出后仍有挂起等待
         if self._message_task and not self._message_task.done():
@@ -561,6 +593,7 @@ class WebsocketProtocol(Protocol):
         self._is_closing = True
 
         try:
+            self._stop_reconnect()
             await self._cleanup_connection()
 
             if self._on_audio_channel_closed:
@@ -27,6 +27,18 @@ class ConfigManager:
                 "MQTT_INFO": None,
                 "ACTIVATION_VERSION": "v2",  # 可选值: v1, v2
                 "AUTHORIZATION_URL": "https://xiaozhi.me/",
+                "WEBSOCKET_KEEP_WARM": False,
+                "MQTT_MAX_INFLIGHT": 8,
+                "TELEMETRY_LOG_INTERVAL": 0,
+                "RECONNECT": {
+                    "ENABLED": False,
+                    "BASE_DELAY": 1.0,
+                    "MAX_DELAY": 30.0,
+                    "MAX_ELAPSED": 300.0,
+                    "MAX_ATTEMPTS": 0,
+                    "FAILURE_THRESHOLD": 5,
+                    "OPEN_SECONDS": 60.0,
+                },
             },
         },
         "WAKE_WORD_OPTIONS": {
@@ -38,6 +50,16 @@ class ConfigManager:
             "KEYWORDS_SCORE": 1.8,
             "KEYWORDS_THRESHOLD": 0.2,
             "NUM_TRAILING_BLANKS": 1,
+            "CHUNK_MS": 60,
+            "KEYWORD_SETS": [],
+            "GATE": {
+                "ENABLED": False,
+                "MODE": "energy",
+                "THRESHOLD_DB": -45.0,
+                "VAD_MODE": 2,
+                "HANGOVER_MS": 600,
+                "PREROLL_MS": 400,
+            },
             "PLAY_BEEP_ON_WAKE": True,
             "USE_MP3_SOUND": True,
             "MP3_FILENAME": "wake_up.mp3",
@@ -73,6 +95,41 @@ class ConfigManager:
             "FRAME_DELAY": 3,
             "FILTER_LENGTH_RATIO": 0.4,
             "ENABLE_PREPROCESS": True,
+            "PLAYBACK_REFERENCE": True,
+        },
+        "AUDIO_OPTIONS": {
+            "PRE_OPEN_BUFFER_MS": 600,
+            "JITTER_BUFFER": {
+                "ENABLED": True,
+                "MIN_DELAY_MS": 40,
+                "MAX_DELAY_MS": 400,
+                "INITIAL_DELAY_MS": 60,
+                "MAX_CONCEAL_FRAMES": 5,
+                "USE_FEC": True,
+            },
+            "CODEC_WORKER": {
+                "ENABLED": False,
+                "MAX_BATCH_FRAMES": 4,
+            },
+            "SEND_QUEUE": {
+                "MAX_FRAMES": 25,
+                "MAX_BATCH": 4,
+                "COALESCE": True,
+            },
+            "INCOMING_QUEUE": {
+                "MAX_FRAMES": 50,
+                "MAX_BATCH": 8,
+            },
+        },
+        "PLUGIN_OPTIONS": {
+            "CONCURRENT_DISPATCH": True,
+            "HOOK_TIMEOUT": 2.0,
+            "TIMEOUTS": {"mcp": 30.0},
+            "QUARANTINE_STRIKES": 3,
+            "QUARANTINE_WINDOW": 60.0,
+            "QUARANTINE_SECONDS": 30.0,
+            "QUARANTINE_EXEMPT": ["mcp"],
+            "MAX_QUEUED_CALLS": 32,
         },
         "AUDIO_DEVICES": {
             "input_device_id": None,
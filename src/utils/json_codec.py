@@ -0,0 +1,61 @@
+"""
+JSON 编解码.
+
+协议收发、MCP 和 IoT 消息统一经由这里序列化。安装了 orjson 时使用 orjson，否则回退到
+标准库 json。两种后端输出一致：紧凑分隔符、不转义非 ASCII 字符（UTF-8 原样输出）。
+"""
+
+import json
+import logging
+from typing import Any, Union
+
+try:
+    import orjson
+
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+    BACKEND = "orjson"
+except ImportError:
+    orjson = None
+    BACKEND = "json"
+
+# orjson.JSONDecodeError 是 json.JSONDecodeError 的子类，两种后端都能用它捕获
+JSONDecodeError = json.JSONDecodeError
+
+_std_encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
+def dumps(obj: Any) -> str:
+    """
+    序列化为紧凑的 JSON 字符串.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=_ORJSON_OPTIONS).decode("utf-8")
+        except TypeError:
+            # orjson 不支持的类型（如超过64位的整数）交给标准库处理或报错
+            pass
+    return _std_encoder.encode(obj)
+
+
+def loads(data: Union[str, bytes, bytearray, memoryview]) -> Any:
+    """
+    解析 JSON 字符串或 UTF-8 字节串.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+def log_pretty(logger: logging.Logger, message: str, obj: Any):
+    """
+    以 DEBUG 级别输出缩进后的 JSON，未开启 DEBUG 时直接返回.
+    """
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    try:
+        text = json.dumps(obj, ensure_ascii=False, indent=2, default=str)
+    except Exception:
+        text = repr(obj)
+    logger.debug(f"{message}{text}")